@@ -0,0 +1,8 @@
+# Permite ejecutar la consola con: python -m Consola ...
+import time
+
+inicio = time.perf_counter() # Inicio del arranque para --profile-startup
+
+from Consola.consola import main
+
+main(inicio=inicio)
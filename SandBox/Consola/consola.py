@@ -0,0 +1,194 @@
+# Consola/consola.py
+"""
+Punto de entrada de línea de comandos sin interfaz gráfica: no importa PySide6 ni
+Presentacion, y cada subcomando importa solo los módulos de Entidad / Controlador
+que usa, así que arrancar un trabajador por lotes cuesta lo mínimo.
+
+Uso (desde SandBox/):
+    python -m Consola solo --tamano 10 --partidas 100 --estrategia density
+    python -m Consola mm --partidas 1000 --procesos 4 --registro partidas.bsgr
+    python -m Consola generar --cantidad 3 --tamano 8 --flota 4 3 3 2 2 2 1 1 1 1
+    python -m Consola --profile-startup mm --partidas 10
+
+Con --profile-startup se informa por stderr de cuánto tardó cada importación, la
+inicialización y el trabajo en sí (para el desglose fino: python -X importtime). El
+reloj empieza en la primera línea del punto de entrada (Main.py o Consola/__main__.py);
+lo que tarda el intérprete antes de llegar ahí no se ve en las etapas, pero sí en la
+línea de CPU del proceso (time.process_time, que cuenta desde que arrancó).
+"""
+import sys
+import time
+
+_INICIO = time.perf_counter() # Si main() no recibe 'inicio' (consola.py ejecutado directamente)
+
+import argparse
+import importlib
+
+
+class PerfilArranque:
+    """Tiempos (etiqueta, segundos) de las etapas del arranque, en orden."""
+
+    def __init__(self, inicio):
+        self.inicio = inicio
+        self.etapas = [('importar Consola.consola y analizar argumentos', time.perf_counter() - inicio)]
+
+    def importar(self, nombre):
+        """importlib.import_module midiendo su tiempo (incluye lo que importe a su vez)."""
+        ya_cargado = nombre in sys.modules
+        inicio = time.perf_counter()
+        modulo = importlib.import_module(nombre)
+        if not ya_cargado:
+            self.etapas.append((f'importar {nombre}', time.perf_counter() - inicio))
+        return modulo
+
+    def medir(self, etiqueta, funcion, *args, **kwargs):
+        inicio = time.perf_counter()
+        resultado = funcion(*args, **kwargs)
+        self.etapas.append((etiqueta, time.perf_counter() - inicio))
+        return resultado
+
+    def informe(self):
+        ancho = max(len(etiqueta) for etiqueta, _ in self.etapas)
+        lineas = ["Arranque (--profile-startup):"]
+        for etiqueta, segundos in self.etapas:
+            lineas.append(f"  {etiqueta:<{ancho}}  {segundos * 1e3:9.2f} ms")
+        total = time.perf_counter() - self.inicio
+        modulos_qt = sorted(m for m in sys.modules if m.split('.')[0] in ('PySide6', 'Presentacion'))
+        lineas.append(f"  {'total':<{ancho}}  {total * 1e3:9.2f} ms")
+        lineas.append(f"  CPU del proceso, con el arranque del intérprete: {time.process_time() * 1e3:.2f} ms")
+        lineas.append(f"  módulos cargados: {len(sys.modules)}; Qt/Presentacion: {', '.join(modulos_qt) or 'ninguno'}")
+        return "\n".join(lineas)
+
+
+def comando_solo(args, perfil):
+    """Auto-juego en modo 'solo': una IA dispara al tablero hasta ganar o quedarse sin intentos."""
+    controlador = perfil.importar('Controlador.controlador')
+    aleatorio = perfil.importar('Entidad.aleatorio')
+    WarShipController = controlador.WarShipController
+
+    semilla = aleatorio.nueva_semilla() if args.semilla is None else args.semilla
+    controller = perfil.medir('inicializar controlador', WarShipController, board_size=args.tamano)
+    if args.metricas is not None:
+        instrumentacion = perfil.importar('Entidad.instrumentacion')
+        controller.enable_instrumentation(instrumentacion.Instrumentacion(intervalo=args.metricas or None))
+
+    def jugar():
+        victorias, disparos = 0, []
+        for i in range(args.partidas):
+            seed = aleatorio.derivar_semilla(semilla, 'partida', i)
+            tablero = controller.start_new_game(seed)
+            # Sin reloj (time_budget=None): con --semilla, 'montecarlo' también es reproducible
+            ai_state = WarShipController.AiState(args.tamano, hunt_strategy=args.estrategia,
+                                                 rng=aleatorio.rng_hijo(seed, 'ai_solo'), time_budget=None,
+                                                 fleet=tablero.flota)
+            n = 0
+            while not controller.is_game_finished():
+                row, col, result, message = controller.ai_make_move_on(tablero, ai_state)
+                if row is None:
+                    break
+                n += 1
+            victorias += tablero.is_game_over()
+            disparos.append(n)
+        return victorias, disparos
+
+    victorias, disparos = perfil.medir(f'jugar {args.partidas} partidas', jugar)
+    print(f"Solo {args.tamano}x{args.tamano}, estrategia {args.estrategia}, semilla {semilla}: "
+          f"{victorias}/{args.partidas} flotas hundidas a tiempo; "
+          f"disparos por partida: media {sum(disparos) / max(1, len(disparos)):.1f}")
+    if controller.instrumentation is not None:
+        print(controller.instrumentation.linea())
+
+
+def comando_mm(args, perfil):
+    """Simulación de partidas Máquina vs Máquina (SimuladorMM)."""
+    simulacion = perfil.importar('Controlador.simulacion')
+    simulador = perfil.medir('inicializar simulador', simulacion.SimuladorMM,
+                             board_size=args.tamano, procesos=args.procesos)
+    resultado = perfil.medir(f'jugar {args.partidas} partidas', simulador.ejecutar,
+                             args.partidas, semilla=args.semilla, registro=args.registro)
+    victorias = ", ".join(f"{ganador}: {n}" for ganador, n in sorted(resultado['victorias'].items(), key=str))
+    print(f"MM {args.tamano}x{args.tamano}, semilla {resultado['semilla']}: {len(resultado['partidas'])} partidas "
+          f"en {resultado['segundos']:.2f} s ({resultado['partidas_por_segundo']:.0f}/s). Victorias: {victorias}")
+    if args.registro:
+        print(f"Partidas guardadas en {args.registro}")
+
+
+def comando_generar(args, perfil):
+    """Genera tableros (flota estándar o personalizada) y los escribe como texto."""
+    entidad = perfil.importar('Entidad.entidad')
+    aleatorio = perfil.importar('Entidad.aleatorio')
+    tablero_datos = perfil.importar('Entidad.tablero_datos')
+
+    semilla = aleatorio.nueva_semilla() if args.semilla is None else args.semilla
+    columnas = args.columnas or args.tamano
+    flota = tuple(args.flota) if args.flota else tablero_datos.FLOTA_ESTANDAR
+
+    def generar():
+        return [entidad.Tablero(args.tamano, rng=aleatorio.rng_hijo(semilla, 'tablero', i),
+                                flota=flota, columnas=columnas)
+                for i in range(args.cantidad)]
+
+    try:
+        tableros = perfil.medir(f'generar {args.cantidad} tableros', generar)
+    except ValueError as error:
+        sys.exit(f"error: {error}")
+
+    bloques = [f"# Semilla {semilla}, {args.tamano}x{columnas}, flota {' '.join(map(str, flota))}"]
+    for i, tablero in enumerate(tableros):
+        filas = ["".join('#' if v & tablero_datos.BARCO else '.' for v in tablero.celdas[r * columnas:(r + 1) * columnas])
+                 for r in range(tablero.filas)]
+        bloques.append(f"# Tablero {i}\n" + "\n".join(filas))
+    texto = "\n\n".join(bloques) + "\n"
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto)
+        print(f"{args.cantidad} tableros guardados en {args.salida}")
+    else:
+        sys.stdout.write(texto)
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="python -m Consola", description="BattleShip sin interfaz gráfica.")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Informa por stderr del tiempo de importación e inicialización.")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    solo = subparsers.add_parser('solo', help="Auto-juego en modo solo.")
+    solo.add_argument('--tamano', type=int, default=10)
+    solo.add_argument('--partidas', type=int, default=1)
+    solo.add_argument('--semilla', type=int, default=None)
+    # Lista fija (en lugar de WarShipController.HUNT_STRATEGIES) para no importar el controlador al analizar
+    solo.add_argument('--estrategia', default='parity', choices=('parity', 'density', 'montecarlo'))
+    solo.add_argument('--metricas', type=float, nargs='?', const=0, default=None, metavar='SEGUNDOS',
+                      help="Instrumenta el controlador y escribe sus métricas al final (y cada SEGUNDOS por stderr).")
+    solo.set_defaults(funcion=comando_solo)
+
+    mm = subparsers.add_parser('mm', help="Simulación Máquina vs Máquina.")
+    mm.add_argument('--tamano', type=int, default=10)
+    mm.add_argument('--partidas', type=int, default=100)
+    mm.add_argument('--semilla', type=int, default=None)
+    mm.add_argument('--procesos', type=int, default=1)
+    mm.add_argument('--registro', default=None, help="Ruta donde grabar las partidas (formato binario).")
+    mm.set_defaults(funcion=comando_mm)
+
+    generar = subparsers.add_parser('generar', help="Genera tableros y los escribe como texto.")
+    generar.add_argument('--tamano', type=int, default=10, help="Filas (y columnas si no se indica --columnas).")
+    generar.add_argument('--columnas', type=int, default=None)
+    generar.add_argument('--cantidad', type=int, default=1)
+    generar.add_argument('--semilla', type=int, default=None)
+    generar.add_argument('--flota', type=int, nargs='+', default=None, help="Tamaños de los barcos.")
+    generar.add_argument('--salida', default=None)
+    generar.set_defaults(funcion=comando_generar)
+    return parser
+
+
+def main(argv=None, inicio=None):
+    args = crear_parser().parse_args(argv)
+    perfil = PerfilArranque(_INICIO if inicio is None else inicio)
+    args.funcion(args, perfil)
+    if args.profile_startup:
+        print(perfil.informe(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
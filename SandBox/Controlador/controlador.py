@@ -1,7 +1,27 @@
 # Controlador/controlador.py
-import random
-import collections
+import array
 from Entidad.entidad import Tablero
+from Entidad.tablero_datos import TableroDatos, FLOTA_ESTANDAR
+from Entidad.instrumentacion import Instrumentacion
+from Entidad.aleatorio import como_rng, rng_hijo, nueva_semilla
+from Controlador.densidad import MapaDensidad
+from Controlador.montecarlo import MuestreadorMC
+
+# Entradas del diario de AiState: op | celda << 4 | dato << 24 (ver AiState.undo_to)
+_J_MAP = 1   # ai_shot_map[celda] valía 'dato'
+_J_POOL = 2  # la celda salió de su pool de caza desde la posición 'dato'
+_J_POP = 3   # la celda salió del frente de la cola (pop_target / clear_targets)
+_J_PUSH = 4  # push_target añadió la celda al final de la cola
+_J_FRONT = 5 # push_target_front la puso al frente ('dato' = celda que la precedía + 1, 0 si no estaba)
+_J_HIT = 6   # append_hit añadió la celda a ai_hits y ai_current_hits
+_J_UNHIT = 7 # la celda salió de ai_current_hits desde la posición 'dato'
+
+
+def _session_property(name):
+    """Propiedad del controlador que lee / escribe el atributo 'name' de su sesión actual."""
+    return property(lambda self: getattr(self.session, name),
+                    lambda self, value: setattr(self.session, name, value))
+
 
 class WarShipController:
     """
@@ -12,65 +32,526 @@ class WarShipController:
       - Modo 'hvh' (Humano vs Humano)
     """
 
+    # Estrategias de modo caza disponibles para AiState
+    HUNT_STRATEGIES = ('parity', 'density', 'montecarlo')
+
+    # Métodos que enable_instrumentation sustituye (solo en la instancia) por versiones medidas
+    INSTRUMENTED_METHODS = ('process_shot_on', 'ai_make_move_on', 'ai_random_hunt_cell_for',
+                            'ai_density_hunt_cell_for', 'ai_montecarlo_cell_for')
+
     class AiState:
-        """Estado interno de una IA (memoria de tiros/target mode)."""
-        def __init__(self, board_size, use_parity=True):
+        """
+        Estado interno de una IA (memoria de tiros/target mode).
+        Usa __slots__ y mapas de un byte por celda (row * board_size + col) para que
+        comprobar si una celda ya fue disparada o está en la cola sea O(1) y barato
+        en memoria cuando se mantienen muchas IAs a la vez.
+        """
+        __slots__ = ('board_size', 'ai_shot_map', 'ai_targets', 'ai_queued_map', 'ai_hits',
+                     'ai_current_hits', 'ai_use_parity', 'ai_hunt_strategy', 'ai_density',
+                     'ai_hunt_pools', 'ai_rng', 'ai_montecarlo', 'ai_journal')
+
+        def __init__(self, board_size, use_parity=True, hunt_strategy='parity', rng=None, time_budget=None,
+                     fleet=None):
+            if hunt_strategy not in WarShipController.HUNT_STRATEGIES:
+                raise ValueError(f"Estrategia de caza desconocida: {hunt_strategy!r} "
+                                 f"(opciones: {', '.join(WarShipController.HUNT_STRATEGIES)}).")
+            if time_budget is not None and (isinstance(time_budget, bool) or not isinstance(time_budget, (int, float))
+                                            or not time_budget >= 0):
+                raise ValueError(f"time_budget debe ser un número de segundos no negativo o None: {time_budget!r}")
             self.board_size = board_size
-            self.ai_shots = set()
-            self.ai_targets = collections.deque()
+            # Generador propio de la IA (semilla, random.Random o numpy Generator; None = global)
+            self.ai_rng = como_rng(rng)
+            # 0 = sin disparar, 1 = disparada (o agua segura), 2 = impacto propio
+            self.ai_shot_map = bytearray(board_size * board_size)
+            self.ai_targets = WarShipController.TargetQueue(board_size)
+            self.ai_queued_map = self.ai_targets.queued # 1 = celda en ai_targets
             self.ai_hits = []
             self.ai_current_hits = []
             self.ai_use_parity = use_parity
+            # 'parity': celda aleatoria con paridad ; 'density': mapa de densidad de probabilidad ;
+            # 'montecarlo': flotas muestreadas compatibles con lo observado (caza y objetivo),
+            # con un número fijo de barridos por jugada (reproducible por semilla); 'time_budget'
+            # (segundos) solo los recorta. 'fleet': tamaños de la flota rival (por defecto la estándar).
+            self.ai_hunt_strategy = hunt_strategy
+            fleet = tuple(fleet) if fleet else FLOTA_ESTANDAR
+            self.ai_density = (MapaDensidad(board_size, fleet, rng=self.ai_rng)
+                               if hunt_strategy == 'density' else None)
+            self.ai_montecarlo = (MuestreadorMC(board_size, fleet, rng=self.ai_rng, presupuesto=time_budget)
+                                  if hunt_strategy == 'montecarlo' else None)
+            # Pools de celdas sin disparar (con y sin paridad); se crean al primer uso
+            self.ai_hunt_pools = None
+            # Diario de cambios para deshacer jugadas hipotéticas (ver start_journal)
+            self.ai_journal = None
+
+        def has_shot(self, row, col):
+            """Verifica si la IA ya disparó en (row, col)."""
+            return self.ai_shot_map[row * self.board_size + col] != 0
+
+        def record_shot(self, row, col):
+            """Registra un disparo propio y lo quita de los pools de caza."""
+            cell = row * self.board_size + col
+            journal = self.ai_journal
+            if journal is not None:
+                journal.append(_J_MAP | cell << 4 | self.ai_shot_map[cell] << 24)
+            self.ai_shot_map[cell] = 1
+            if self.ai_hunt_pools is not None:
+                parity_pool, other_pool = self.ai_hunt_pools
+                i = (parity_pool if (row + col) % 2 == 0 else other_pool).remove(cell)
+                if journal is not None and i >= 0:
+                    journal.append(_J_POOL | cell << 4 | i << 24)
+
+        def record_hit(self, row, col):
+            """Marca (row, col) como impacto propio (ya registrado con record_shot)."""
+            cell = row * self.board_size + col
+            if self.ai_journal is not None:
+                self.ai_journal.append(_J_MAP | cell << 4 | self.ai_shot_map[cell] << 24)
+            self.ai_shot_map[cell] = 2
+
+        def append_hit(self, row, col):
+            """Añade (row, col) a los impactos propios y a los del barco en curso."""
+            if self.ai_journal is not None:
+                self.ai_journal.append(_J_HIT | (row * self.board_size + col) << 4)
+            self.ai_current_hits.append((row, col))
+            self.ai_hits.append((row, col))
+
+        def discard_current_hits(self, cells=None):
+            """Quita de los impactos del barco en curso los que están en 'cells' (None = todos)."""
+            hits = self.ai_current_hits
+            journal = self.ai_journal
+            # De atrás hacia delante: al deshacer, cada impacto vuelve a su posición
+            for i in range(len(hits) - 1, -1, -1):
+                row, col = hits[i]
+                if cells is None or (row, col) in cells:
+                    if journal is not None:
+                        journal.append(_J_UNHIT | (row * self.board_size + col) << 4 | i << 24)
+                    del hits[i]
+
+        def sunk_ship_at(self, row, col):
+            """
+            Celdas (row, col) del barco hundido en (row, col): los impactos propios conectados
+            a ella. Como los barcos no se tocan, ningún otro barco queda conectado.
+            """
+            n = self.board_size
+            shot_map = self.ai_shot_map
+            ship = {(row, col)}
+            pending = [(row, col)]
+            while pending:
+                r, c = pending.pop()
+                for nr, nc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+                    if 0 <= nr < n and 0 <= nc < n and shot_map[nr * n + nc] == 2 and (nr, nc) not in ship:
+                        ship.add((nr, nc))
+                        pending.append((nr, nc))
+            return ship
+
+        def is_queued(self, row, col):
+            """Verifica si (row, col) ya está en la cola de objetivos."""
+            return self.ai_queued_map[row * self.board_size + col] == 1
+
+        def push_target(self, row, col):
+            """Añade (row, col) al final de la cola si no estaba."""
+            cell = row * self.board_size + col
+            if not self.ai_queued_map[cell]:
+                if self.ai_journal is not None:
+                    self.ai_journal.append(_J_PUSH | cell << 4)
+                self.ai_targets.push_back(cell)
+
+        def push_target_front(self, row, col):
+            """Pone (row, col) al frente de la cola; si ya estaba, la mueve (sin duplicarla)."""
+            cell = row * self.board_size + col
+            targets = self.ai_targets
+            if self.ai_queued_map[cell]:
+                if self.ai_journal is not None:
+                    self.ai_journal.append(_J_FRONT | cell << 4 | (targets.prev[cell] + 1) << 24)
+                targets.unlink(cell)
+            elif self.ai_journal is not None:
+                self.ai_journal.append(_J_FRONT | cell << 4)
+            targets.push_front(cell)
+
+        def pop_target(self):
+            """Saca el primer objetivo de la cola."""
+            cell = self.ai_targets.pop_front()
+            if self.ai_journal is not None:
+                self.ai_journal.append(_J_POP | cell << 4)
+            return divmod(cell, self.board_size)
+
+        def clear_targets(self):
+            """Vacía la cola de objetivos en el sitio."""
+            while self.ai_targets:
+                self.pop_target()
+
+        # Diario de jugadas para IAs de búsqueda: con el diario abierto cada cambio de la
+        # memoria (mapa de disparos, cola, impactos, pools de caza) anota cómo revertirse
+        # en un entero, así que explorar un disparo hipotético y deshacerlo cuesta O(1) por
+        # cambio, sin copiar la IA. No rebobina ai_rng: la búsqueda elige sus celdas y aplica su
+        # resultado con WarShipController.ai_record_result_for.
+        def start_journal(self):
+            """Abre el diario (vacío). Solo para las IAs sin mapa de densidad ni Monte Carlo."""
+            if self.ai_density is not None or self.ai_montecarlo is not None:
+                raise ValueError("El diario no cubre las estrategias 'density' ni 'montecarlo' "
+                                 "(usa Controlador.instantanea para copiarlas).")
+            self.ai_journal = array.array('q')
+
+        def stop_journal(self):
+            """Cierra el diario; los cambios anotados quedan como definitivos."""
+            self.ai_journal = None
+
+        def journal_mark(self):
+            """Posición actual del diario, para volver a ella con undo_to()."""
+            return len(self.ai_journal)
+
+        def undo_to(self, mark):
+            """Deshace, del último al primero, los cambios anotados desde journal_mark() == mark."""
+            journal = self.ai_journal
+            targets = self.ai_targets
+            n = self.board_size
+            while len(journal) > mark:
+                entry = journal.pop()
+                op = entry & 0xF
+                cell = (entry >> 4) & 0xFFFFF
+                data = entry >> 24
+                if op == _J_MAP:
+                    self.ai_shot_map[cell] = data
+                elif op == _J_POOL:
+                    self.ai_hunt_pools[sum(divmod(cell, n)) % 2].restore(cell, data)
+                elif op == _J_POP:
+                    targets.push_front(cell)
+                elif op == _J_PUSH:
+                    targets.unlink(cell)
+                elif op == _J_FRONT:
+                    targets.unlink(cell)
+                    if data:
+                        targets.insert_after(data - 1, cell)
+                elif op == _J_HIT:
+                    self.ai_current_hits.pop()
+                    self.ai_hits.pop()
+                else: # _J_UNHIT
+                    self.ai_current_hits.insert(data, divmod(cell, n))
+
+    class TargetQueue:
+        """
+        Cola de objetivos de la IA: lista doblemente enlazada sobre arrays indexados por
+        celda (row * board_size + col), con la celda board_size**2 como centinela. Añadir
+        por cualquier extremo, sacar el primero y quitar o mover cualquier celda cuestan
+        O(1) sin reservar memoria. 'queued' marca (1) las celdas que están en la cola.
+        Se recorre como (row, col), del primero al último.
+        """
+        __slots__ = ('board_size', 'next', 'prev', 'queued', 'size')
+
+        def __init__(self, board_size, cells=()):
+            total = board_size * board_size
+            self.board_size = board_size
+            self.next = array.array('i', [total]) * (total + 1)
+            self.prev = array.array('i', [total]) * (total + 1)
+            self.queued = bytearray(total)
+            self.size = 0
+            for cell in cells:
+                self.push_back(cell)
+
+        def __len__(self):
+            return self.size
+
+        def __iter__(self):
+            sentinel = len(self.queued)
+            cell = self.next[sentinel]
+            while cell != sentinel:
+                yield divmod(cell, self.board_size)
+                cell = self.next[cell]
+
+        def insert_after(self, anchor, cell):
+            """Enlaza 'cell' justo detrás de 'anchor' (el centinela = al frente)."""
+            following = self.next[anchor]
+            self.next[anchor] = cell
+            self.prev[cell] = anchor
+            self.next[cell] = following
+            self.prev[following] = cell
+            self.queued[cell] = 1
+            self.size += 1
+
+        def push_front(self, cell):
+            self.insert_after(len(self.queued), cell)
+
+        def push_back(self, cell):
+            self.insert_after(self.prev[len(self.queued)], cell)
+
+        def unlink(self, cell):
+            """Quita 'cell' (que debe estar en la cola)."""
+            before, after = self.prev[cell], self.next[cell]
+            self.next[before] = after
+            self.prev[after] = before
+            self.queued[cell] = 0
+            self.size -= 1
+
+        def pop_front(self):
+            cell = self.next[len(self.queued)]
+            if cell == len(self.queued):
+                raise IndexError("La cola de objetivos está vacía.")
+            self.unlink(cell)
+            return cell
+
+    class CellPool:
+        """
+        Conjunto de celdas (índice row * board_size + col) con eliminación por
+        intercambio con la última (swap-remove) y elección aleatoria en O(1).
+        """
+        __slots__ = ('cells', 'positions')
+
+        def __init__(self, cells, total_cells):
+            self.cells = array.array('i', cells)
+            self.positions = array.array('i', [-1]) * total_cells
+            for i, cell in enumerate(self.cells):
+                self.positions[cell] = i
+
+        def __len__(self):
+            return len(self.cells)
+
+        def remove(self, cell):
+            """Quita la celda si está y retorna la posición que ocupaba (-1 si no estaba)."""
+            i = self.positions[cell]
+            if i < 0:
+                return i
+            last = self.cells.pop()
+            if last != cell:
+                self.cells[i] = last
+                self.positions[last] = i
+            self.positions[cell] = -1
+            return i
+
+        def restore(self, cell, i):
+            """Deshace el último remove(cell), que la sacó de la posición i."""
+            n = len(self.cells)
+            if i < n:
+                # remove() movió a la posición i la que era la última: vuelve al final
+                last = self.cells[i]
+                self.cells.append(last)
+                self.positions[last] = n
+                self.cells[i] = cell
+            else:
+                self.cells.append(cell)
+            self.positions[cell] = i
 
-    def __init__(self, board_size=10):
+    class GameSession:
+        """
+        Estado de una partida (modo, tableros, IAs, turno...), separado del controlador:
+        un mismo WarShipController atiende cualquier número de sesiones pasándolas a sus
+        métodos (session=...), así que un proceso puede alojar miles de partidas con un
+        solo controlador (ver Controlador.sesiones.SessionRegistry).
+        'session_id' y 'last_active' los usa el registro; el controlador no los toca.
+        """
+        __slots__ = ('session_id', 'mode', 'game_model', 'tablero1', 'tablero2', 'ai_for_machine',
+                     'ai_A', 'ai_B', 'current_turn', 'last_hit_win', 'game_seed', 'last_active')
+
+        def __init__(self, mode='solo', game_seed=None):
+            self.session_id = None
+            self.mode = mode
+            self.game_model = None
+            self.tablero1 = None
+            self.tablero2 = None
+            self.ai_for_machine = None
+            self.ai_A = None
+            self.ai_B = None
+            self.current_turn = None # 'human', 'machine', 'A', 'B', 'P1', 'P2'
+            # Resalta la casilla ganadora: (tablero, row, col)
+            self.last_hit_win = None
+            self.game_seed = game_seed
+            self.last_active = 0.0
+
+    def __init__(self, board_size=10, board_pool=None):
         self.board_size = board_size
 
-        # Modo / tableros
-        self.mode = 'solo'
-        self.game_model = None
-        self.tablero1 = None
-        self.tablero2 = None
+        # Reserva opcional de partidas pregeneradas (Entidad.reserva_tableros.ReservaTableros):
+        # las partidas sin semilla explícita toman de ahí sus tableros si hay alguno listo
+        self.board_pool = board_pool
+
+        # Sesión actual (la que juegan start_* y la ventana). mode, tablero1/2, ai_*,
+        # current_turn, last_hit_win y game_seed son propiedades que la delegan.
+        # game_seed es la semilla maestra: cada tablero e IA recibe un flujo hijo derivado
+        # de ella, así que start_*(seed=game_seed) reproduce la partida exacta
+        self.session = WarShipController.GameSession()
+
+        # Funciones callback(tablero, row, col, result) avisadas tras cada disparo nuevo
+        # (la presentación las usa para repintar solo la celda afectada)
+        self.shot_listeners = []
+        # Funciones callback(controller) avisadas al empezar cada partida (start_*)
+        self.game_listeners = []
+
+        # Instrumentacion activa (enable_instrumentation) o None
+        self.instrumentation = None
+
+    def add_game_listener(self, callback):
+        """Registra una función que se llama cada vez que empieza una partida."""
+        if callback not in self.game_listeners:
+            self.game_listeners.append(callback)
+
+    def remove_game_listener(self, callback):
+        if callback in self.game_listeners:
+            self.game_listeners.remove(callback)
+
+    def _notify_game_started(self):
+        for callback in self.game_listeners:
+            callback(self)
+
+    def add_shot_listener(self, callback):
+        """Registra una función que se llama tras cada disparo no repetido."""
+        if callback not in self.shot_listeners:
+            self.shot_listeners.append(callback)
+
+    def remove_shot_listener(self, callback):
+        if callback in self.shot_listeners:
+            self.shot_listeners.remove(callback)
+
+    # Estado de la sesión actual (compatibilidad: la ventana y los motores lo leen del controlador)
+    mode = _session_property('mode')
+    game_model = _session_property('game_model')
+    tablero1 = _session_property('tablero1')
+    tablero2 = _session_property('tablero2')
+    ai_for_machine = _session_property('ai_for_machine')
+    ai_A = _session_property('ai_A')
+    ai_B = _session_property('ai_B')
+    current_turn = _session_property('current_turn')
+    last_hit_win = _session_property('last_hit_win')
+    game_seed = _session_property('game_seed')
+
+    # Instrumentación
+    def enable_instrumentation(self, instrumentation=None):
+        """
+        Empieza a medir esta instancia y la generación de tableros (TableroDatos, para todo
+        el proceso) en 'instrumentation' (una Instrumentacion nueva si no se pasa), que se
+        retorna. Los métodos de INSTRUMENTED_METHODS se sustituyen en la instancia por
+        envoltorios que miden; desactivada, la clase queda intacta y no se paga nada.
+        Se registra:
+          - 'process_shot_on' / 'ai_make_move_on': latencia (s) de cada llamada
+          - 'disparos_<resultado>': disparos por resultado ('miss', 'hit', 'sunk', ...)
+          - 'decisiones_caza' / 'decisiones_objetivo': de dónde salió cada jugada de la IA
+            (con Monte Carlo, objetivo si quedaban impactos de un barco a flote)
+          - 'cola_objetivos': longitud de la cola de objetivos antes de cada jugada
+          - generación de tableros: ver TableroDatos._medir_generacion
+        """
+        self.disable_instrumentation()
+        instr = Instrumentacion() if instrumentation is None else instrumentation
+        reloj = instr.reloj
+        process_shot_on = self.process_shot_on
+        ai_make_move_on = self.ai_make_move_on
+        ai_montecarlo_cell_for = self.ai_montecarlo_cell_for
+        # Decisión de la jugada en curso: la fijan los envoltorios de caza / Monte Carlo
+        decision = [None]
+
+        def timed_process_shot_on(tablero, row, col, session=None):
+            inicio = reloj()
+            result, message = process_shot_on(tablero, row, col, session)
+            instr.registrar_tiempo('process_shot_on', reloj() - inicio)
+            instr.contar('disparos_' + result)
+            return result, message
+
+        def timed_ai_make_move_on(tablero, ai_state, session=None):
+            decision[0] = 'objetivo'
+            instr.registrar('cola_objetivos', len(ai_state.ai_targets))
+            inicio = reloj()
+            move = ai_make_move_on(tablero, ai_state, session)
+            instr.registrar_tiempo('ai_make_move_on', reloj() - inicio)
+            if move[0] is not None:
+                instr.contar('decisiones_' + decision[0])
+            return move
+
+        def hunt_wrapper(method):
+            def counted_hunt(*args, **kwargs):
+                decision[0] = 'caza'
+                return method(*args, **kwargs)
+            return counted_hunt
+
+        def counted_montecarlo_cell_for(ai_state):
+            cell = ai_montecarlo_cell_for(ai_state)
+            if cell[0] is not None and not ai_state.ai_current_hits:
+                decision[0] = 'caza'
+            return cell
+
+        self.process_shot_on = timed_process_shot_on
+        self.ai_make_move_on = timed_ai_make_move_on
+        self.ai_random_hunt_cell_for = hunt_wrapper(self.ai_random_hunt_cell_for)
+        self.ai_density_hunt_cell_for = hunt_wrapper(self.ai_density_hunt_cell_for)
+        self.ai_montecarlo_cell_for = counted_montecarlo_cell_for
+        TableroDatos.instrumentacion = instr
+        self.instrumentation = instr
+        return instr
+
+    def disable_instrumentation(self):
+        """Quita los envoltorios de enable_instrumentation y retorna la Instrumentacion que había."""
+        instr = self.instrumentation
+        for name in self.INSTRUMENTED_METHODS:
+            self.__dict__.pop(name, None)
+        if instr is not None and TableroDatos.instrumentacion is instr:
+            TableroDatos.instrumentacion = None
+        self.instrumentation = None
+        return instr
 
-        # IA(s)
-        self.ai_for_machine = None
-        self.ai_A = None
-        self.ai_B = None
+    # Inicialización de juegos
+    def _new_boards(self, seed, *names):
+        """
+        Retorna (semilla maestra, tableros) de una partida nueva, un tablero por flujo hijo
+        de 'names'. Sin semilla explícita se toma una partida ya generada de la reserva
+        (si hay una lista); si no, se elige una semilla al azar y se generan aquí.
+        """
+        if seed is None and self.board_pool is not None:
+            ready = self.board_pool.tomar(self.board_size, names)
+            if ready is not None:
+                return ready
+        seed = nueva_semilla() if seed is None else seed
+        return seed, tuple(Tablero(self.board_size, rng=rng_hijo(seed, name)) for name in names)
+
+    def _new_ai(self, seed, name, config=None, fleet=None):
+        """
+        AiState con su flujo aleatorio hijo 'name' que ataca una flota 'fleet'. 'config'
+        son argumentos de AiState (use_parity, hunt_strategy, time_budget); por defecto,
+        caza con paridad.
+        """
+        options = {'use_parity': True}
+        options.update(config or {})
+        return WarShipController.AiState(self.board_size, rng=rng_hijo(seed, name), fleet=fleet, **options)
 
-        # Control de turno
-        self.current_turn = None # 'human', 'machine', 'A', 'B', 'P1', 'P2'
+    def new_session(self, mode, seed=None, config_A=None, config_B=None):
+        """
+        Crea la GameSession de una partida nueva en 'mode' ('solo', 'hv', 'mm', 'hvh') sin
+        tocar la sesión actual ni avisar a los listeners (eso lo hacen los start_*).
+        'config_A' / 'config_B': argumentos de AiState para cada máquina en 'mm' (ver _new_ai).
+        """
+        if mode == 'solo':
+            seed, (game_model,) = self._new_boards(seed, 'game')
+            session = WarShipController.GameSession(mode, seed)
+            session.game_model = game_model
+            session.current_turn = 'human'
+            return session
+        if mode not in ('hv', 'mm', 'hvh'):
+            raise ValueError(f"Modo de juego desconocido: {mode!r}")
+        seed, (tablero1, tablero2) = self._new_boards(seed, 'tablero1', 'tablero2')
+        session = WarShipController.GameSession(mode, seed)
+        session.tablero1, session.tablero2 = tablero1, tablero2
+        if mode == 'hv':
+            session.ai_for_machine = self._new_ai(seed, 'ai_machine', fleet=tablero1.flota)
+            session.current_turn = 'human'
+        elif mode == 'mm':
+            session.ai_A = self._new_ai(seed, 'ai_A', config_A, tablero2.flota) # Estado de la IA A (ataca T2)
+            session.ai_B = self._new_ai(seed, 'ai_B', config_B, tablero1.flota) # Estado de la IA B (ataca T1)
+            session.current_turn = 'A' # Máquina A siempre comienza
+        else:
+            session.current_turn = 'P1'
+        return session
 
-        # Nueva propiedad para resaltar casilla ganadora
-        self.last_hit_win = None
+    def _start(self, mode, seed=None, config_A=None, config_B=None):
+        """Reemplaza la sesión actual por una partida nueva y avisa a los listeners."""
+        self.session = self.new_session(mode, seed, config_A, config_B)
+        self._notify_game_started()
+        return self.session
 
-    # Inicialización de juegos
-    def start_new_game(self):
-        self.mode = 'solo'
-        self.game_model = Tablero(self.board_size)
-        self.tablero1 = self.tablero2 = None
-        self.ai_for_machine = None
-        self.ai_A = self.ai_B = None
-        self.current_turn = 'human'
-        self.last_hit_win = None
-        return self.game_model
+    def start_new_game(self, seed=None):
+        return self._start('solo', seed).game_model
 
-    def start_human_vs_machine(self):
-        self.mode = 'hv'
-        self.tablero1 = Tablero(self.board_size)
-        self.tablero2 = Tablero(self.board_size)
-        self.ai_for_machine = WarShipController.AiState(self.board_size, use_parity=True)
-        self.current_turn = 'human'
-        self.last_hit_win = None
-        return (self.tablero1, self.tablero2)
+    def start_human_vs_machine(self, seed=None):
+        session = self._start('hv', seed)
+        return (session.tablero1, session.tablero2)
 
-    def start_machine_vs_machine(self):
-        self.mode = 'mm'
-        self.tablero1 = Tablero(self.board_size)
-        self.tablero2 = Tablero(self.board_size)
-        self.ai_A = WarShipController.AiState(self.board_size, use_parity=True)
-        self.ai_B = WarShipController.AiState(self.board_size, use_parity=True)
-        self.current_turn = 'A'
-        self.last_hit_win = None
-        return (self.tablero1, self.tablero2)
+    def start_machine_vs_machine(self, seed=None, config_A=None, config_B=None):
+        """'config_A' / 'config_B': argumentos de AiState para cada máquina (ver _new_ai)."""
+        session = self._start('mm', seed, config_A, config_B)
+        return (session.tablero1, session.tablero2)
 
     # def start_human_vs_human(self):
     #     """Inicializa los tableros para el modo Humano vs Humano."""
@@ -83,41 +564,44 @@ class WarShipController:
     #     self.last_hit_win = None
     #     return (self.tablero1, self.tablero2)
     
-    def start_hvh_game(self):
-        self.mode = 'hvh'
-        self.tablero1 = Tablero(self.board_size) # Tablero de P1
-        self.tablero2 = Tablero(self.board_size) # Tablero de P2
-        self.current_turn = 'P1'
-        self.last_hit_win = None
+    def start_hvh_game(self, seed=None):
+        # Tablero de P1 y tablero de P2
+        self._start('hvh', seed)
 
     # Disparos
     def _fmt(self, message: str):
         return message.strip().replace('\n', ' ')
 
-    def process_shot_on(self, tablero: Tablero, row: int, col: int):
-        """Procesa un disparo en el tablero dado (fila, columna)."""
+    def process_shot_on(self, tablero: Tablero, row: int, col: int, session=None):
+        """Procesa un disparo en el tablero dado (fila, columna) de 'session' (por defecto, la actual)."""
+        if session is None:
+            session = self.session
         if tablero is None:
             return "error", self._fmt("Tablero no inicializado.")
 
-        if (row, col) in tablero.plays:
+        # Registrar el intento de disparo (marca la celda y cuenta el impacto si hay barco)
+        impacto = tablero.register_shot(row, col)
+
+        if impacto is None:
             return "repeat", self._fmt("Ya se disparó en esa posición.")
-        
-        # Registrar el intento de disparo
-        tablero.plays.add((row, col))
 
-        if tablero.is_ship_at(row, col):
-            tablero.register_hit()
-            
+        if impacto:
             if tablero.is_game_over():
-                self.last_hit_win = (tablero, row, col)
-                return "win", self._fmt("¡Barco impactado y flota enemiga hundida! ¡Victoria!")
+                session.last_hit_win = (tablero, row, col)
+                result, message = "win", "¡Barco impactado y flota enemiga hundida! ¡Victoria!"
+            elif tablero.barco_hundido_en(row, col):
+                result, message = "sunk", "¡Impacto y hundido!"
             else:
-                return "hit", self._fmt("¡Impacto!")
+                result, message = "hit", "¡Impacto!"
         else:
             # Solo descontar intento si falla (solo/hv/hvh)
-            if self.mode in ('solo', 'hv', 'hvh'): 
+            if session.mode in ('solo', 'hv', 'hvh'):
                  tablero.decrement_tries()
-            return "miss", self._fmt("Agua.")
+            result, message = "miss", "Agua."
+
+        for callback in self.shot_listeners:
+            callback(tablero, row, col, result)
+        return result, self._fmt(message)
 
     # IA Helpers
     def ai_neighbors(self, row, col):
@@ -132,31 +616,71 @@ class WarShipController:
     # Se aplica Algoritmos Aleatorios
     def ai_random_hunt_cell_for(self, ai_state: AiState, use_parity=True):
         """Elige una celda aleatoria que no haya sido disparada, usando paridad si es necesario."""
-        valid_cells = []
-        for r in range(self.board_size):
-            for c in range(self.board_size):
-                if (r, c) not in ai_state.ai_shots:
-                    # Se aplica Fuerza Bruta, ya que IA busca entre todas las celdas válidas hasta encontrar una que cumpla la condición indicada
-                    if not use_parity or (r + c) % 2 == 0:
-                        valid_cells.append((r, c))
-        
-        if not valid_cells:
-            # Si se acaban las celdas de paridad, se relaja la regla
-            if use_parity:
-                return self.ai_random_hunt_cell_for(ai_state, use_parity=False)
-            # Si no quedan celdas sin disparar
-            return None, None
-        
-        row, col = random.choice(valid_cells)
+        if ai_state.ai_hunt_pools is None:
+            # Construir los pools una sola vez con las celdas aún sin disparar
+            n = ai_state.board_size
+            free = [cell for cell, shot in enumerate(ai_state.ai_shot_map) if not shot]
+            ai_state.ai_hunt_pools = (
+                self.CellPool((cell for cell in free if sum(divmod(cell, n)) % 2 == 0), n * n),
+                self.CellPool((cell for cell in free if sum(divmod(cell, n)) % 2 == 1), n * n),
+            )
+        parity_pool, other_pool = ai_state.ai_hunt_pools
+
+        # Con paridad: uniforme entre las celdas de paridad; si se acaban, se relaja la regla
+        # y se elige uniforme entre todas las celdas sin disparar (igual que antes).
+        if use_parity and parity_pool:
+            cell = parity_pool.cells[ai_state.ai_rng.randrange(len(parity_pool))]
+        else:
+            total = len(parity_pool) + len(other_pool)
+            if total == 0:
+                # Si no quedan celdas sin disparar
+                return None, None
+            i = ai_state.ai_rng.randrange(total)
+            cell = parity_pool.cells[i] if i < len(parity_pool) else other_pool.cells[i - len(parity_pool)]
+
+        row, col = divmod(cell, ai_state.board_size)
         return row, col
 
+    def ai_density_hunt_cell_for(self, ai_state: AiState):
+        """Elige la celda sin disparar con mayor densidad de colocaciones posibles."""
+        return ai_state.ai_density.mejor_celda()
+
+    def ai_montecarlo_cell_for(self, ai_state: AiState):
+        """Elige la celda sin disparar más ocupada en las flotas muestreadas (o (None, None))."""
+        return ai_state.ai_montecarlo.mejor_celda()
+
     def ai_enqueue_adjacent_for(self, ai_state: AiState, row: int, col: int):
         """Añade las celdas adyacentes válidas a la cola de objetivos."""
         for r, c in self.ai_neighbors(row, col):
-            if (r, c) not in ai_state.ai_shots and (r, c) not in ai_state.ai_targets:
-                ai_state.ai_targets.append((r, c))
+            if not ai_state.has_shot(r, c):
+                ai_state.push_target(r, c)
 
 
+    def ai_mark_sunk_for(self, ai_state: AiState, row: int, col: int):
+        """
+        El barco con un impacto en (row, col) se hundió: su margen (las 8 vecinas de cada
+        parte) es agua segura, así que se marca como ya resuelto sin disparar y se
+        abandona el modo objetivo de ese barco.
+        """
+        ship = ai_state.sunk_ship_at(row, col)
+        n = self.board_size
+        for ship_row, ship_col in ship:
+            for r in range(max(0, ship_row - 1), min(n, ship_row + 2)):
+                for c in range(max(0, ship_col - 1), min(n, ship_col + 2)):
+                    if ai_state.has_shot(r, c):
+                        continue
+                    ai_state.record_shot(r, c)
+                    if ai_state.ai_density is not None:
+                        ai_state.ai_density.registrar_disparo(r, c, False)
+                    if ai_state.ai_montecarlo is not None:
+                        ai_state.ai_montecarlo.registrar_disparo(r, c, False)
+        if ai_state.ai_density is not None:
+            ai_state.ai_density.registrar_hundido(ship)
+        if ai_state.ai_montecarlo is not None:
+            ai_state.ai_montecarlo.registrar_hundido(ship)
+        ai_state.clear_targets()
+        ai_state.discard_current_hits(ship)
+
     def ai_extend_line_from_hits_for(self, ai_state: AiState, row: int, col: int):
         """
         Extiende la búsqueda a lo largo de una línea si ya hay dos o más golpes consecutivos.
@@ -174,58 +698,84 @@ class WarShipController:
             max_c = max(c for r, c in hits)
 
             # Probar a la izquierda
-            if min_c > 0 and (r, min_c - 1) not in ai_state.ai_shots:
-                ai_state.ai_targets.appendleft((r, min_c - 1))
+            if min_c > 0 and not ai_state.has_shot(r, min_c - 1):
+                ai_state.push_target_front(r, min_c - 1)
             
             # Probar a la derecha
-            if max_c < self.board_size - 1 and (r, max_c + 1) not in ai_state.ai_shots:
-                ai_state.ai_targets.appendleft((r, max_c + 1))
+            if max_c < self.board_size - 1 and not ai_state.has_shot(r, max_c + 1):
+                ai_state.push_target_front(r, max_c + 1)
         else: # Vertical
             c = hits[0][1]
             min_r = min(r for r, c in hits)
             max_r = max(r for r, c in hits)
             
             # Probar arriba
-            if min_r > 0 and (min_r - 1, c) not in ai_state.ai_shots:
-                ai_state.ai_targets.appendleft((min_r - 1, c))
+            if min_r > 0 and not ai_state.has_shot(min_r - 1, c):
+                ai_state.push_target_front(min_r - 1, c)
 
             # Probar abajo
-            if max_r < self.board_size - 1 and (max_r + 1, c) not in ai_state.ai_shots:
-                ai_state.ai_targets.appendleft((max_r + 1, c))
-        
-        # Eliminar duplicados si los hay (aunque la lógica de shots/targets lo evita)
-        ai_state.ai_targets = collections.deque(list(dict.fromkeys(ai_state.ai_targets)))
-
-    def ai_make_move_on(self, tablero: Tablero, ai_state: AiState):
-        """Elige y procesa el siguiente movimiento de la IA en el tablero."""
+            if max_r < self.board_size - 1 and not ai_state.has_shot(max_r + 1, c):
+                ai_state.push_target_front(max_r + 1, c)
+        # push_target_front ya evita duplicados en la cola, sin reconstruirla
+
+    def ai_make_move_on(self, tablero: Tablero, ai_state: AiState, session=None):
+        """Elige y procesa el siguiente movimiento de la IA en el tablero (de 'session', por defecto la actual)."""
+        if session is None:
+            session = self.session
         row, col = None, None
+
+        # 0. IA Monte Carlo: las muestras ya explican los impactos, así que sirve para
+        # cazar y para rematar; si no logró muestras a tiempo se sigue con caza/objetivo
+        if ai_state.ai_montecarlo is not None:
+            row, col = self.ai_montecarlo_cell_for(ai_state)
         
         # 1. Modo objetivo (Target mode)
-        while ai_state.ai_targets:
-            r, c = ai_state.ai_targets.popleft()
-            if (r, c) not in ai_state.ai_shots:
+        while row is None and ai_state.ai_targets:
+            r, c = ai_state.pop_target()
+            if not ai_state.has_shot(r, c):
                 row, col = r, c
                 break
         
         # 2. Modo caza (Hunt mode)
         if row is None:
-            row, col = self.ai_random_hunt_cell_for(ai_state, ai_state.ai_use_parity)
+            if ai_state.ai_density is not None:
+                row, col = self.ai_density_hunt_cell_for(ai_state)
+            else:
+                row, col = self.ai_random_hunt_cell_for(ai_state, ai_state.ai_use_parity)
             if row is None:
                 return None, None, "error", self._fmt("IA se quedó sin movimientos.")
 
-        ai_state.ai_shots.add((row, col))
-        result, message = self.process_shot_on(tablero, row, col)
+        result, message = self.process_shot_on(tablero, row, col, session)
+        self.ai_record_result_for(ai_state, row, col, result)
+        return (row, col, result, message)
 
-        # 3. Actualización de estado
-        if result == "hit" or result == "win":
-            ai_state.ai_current_hits.append((row, col))
-            ai_state.ai_hits.append((row, col))
+    def ai_record_result_for(self, ai_state: AiState, row: int, col: int, result: str):
+        """
+        Actualiza la memoria de la IA tras su disparo en (row, col) con resultado 'result'
+        ("miss", "hit", "sunk", "win" o "repeat"). Sin tablero ni sesión: las IAs de
+        búsqueda lo usan para aplicar disparos hipotéticos (ver AiState.start_journal).
+        """
+        ai_state.record_shot(row, col)
+        hit = result in ("hit", "sunk", "win")
+        if hit:
+            ai_state.record_hit(row, col)
+        if ai_state.ai_density is not None and result != "repeat":
+            ai_state.ai_density.registrar_disparo(row, col, hit)
+        if ai_state.ai_montecarlo is not None and result != "repeat":
+            ai_state.ai_montecarlo.registrar_disparo(row, col, hit)
+
+        # Actualización de estado
+        if hit:
+            ai_state.append_hit(row, col)
             
             if result == "win":
                 # Limpiar todo si el juego termina
-                ai_state.ai_targets = collections.deque()
-                ai_state.ai_current_hits = []
-                # El barco actual se hundió
+                ai_state.clear_targets()
+                ai_state.discard_current_hits()
+
+            elif result == "sunk":
+                # El barco actual se hundió: descartar su margen y volver a cazar
+                self.ai_mark_sunk_for(ai_state, row, col)
             
             elif len(ai_state.ai_current_hits) == 1:
                 # Primer golpe, pasar a modo objetivo adyacente
@@ -234,33 +784,74 @@ class WarShipController:
             elif len(ai_state.ai_current_hits) >= 2:
                 # Segundo golpe o más, extender la línea de ataque
                 # Se limpia la cola antes de extender para priorizar la línea
-                ai_state.ai_targets = collections.deque()
+                ai_state.clear_targets()
                 self.ai_extend_line_from_hits_for(ai_state, row, col)
 
-        elif result == "miss" or result == "repeat":
-            pass
-
-        # 4. Chequear si el barco actual se hundió
-        if result == "hit":
-            ai_state.ai_hits.append((row, col))
-            ai_state.ai_current_hits.append((row, col))
-            
-            if tablero.is_game_over():
-                self.last_hit_win = (row, col)
-                # Si el juego ha terminado, forzamos el resultado a "win"
-                result = "win" 
-
-        # Si no quedan targets, volvemos a modo Hunt
-        if not ai_state.ai_targets:
-            ai_state.ai_current_hits = []
-        return (row, col, result, message)
+        # Sin objetivos pendientes pero con impactos de un barco aún a flote (el tablero
+        # avisa al hundirlo): volver a rodear esos impactos; si ya no queda nada
+        # alrededor, se vuelve a modo Hunt
+        if not ai_state.ai_targets and ai_state.ai_current_hits:
+            for r, c in ai_state.ai_current_hits:
+                self.ai_enqueue_adjacent_for(ai_state, r, c)
+            if not ai_state.ai_targets:
+                ai_state.discard_current_hits()
+
+    # Turnos sobre sesiones (la ventana lleva los turnos de la sesión actual por su cuenta).
+    # Al terminar la partida dejan current_turn en None.
+    def play_human_turn(self, session, row, col):
+        """
+        Disparo del jugador humano al que le toca en 'session' ('solo': al tablero;
+        'hv': a T2; 'hvh': P1 a T2 y P2 a T1) y paso del turno, como en WarShipGame.
+        Retorna (result, message); ("error", ...) si no es turno de un humano.
+        """
+        turn = session.current_turn
+        if turn is None:
+            return "error", self._fmt("La partida ya terminó.")
+        if session.mode == 'solo':
+            tablero, next_turn = session.game_model, turn
+        elif session.mode == 'hv' and turn == 'human':
+            tablero, next_turn = session.tablero2, 'machine'
+        elif session.mode == 'hvh' and turn in ('P1', 'P2'):
+            tablero, next_turn = (session.tablero2, 'P2') if turn == 'P1' else (session.tablero1, 'P1')
+        else:
+            return "error", self._fmt("No es el turno de un jugador humano.")
+        result, message = self.process_shot_on(tablero, row, col, session)
+        if self.is_game_finished(session):
+            session.current_turn = None
+        elif result not in ("repeat", "error"):
+            session.current_turn = next_turn
+        return result, message
+
+    def play_machine_turn(self, session):
+        """
+        Jugada de la máquina a la que le toca en 'session' ('hv': ataca T1; 'mm': A ataca
+        T2 y B ataca T1) y paso del turno. Retorna (row, col, result, message).
+        """
+        turn = session.current_turn
+        if turn is None:
+            return None, None, "error", self._fmt("La partida ya terminó.")
+        if session.mode == 'hv' and turn == 'machine':
+            tablero, ai_state, next_turn = session.tablero1, session.ai_for_machine, 'human'
+        elif session.mode == 'mm' and turn in ('A', 'B'):
+            if turn == 'A':
+                tablero, ai_state, next_turn = session.tablero2, session.ai_A, 'B'
+            else:
+                tablero, ai_state, next_turn = session.tablero1, session.ai_B, 'A'
+        else:
+            return None, None, "error", self._fmt("No es el turno de una máquina.")
+        move = self.ai_make_move_on(tablero, ai_state, session)
+        # En 'hv' y 'mm' la partida solo termina al hundir la última parte de una flota
+        session.current_turn = None if move[2] == "win" else next_turn
+        return move
 
     # Estado del juego
-    def is_game_finished(self):
-        if self.mode == 'solo':
-            return self.is_game_finished_on(self.game_model)
-        elif self.mode in ('hv', 'mm', 'hvh'):
-            return self.tablero1.is_game_over() or self.tablero2.is_game_over()
+    def is_game_finished(self, session=None):
+        if session is None:
+            session = self.session
+        if session.mode == 'solo':
+            return self.is_game_finished_on(session.game_model)
+        elif session.mode in ('hv', 'mm', 'hvh'):
+            return session.tablero1.is_game_over() or session.tablero2.is_game_over()
         return False
 
     def is_game_finished_on(self, tablero):
@@ -268,23 +859,25 @@ class WarShipController:
             return False
         return tablero.is_game_over() or tablero.has_run_out_of_tries()
 
-    def get_winner(self):
-        if self.mode == 'solo':
-            return "Jugador" if self.game_model.is_game_over() else None
+    def get_winner(self, session=None):
+        if session is None:
+            session = self.session
+        if session.mode == 'solo':
+            return "Jugador" if session.game_model.is_game_over() else None
             
-        elif self.mode == 'hv':
-            if self.tablero1.is_game_over(): return "Máquina"
-            elif self.tablero2.is_game_over(): return "Humano"
+        elif session.mode == 'hv':
+            if session.tablero1.is_game_over(): return "Máquina"
+            elif session.tablero2.is_game_over(): return "Humano"
                 
-        elif self.mode == 'mm':
+        elif session.mode == 'mm':
             # Asumiendo: Máquina B ataca T1, Máquina A ataca T2
-            if self.tablero1.is_game_over(): return "Máquina B"
-            elif self.tablero2.is_game_over(): return "Máquina A"
+            if session.tablero1.is_game_over(): return "Máquina B"
+            elif session.tablero2.is_game_over(): return "Máquina A"
             
-        elif self.mode == 'hvh':
+        elif session.mode == 'hvh':
             # Jugador 2 ataca T1, Jugador 1 ataca T2
-            if self.tablero1.is_game_over(): return "Jugador 2" 
-            elif self.tablero2.is_game_over(): return "Jugador 1" 
+            if session.tablero1.is_game_over(): return "Jugador 2" 
+            elif session.tablero2.is_game_over(): return "Jugador 1" 
             
         return None
 
@@ -298,10 +891,11 @@ class WarShipController:
     def get_game_model(self):
         return self.game_model
 
-    def get_last_winning_cell(self):
+    def get_last_winning_cell(self, session=None):
         """Retorna (row, col) de la casilla ganadora o None."""
-        if self.last_hit_win:
-            tablero, row, col = self.last_hit_win
+        last_hit_win = (self.session if session is None else session).last_hit_win
+        if last_hit_win:
+            tablero, row, col = last_hit_win
             if tablero.is_game_over():
                 return (row, col)
         return None
@@ -321,21 +915,6 @@ class WarShipController:
             return tablero.are_hints_shown
         return False
     
-    def start_mm_game(self):
-        """Inicializa el juego para el modo Máquina vs Máquina."""
-        
-        # 1. Configurar el modo y crear tableros
-        self.mode = 'mm'
-        self.tablero1 = Tablero(self.board_size) # Tablero para Máquina A (atacado por B)
-        self.tablero2 = Tablero(self.board_size) # Tablero para Máquina B (atacado por A)
-        
-        # 2. Inicializar los estados de ambas IA
-        # Asumimos que T1 es 'Máquina A' y T2 es 'Máquina B'
-        self.ai_A = self.AiState(self.board_size) # Estado de la IA A (ataca T2)
-        self.ai_B = self.AiState(self.board_size) # Estado de la IA B (ataca T1)
-        
-        # 3. Inicializar turno
-        self.current_turn = 'A' # Máquina A siempre comienza
-        self.last_hit_win = None
-        # Limpiar el estado de la IA de Humano vs Máquina si es que existía
-        self.ai_for_machine = None 
\ No newline at end of file
+    def start_mm_game(self, seed=None, config_A=None, config_B=None):
+        """Inicializa el juego para el modo Máquina vs Máquina (igual que start_machine_vs_machine)."""
+        self._start('mm', seed, config_A, config_B)
@@ -0,0 +1,136 @@
+# Controlador/densidad.py
+import heapq
+import random
+import functools
+import collections
+from Entidad.tablero_datos import IndiceColocaciones, FLOTA_ESTANDAR, orientaciones
+
+
+@functools.lru_cache(maxsize=None)
+def _densidad_inicial(board_size, flota):
+    """Densidad de un tablero vacío: cuántas colocaciones de la flota cubren cada celda."""
+    n_celdas = board_size * board_size
+    densidad = [0] * n_celdas
+    for tam, cantidad in collections.Counter(flota).items():
+        indice = IndiceColocaciones.para(board_size, board_size, tam)
+        for orient in orientaciones(tam):
+            for pid in range(indice.total[orient]):
+                for celda in range(n_celdas)[indice.huella(orient, pid)]:
+                    densidad[celda] += cantidad
+    return tuple(densidad)
+
+
+class MapaDensidad:
+    """
+    Mapa de densidad de probabilidad para el modo caza de la IA.
+    Cada celda guarda cuántas colocaciones legales de los barcos de la flota la cubren
+    (ponderadas por la cantidad de barcos de cada tamaño que siguen a flote). Cada
+    disparo invalida solo las colocaciones que pasan por las celdas afectadas y resta
+    sus celdas, en lugar de recalcular el mapa completo.
+    La celda de mayor densidad se mantiene con un heap "perezoso": como las densidades
+    solo bajan, una entrada desactualizada se reinserta con su valor actual al llegar
+    a la cima.
+    """
+
+    def __init__(self, board_size, flota=FLOTA_ESTANDAR, rng=random):
+        self.board_size = board_size
+        self.cantidades = collections.Counter(flota)
+        self.indices = {tam: IndiceColocaciones.para(board_size, board_size, tam) for tam in self.cantidades}
+        # Colocaciones aún posibles (1) por (tam, orient)
+        self.vivas = {(tam, orient): bytearray(b'\x01') * indice.total[orient]
+                      for tam, indice in self.indices.items() for orient in orientaciones(tam)}
+        self.densidad = list(_densidad_inicial(board_size, tuple(sorted(flota))))
+        self.disparadas = bytearray(board_size * board_size)
+        self.bloqueadas = bytearray(board_size * board_size)
+        # (−densidad, desempate aleatorio, celda)
+        self.heap = [(-d, rng.random(), celda) for celda, d in enumerate(self.densidad)]
+        heapq.heapify(self.heap)
+
+    def registrar_disparo(self, row, col, impacto):
+        """
+        Actualiza el mapa tras un disparo propio en (row, col).
+        La celda deja de estar disponible para otros barcos y, si fue impacto, sus
+        diagonales son agua segura (los barcos son rectos y no se tocan).
+        """
+        celda = row * self.board_size + col
+        self.disparadas[celda] = 1
+        self._bloquear(celda)
+        if impacto:
+            for dr, dc in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+                r, c = row + dr, col + dc
+                if 0 <= r < self.board_size and 0 <= c < self.board_size:
+                    self._bloquear(r * self.board_size + c)
+
+    def registrar_hundido(self, impactos):
+        """
+        La IA da por hundido el barco formado por las celdas 'impactos' (row, col):
+        su margen queda bloqueado y queda un barco menos de ese tamaño.
+        """
+        n = self.board_size
+        for row, col in impactos:
+            for r in range(max(0, row - 1), min(n, row + 2)):
+                for c in range(max(0, col - 1), min(n, col + 2)):
+                    self._bloquear(r * n + c)
+
+        tam = len(impactos)
+        if self.cantidades.get(tam, 0) <= 0:
+            return
+        self.cantidades[tam] -= 1
+        # Quitar una unidad de peso a todas las colocaciones vivas de ese tamaño
+        densidad = self.densidad
+        celdas = range(len(densidad))
+        indice = self.indices[tam]
+        for orient in orientaciones(tam):
+            for pid, viva in enumerate(self.vivas[(tam, orient)]):
+                if viva:
+                    for c in celdas[indice.huella(orient, pid)]:
+                        densidad[c] -= 1
+
+    def _bloquear(self, celda):
+        """Invalida todas las colocaciones vivas que pasan por la celda."""
+        if self.bloqueadas[celda]:
+            return
+        self.bloqueadas[celda] = 1
+        densidad = self.densidad
+        n = self.board_size
+        r, c = divmod(celda, n)
+        # Mismos ids que IndiceColocaciones (H: r * anchos_h + c ; V: r * n + c),
+        # calculados aquí en línea porque es el camino caliente de la IA.
+        for tam, peso in self.cantidades.items():
+            if peso <= 0:
+                continue # Ya no quedan barcos de este tamaño: no aportan densidad
+            ancho = n - tam + 1
+            if ancho <= 0:
+                continue
+            vivas = self.vivas[(tam, 'H')]
+            for c0 in range(max(0, c - tam + 1), min(c, ancho - 1) + 1):
+                pid = r * ancho + c0
+                if vivas[pid]:
+                    vivas[pid] = 0
+                    inicio = r * n + c0
+                    for k in range(inicio, inicio + tam):
+                        densidad[k] -= peso
+            if tam == 1:
+                continue
+            vivas = self.vivas[(tam, 'V')]
+            for r0 in range(max(0, r - tam + 1), min(r, ancho - 1) + 1):
+                pid = r0 * n + c
+                if vivas[pid]:
+                    vivas[pid] = 0
+                    for k in range(pid, pid + tam * n, n):
+                        densidad[k] -= peso
+
+    def mejor_celda(self):
+        """Retorna (row, col) de la celda sin disparar de mayor densidad, o (None, None)."""
+        heap = self.heap
+        while heap:
+            neg_densidad, desempate, celda = heap[0]
+            if self.disparadas[celda]:
+                heapq.heappop(heap)
+                continue
+            actual = self.densidad[celda]
+            if -neg_densidad != actual:
+                heapq.heapreplace(heap, (-actual, desempate, celda))
+                continue
+            return divmod(celda, self.board_size)
+        return None, None
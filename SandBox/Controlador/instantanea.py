@@ -0,0 +1,377 @@
+# Controlador/instantanea.py
+"""
+Instantáneas binarias de una partida completa (WarShipController.GameSession): tableros
+con sus disparos e ids de barco, IAs con su memoria (mapa de disparos, cola de
+objetivos, impactos, pools de caza, mapa de densidad o cadena Monte Carlo) y el
+estado de su generador, turno, semilla y casilla ganadora. Sirven para guardar y
+retomar partidas largas y para bifurcar una partida (clonar_sesion) en IAs de búsqueda:
+la copia sigue jugando exactamente igual que el original.
+
+Formato: CABECERA (b'BSGS' + versión) y después, con enteros en varint (LEB128, como
+Controlador.registro) y arrays en little-endian precedidos de su longitud:
+
+    byte    modo (índice en registro.MODOS)
+    byte    turno (índice en TURNOS)
+    semilla (ver _escribir_semilla)
+    byte    tableros presentes (bit i = SLOTS_TABLERO[i]), y cada tablero presente
+    byte    IAs presentes (bit i = SLOTS_IA[i]), y cada IA presente
+    byte    tipo de last_hit_win (0 ninguno, 1 (tablero, row, col)) y sus datos
+
+Los generadores de los tableros no se guardan: solo sirven para colocar la flota, que
+ya está en las celdas. Cada IA restaurada recibe un random.Random propio con el
+estado guardado (aunque la original usara el módulo global 'random').
+Los diarios de jugadas (Tablero.aplicar_disparo, AiState.start_journal) no se guardan.
+Solo deben restaurarse instantáneas de origen confiable: no se validan a fondo.
+"""
+import sys
+import array
+import random
+import collections
+from Entidad.entidad import Tablero
+from Controlador.controlador import WarShipController
+from Controlador.densidad import MapaDensidad
+from Controlador.montecarlo import MuestreadorMC
+from Controlador.registro import MODOS, escribir_varint, leer_varint
+from Entidad.tablero_datos import IndiceColocaciones
+
+CABECERA = b'BSGS\x02'
+TURNOS = (None, 'human', 'machine', 'A', 'B', 'P1', 'P2')
+SLOTS_TABLERO = ('game_model', 'tablero1', 'tablero2')
+SLOTS_IA = ('ai_for_machine', 'ai_A', 'ai_B')
+
+_CODIGO_MODO = {modo: i for i, modo in enumerate(MODOS)}
+_CODIGO_TURNO = {turno: i for i, turno in enumerate(TURNOS)}
+_CODIGO_ESTRATEGIA = {estrategia: i for i, estrategia in enumerate(WarShipController.HUNT_STRATEGIES)}
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+# Primitivas
+def _zigzag(valor):
+    return valor * 2 if valor >= 0 else -valor * 2 - 1
+
+
+def _dezigzag(valor):
+    return valor >> 1 if not valor & 1 else -(valor >> 1) - 1
+
+
+def _escribir_array(destino, tipo, valores):
+    """Longitud (varint) + los valores como array 'tipo' en little-endian."""
+    datos = valores if isinstance(valores, array.array) and valores.typecode == tipo else array.array(tipo, valores)
+    if _BIG_ENDIAN:
+        datos = array.array(tipo, datos)
+        datos.byteswap()
+    escribir_varint(destino, len(datos))
+    destino += datos.tobytes()
+
+
+def _escribir_bytes(destino, datos):
+    escribir_varint(destino, len(datos))
+    destino += datos
+
+
+def _escribir_semilla(destino, semilla):
+    """byte tipo (0 ninguna, 1 entero, 2 texto, 3 bytes) + valor."""
+    if semilla is None:
+        destino.append(0)
+    elif isinstance(semilla, int):
+        destino.append(1)
+        escribir_varint(destino, _zigzag(semilla))
+    elif isinstance(semilla, str):
+        destino.append(2)
+        _escribir_bytes(destino, semilla.encode())
+    else:
+        destino.append(3)
+        _escribir_bytes(destino, bytes(semilla))
+
+
+class _Lector:
+    """Cursor sobre los bytes de una instantánea."""
+    __slots__ = ('datos', 'pos')
+
+    def __init__(self, datos, pos=0):
+        self.datos = datos
+        self.pos = pos
+
+    def byte(self):
+        valor = self.datos[self.pos]
+        self.pos += 1
+        return valor
+
+    def varint(self):
+        valor, self.pos = leer_varint(self.datos, self.pos)
+        return valor
+
+    def bytes(self):
+        n = self.varint()
+        inicio, self.pos = self.pos, self.pos + n
+        return bytes(self.datos[inicio:self.pos])
+
+    def array(self, tipo):
+        datos = array.array(tipo)
+        n = self.varint()
+        inicio, self.pos = self.pos, self.pos + n * datos.itemsize
+        datos.frombytes(self.datos[inicio:self.pos])
+        if _BIG_ENDIAN:
+            datos.byteswap()
+        return datos
+
+    def semilla(self):
+        tipo = self.byte()
+        if tipo == 0:
+            return None
+        if tipo == 1:
+            return _dezigzag(self.varint())
+        return self.bytes().decode() if tipo == 2 else self.bytes()
+
+
+# Generadores
+def _escribir_rng(destino, rng):
+    """Estado de un random.Random (o del módulo 'random'): 625 palabras de 32 bits + gauss_next."""
+    version, palabras, gauss_next = rng.getstate()
+    escribir_varint(destino, version)
+    _escribir_array(destino, 'I', palabras)
+    if gauss_next is None:
+        destino.append(0)
+    else:
+        destino.append(1)
+        _escribir_array(destino, 'd', (gauss_next,))
+
+
+def _leer_rng(lector):
+    version = lector.varint()
+    palabras = tuple(lector.array('I'))
+    gauss_next = lector.array('d')[0] if lector.byte() else None
+    # Sin __init__: sembrarlo desde el sistema sería tiempo perdido, setstate lo pisa entero
+    rng = random.Random.__new__(random.Random)
+    rng.setstate((version, palabras, gauss_next))
+    return rng
+
+
+# Tableros
+def escribir_tablero(destino, tablero):
+    """Añade a 'destino' (bytearray) el estado completo de un Tablero."""
+    escribir_varint(destino, tablero.filas)
+    escribir_varint(destino, tablero.columnas)
+    _escribir_array(destino, 'H', tablero.flota)
+    _escribir_bytes(destino, tablero.celdas)
+    _escribir_array(destino, 'H', tablero.barco_de)
+    _escribir_array(destino, 'I', tablero.tamanos_barco)
+    _escribir_array(destino, 'I', tablero.partes_vivas)
+    escribir_varint(destino, tablero.total_parts)
+    escribir_varint(destino, tablero.parts_hit)
+    escribir_varint(destino, _zigzag(tablero.total_tries))
+    destino.append(1 if tablero.are_hints_shown else 0)
+
+
+def leer_tablero(lector):
+    """Tablero guardado con escribir_tablero (sin volver a colocar barcos)."""
+    tablero = Tablero.__new__(Tablero)
+    tablero.filas = lector.varint()
+    tablero.columnas = lector.varint()
+    tablero.flota = tuple(lector.array('H'))
+    tablero.rng = random
+    tablero.celdas = bytearray(lector.bytes())
+    tablero.barco_de = lector.array('H')
+    tablero.tamanos_barco = lector.array('I').tolist()
+    tablero.partes_vivas = lector.array('I').tolist()
+    tablero.total_parts = lector.varint()
+    tablero.parts_hit = lector.varint()
+    tablero.total_tries = _dezigzag(lector.varint())
+    tablero.are_hints_shown = bool(lector.byte())
+    tablero.diario = None
+    tablero.jugadas_diario = 0
+    return tablero
+
+
+# Estrategias de caza con estado propio
+def _escribir_densidad(destino, mapa):
+    # Las claves de 'cantidades' (aunque lleguen a 0) fijan los índices
+    _escribir_array(destino, 'H', list(mapa.cantidades))
+    _escribir_array(destino, 'I', mapa.cantidades.values())
+    escribir_varint(destino, len(mapa.vivas))
+    for (tam, orient), vivas in mapa.vivas.items():
+        escribir_varint(destino, tam)
+        destino.append(0 if orient == 'H' else 1)
+        _escribir_bytes(destino, vivas)
+    _escribir_array(destino, 'q', mapa.densidad)
+    _escribir_bytes(destino, mapa.disparadas)
+    _escribir_bytes(destino, mapa.bloqueadas)
+    # El heap tal cual (su orden decide las jugadas): −densidad, desempate, celda
+    negativas, desempates, celdas = zip(*mapa.heap) if mapa.heap else ((), (), ())
+    _escribir_array(destino, 'q', negativas)
+    _escribir_array(destino, 'd', desempates)
+    _escribir_array(destino, 'I', celdas)
+
+
+def _leer_densidad(lector, board_size):
+    mapa = MapaDensidad.__new__(MapaDensidad)
+    mapa.board_size = board_size
+    tamanos = lector.array('H')
+    mapa.cantidades = collections.Counter(dict(zip(tamanos, lector.array('I'))))
+    mapa.indices = {tam: IndiceColocaciones.para(board_size, board_size, tam) for tam in mapa.cantidades}
+    mapa.vivas = {}
+    for _ in range(lector.varint()):
+        tam = lector.varint()
+        orient = 'H' if lector.byte() == 0 else 'V'
+        mapa.vivas[(tam, orient)] = bytearray(lector.bytes())
+    mapa.densidad = lector.array('q').tolist()
+    mapa.disparadas = bytearray(lector.bytes())
+    mapa.bloqueadas = bytearray(lector.bytes())
+    negativas, desempates, celdas = lector.array('q'), lector.array('d'), lector.array('I')
+    mapa.heap = list(zip(negativas.tolist(), desempates.tolist(), celdas.tolist()))
+    return mapa
+
+
+def _escribir_montecarlo(destino, mc):
+    _escribir_array(destino, 'H', mc.flota)
+    _escribir_array(destino, 'd', (-1.0 if mc.presupuesto is None else mc.presupuesto,)) # −1: sin reloj
+    escribir_varint(destino, mc.barridos)
+    escribir_varint(destino, mc.calentamiento)
+    # Observaciones: máscaras de bits de ancho fijo
+    ancho = (mc.board_size * mc.board_size + 7) // 8
+    for mascara in (mc.agua, mc.impactos, mc.disparadas):
+        _escribir_bytes(destino, mascara.to_bytes(ancho, 'little'))
+    # Flota actual de la cadena: por hueco, bit 0 = colocado, bit 1 = fijo; orientación e inicio
+    _escribir_bytes(destino, bytes((huella != 0) | fijo << 1 for huella, fijo in zip(mc.huella, mc.fijo)))
+    _escribir_bytes(destino, bytes(mc.orient))
+    _escribir_array(destino, 'I', mc.inicio)
+    destino.append(1 if mc.valida else 0)
+
+
+def _leer_montecarlo(lector, board_size, rng):
+    flota = tuple(lector.array('H'))
+    presupuesto = lector.array('d')[0]
+    mc = MuestreadorMC(board_size, flota, rng=rng, presupuesto=None if presupuesto < 0 else presupuesto,
+                       barridos=lector.varint(), calentamiento=lector.varint())
+    mc.agua, mc.impactos, mc.disparadas = (int.from_bytes(lector.bytes(), 'little') for _ in range(3))
+    estados, orients, inicios = lector.bytes(), lector.bytes(), lector.array('I')
+    for k, estado in enumerate(estados):
+        if estado & 1:
+            mc._poner(k, orients[k], inicios[k])
+        mc.fijo[k] = bool(estado & 2)
+    mc.valida = bool(lector.byte())
+    if mc.valida:
+        # Los factores dependen solo de las colocaciones: recalculados son idénticos
+        mc.factores = mc._factores_desde(0)
+    return mc
+
+
+# IAs
+def escribir_ia(destino, ai_state):
+    """Añade a 'destino' (bytearray) el estado completo de un WarShipController.AiState."""
+    n = ai_state.board_size
+    escribir_varint(destino, n)
+    destino.append(_CODIGO_ESTRATEGIA[ai_state.ai_hunt_strategy])
+    destino.append(1 if ai_state.ai_use_parity else 0)
+    _escribir_rng(destino, ai_state.ai_rng)
+    _escribir_bytes(destino, ai_state.ai_shot_map)
+    # Coordenadas (row, col) como índices de celda
+    _escribir_array(destino, 'I', [r * n + c for r, c in ai_state.ai_targets])
+    _escribir_array(destino, 'I', [r * n + c for r, c in ai_state.ai_hits])
+    _escribir_array(destino, 'I', [r * n + c for r, c in ai_state.ai_current_hits])
+    if ai_state.ai_hunt_pools is None:
+        destino.append(0)
+    else:
+        destino.append(1)
+        for pool in ai_state.ai_hunt_pools:
+            _escribir_array(destino, 'i', pool.cells)
+    destino.append((ai_state.ai_density is not None) | (ai_state.ai_montecarlo is not None) << 1)
+    if ai_state.ai_density is not None:
+        _escribir_densidad(destino, ai_state.ai_density)
+    if ai_state.ai_montecarlo is not None:
+        _escribir_montecarlo(destino, ai_state.ai_montecarlo)
+
+
+def leer_ia(lector):
+    """AiState guardado con escribir_ia."""
+    AiState = WarShipController.AiState
+    ai_state = AiState.__new__(AiState)
+    n = ai_state.board_size = lector.varint()
+    ai_state.ai_hunt_strategy = WarShipController.HUNT_STRATEGIES[lector.byte()]
+    ai_state.ai_use_parity = bool(lector.byte())
+    ai_state.ai_rng = _leer_rng(lector)
+    ai_state.ai_shot_map = bytearray(lector.bytes())
+    ai_state.ai_targets = WarShipController.TargetQueue(n, lector.array('I'))
+    ai_state.ai_queued_map = ai_state.ai_targets.queued
+    ai_state.ai_hits = [divmod(celda, n) for celda in lector.array('I')]
+    ai_state.ai_current_hits = [divmod(celda, n) for celda in lector.array('I')]
+    ai_state.ai_hunt_pools = None
+    if lector.byte():
+        CellPool = WarShipController.CellPool
+        pools = []
+        for _ in range(2):
+            pool = CellPool.__new__(CellPool)
+            pool.cells = lector.array('i')
+            pool.positions = array.array('i', [-1]) * (n * n)
+            for i, celda in enumerate(pool.cells):
+                pool.positions[celda] = i
+            pools.append(pool)
+        ai_state.ai_hunt_pools = tuple(pools)
+    estrategias = lector.byte()
+    # La densidad y el Monte Carlo comparten el generador de la IA, como en AiState.__init__
+    ai_state.ai_density = _leer_densidad(lector, n) if estrategias & 1 else None
+    ai_state.ai_montecarlo = _leer_montecarlo(lector, n, ai_state.ai_rng) if estrategias & 2 else None
+    ai_state.ai_journal = None
+    return ai_state
+
+
+# Sesiones
+def guardar_sesion(session):
+    """Instantánea (bytes) de una WarShipController.GameSession."""
+    destino = bytearray(CABECERA)
+    destino.append(_CODIGO_MODO[session.mode])
+    destino.append(_CODIGO_TURNO[session.current_turn])
+    _escribir_semilla(destino, session.game_seed)
+
+    tableros = [getattr(session, slot) for slot in SLOTS_TABLERO]
+    destino.append(sum(1 << i for i, tablero in enumerate(tableros) if tablero is not None))
+    for tablero in tableros:
+        if tablero is not None:
+            escribir_tablero(destino, tablero)
+
+    ias = [getattr(session, slot) for slot in SLOTS_IA]
+    destino.append(sum(1 << i for i, ai_state in enumerate(ias) if ai_state is not None))
+    for ai_state in ias:
+        if ai_state is not None:
+            escribir_ia(destino, ai_state)
+
+    ganadora = session.last_hit_win
+    if ganadora is None:
+        destino.append(0)
+    else:
+        # El tablero se guarda como su posición entre SLOTS_TABLERO
+        destino.append(1)
+        destino.append(next(i for i, tablero in enumerate(tableros) if tablero is ganadora[0]))
+        escribir_varint(destino, ganadora[1])
+        escribir_varint(destino, ganadora[2])
+    return bytes(destino)
+
+
+def restaurar_sesion(datos):
+    """GameSession nueva (sin session_id) a partir de una instantánea de guardar_sesion."""
+    if bytes(datos[:len(CABECERA)]) != CABECERA:
+        raise ValueError("No es una instantánea de partida (cabecera o versión desconocida).")
+    lector = _Lector(memoryview(datos), len(CABECERA))
+    session = WarShipController.GameSession(MODOS[lector.byte()])
+    session.current_turn = TURNOS[lector.byte()]
+    session.game_seed = lector.semilla()
+
+    presentes = lector.byte()
+    tableros = [leer_tablero(lector) if presentes & (1 << i) else None for i in range(len(SLOTS_TABLERO))]
+    for slot, tablero in zip(SLOTS_TABLERO, tableros):
+        setattr(session, slot, tablero)
+    presentes = lector.byte()
+    for i, slot in enumerate(SLOTS_IA):
+        if presentes & (1 << i):
+            setattr(session, slot, leer_ia(lector))
+
+    tipo = lector.byte()
+    if tipo == 1:
+        tablero = tableros[lector.byte()]
+        session.last_hit_win = (tablero, lector.varint(), lector.varint())
+    return session
+
+
+def clonar_sesion(session):
+    """Copia independiente de una partida que, jugada igual, produce las mismas jugadas."""
+    return restaurar_sesion(guardar_sesion(session))
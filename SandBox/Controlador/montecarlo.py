@@ -0,0 +1,450 @@
+# Controlador/montecarlo.py
+import time
+import random
+import functools
+from Entidad.tablero_datos import IndiceColocaciones, FLOTA_ESTANDAR, orientaciones
+
+
+@functools.lru_cache(maxsize=None)
+def _tablas(board_size, tam):
+    """
+    Colocaciones de un barco de 'tam' celdas como máscaras de bits (bit i = celda i),
+    una tupla por orientación con:
+      - paso: distancia entre celdas consecutivas del barco (1 en 'H', board_size en 'V')
+      - inicios: máscara de las celdas donde puede empezar una colocación legal
+      - huellas[inicio], margenes[inicio]: celdas del barco y barco + 1 celda alrededor
+      - cubren[celda]: máscara de los inicios cuyas colocaciones pasan por la celda
+    """
+    indice = IndiceColocaciones.para(board_size, board_size, tam)
+    celdas_tablero = range(board_size * board_size)
+    tablas = []
+    for orient in orientaciones(tam):
+        huellas = [0] * len(celdas_tablero)
+        margenes = [0] * len(celdas_tablero)
+        cubren = [0] * len(celdas_tablero)
+        inicios = 0
+        for pid in range(indice.total[orient]):
+            row, col = indice.origen(orient, pid)
+            inicio = row * board_size + col
+            inicios |= 1 << inicio
+            for celda in celdas_tablero[indice.huella(orient, pid)]:
+                huellas[inicio] |= 1 << celda
+                cubren[celda] |= 1 << inicio
+            for zona in indice.margen(orient, pid):
+                margenes[inicio] |= ((1 << (zona.stop - zona.start)) - 1) << zona.start
+        tablas.append((1 if orient == 'H' else board_size, inicios, tuple(huellas), tuple(margenes), tuple(cubren)))
+    return tuple(tablas)
+
+
+def _tramos(libres, paso, tam, inicios):
+    """Inicios de las colocaciones (de 'paso' y 'tam') con todas sus celdas en 'libres'."""
+    tramos = libres
+    for k in range(1, tam):
+        tramos &= libres >> (k * paso)
+    return tramos & inicios
+
+
+def _bit_n(mascara, r):
+    """Posición del bit a 1 número r (desde 0) de 'mascara', por búsqueda binaria."""
+    posicion, ancho = 0, mascara.bit_length()
+    while ancho > 1:
+        mitad = ancho >> 1
+        bajos = mascara & ((1 << mitad) - 1)
+        cantidad = bajos.bit_count()
+        if r < cantidad:
+            mascara, ancho = bajos, mitad
+        else:
+            r -= cantidad
+            mascara >>= mitad
+            posicion += mitad
+            ancho -= mitad
+    return posicion
+
+
+class MuestreadorMC:
+    """
+    IA Monte Carlo: estima, para cada celda sin disparar, la probabilidad de que tenga
+    barco dado todo lo observado (aguas, impactos, barcos hundidos y la regla de margen:
+    los barcos no se tocan ni en diagonal) y dispara a la más probable. Con impactos de
+    un barco aún a flote elige solo entre sus vecinas, para hundirlo (y descubrir su
+    margen) antes de seguir cazando.
+
+    La probabilidad a priori de cada flota es la de TableroDatos.generar_barcos, que
+    coloca los barcos en orden, cada uno en una orientación sorteada y uniformemente
+    entre las colocaciones que le dejan los anteriores: el producto, barco a barco, de
+    1 / (2 x colocaciones disponibles en su orientación), o 1 / colocaciones si solo
+    cabe en una orientación o mide 1. Suponer flotas equiprobables sobrestimaría
+    mucho los bordes (0,25 frente al 0,2 real en un 10x10 estándar).
+
+    Las flotas se muestrean con una cadena de Metropolis-Hastings que se conserva entre
+    jugadas: cada paso propone recolocar un barco uniformemente entre las colocaciones
+    compatibles con el resto y con lo observado, y lo acepta según el cociente de
+    probabilidades a priori. Dos movimientos más mezclan lo que el primero no puede:
+    recolocar dos barcos de distinto tamaño a la vez (para que cambie qué barco explica
+    un impacto) e intercambiar el orden de colocación de dos barcos iguales. Los
+    barcos hundidos se quedan en la flota, fijos, porque siguen pesando en el orden de
+    colocación. Si un disparo deja la flota actual en contradicción, se repara con una
+    búsqueda con retroceso.
+
+    Cada jugada hace primero 'calentamiento' barridos (un paso por barco) sin contar,
+    para alejar la cadena de la flota de la jugada anterior (o de la reparación), y
+    después 'barridos' contados; la ocupación se cuenta ponderando propuesta y estado
+    actual por la probabilidad de aceptación, que reduce la varianza sin pasos extra.
+    La partida depende solo del generador, así que es reproducible por semilla;
+    'presupuesto' (segundos, None = sin reloj) solo sirve de tope de tiempo por jugada.
+    """
+
+    BARRIDOS = 10 # Contados por jugada, si no se indica otro número
+    CALENTAMIENTO = 10 # Sin contar, antes de los contados
+    NODOS_REPARACION = 2000 # Por intento de reparación
+
+    def __init__(self, board_size, flota=FLOTA_ESTANDAR, rng=random, presupuesto=None, barridos=BARRIDOS,
+                 calentamiento=CALENTAMIENTO):
+        n = board_size
+        self.board_size = n
+        self.rng = rng
+        self.presupuesto = presupuesto
+        self.barridos = barridos
+        self.calentamiento = calentamiento
+        self.lleno = (1 << (n * n)) - 1
+        columna_0 = sum(1 << (row * n) for row in range(n))
+        self.sin_columna_0 = self.lleno & ~columna_0
+        self.sin_columna_n = self.lleno & ~(columna_0 << (n - 1))
+        # Observaciones como máscaras de bits. 'agua': ningún barco a flote pasa por ahí;
+        # 'impactos': aciertos de barcos aún a flote
+        self.agua = 0
+        self.impactos = 0
+        self.disparadas = 0
+        # Un hueco por barco, en el orden de colocación de TableroDatos.generar_barcos
+        self.flota = tuple(flota)
+        self.tablas = [_tablas(n, tam) for tam in self.flota]
+        self.iguales = [[j for j, otro in enumerate(self.flota) if otro == tam] for tam in self.flota]
+        huecos = len(self.flota)
+        self.orient = [0] * huecos # Índice en self.tablas[k]
+        self.inicio = [0] * huecos
+        self.fijo = [False] * huecos # Barco hundido: su colocación es conocida
+        self.huella = [0] * huecos # 0 = sin colocar
+        self.margen = [0] * huecos
+        self.factores = [1.0] * huecos # Probabilidad a priori de cada colocación, dado el orden
+        self.valida = False # La flota actual es compatible con todo lo observado
+
+    # Observaciones
+    def registrar_disparo(self, row, col, impacto):
+        bit = 1 << (row * self.board_size + col)
+        self.disparadas |= bit
+        if impacto:
+            self.impactos |= bit
+        else:
+            self.agua |= bit
+        self.valida = False
+
+    def registrar_hundido(self, celdas):
+        """
+        El barco formado por 'celdas' (row, col) se hundió (su margen ya se registró como
+        agua): queda fijo en uno de los huecos de su tamaño.
+        """
+        n = self.board_size
+        mascara = 0
+        for row, col in celdas:
+            mascara |= 1 << (row * n + col)
+        self.impactos &= ~mascara
+        libres = [k for k, tam in enumerate(self.flota) if tam == len(celdas) and not self.fijo[k]]
+        if not libres:
+            self.agua |= mascara # No casa con la flota esperada: al menos que nadie pase por ahí
+            self.valida = False
+            return
+        # Preferir el hueco que ya lo tenía ahí: la flota actual sigue siendo válida
+        k = next((k for k in libres if self.huella[k] == mascara), libres[0])
+        orient = 0 if len({row for row, _ in celdas}) == 1 else 1
+        self._poner(k, orient, min(row * n + col for row, col in celdas))
+        self.fijo[k] = True
+        self.valida = False
+
+    # Cadena de Metropolis-Hastings
+    def _poner(self, k, orient, inicio):
+        tabla = self.tablas[k][orient]
+        self.orient[k] = orient
+        self.inicio[k] = inicio
+        self.huella[k] = tabla[2][inicio]
+        self.margen[k] = tabla[3][inicio]
+
+    def _factores_desde(self, k):
+        """Factores a priori de los huecos k en adelante con las colocaciones actuales."""
+        ocupado = 0
+        for j in range(k):
+            ocupado |= self.margen[j]
+        factores = []
+        for j in range(k, len(self.flota)):
+            libres = self.lleno & ~ocupado
+            tablas = self.tablas[j]
+            tam = self.flota[j]
+            propia = tablas[self.orient[j]]
+            disponibles = _tramos(libres, propia[0], tam, propia[1]).bit_count()
+            if len(tablas) == 1:
+                factores.append(1.0 / disponibles)
+            else:
+                otra = tablas[1 - self.orient[j]]
+                # Si la otra orientación no tiene hueco, el generador cae siempre en esta
+                factores.append((0.5 if _tramos(libres, otra[0], tam, otra[1]) else 1.0) / disponibles)
+            ocupado |= self.margen[j]
+        return factores
+
+    def _peso(self, k=0, factores=None):
+        """Probabilidad a priori de la flota: factores actuales hasta k y 'factores' (o los actuales) desde k."""
+        peso = 1.0
+        for factor in self.factores[:k]:
+            peso *= factor
+        for factor in self.factores[k:] if factores is None else factores:
+            peso *= factor
+        return peso
+
+    def _aceptar(self, k, factores, peso_actual, cociente=1.0):
+        """Decide el paso de MH; si se acepta, guarda los factores nuevos."""
+        nuevo = self._peso(k, factores) * cociente
+        if nuevo >= peso_actual or self.rng.random() * peso_actual < nuevo:
+            self.factores[k:] = factores
+            return True
+        return False
+
+    def _candidatos(self, k, ocupado, falta):
+        """
+        Máscaras de inicios (una por orientación) para el hueco k: colocaciones fuera del
+        agua y de 'ocupado' (márgenes del resto), con alguna celda sin disparar (las que
+        solo tienen impactos ya se habrían hundido) y que cubren todos los 'falta'.
+        """
+        libres = self.lleno & ~(self.agua | ocupado)
+        tam = self.flota[k]
+        mascaras = []
+        for paso, inicios, _, _, cubren in self.tablas[k]:
+            mascara = _tramos(libres, paso, tam, inicios) & ~_tramos(self.disparadas, paso, tam, inicios)
+            pendientes = falta
+            while pendientes and mascara:
+                bit = pendientes & -pendientes
+                mascara &= cubren[bit.bit_length() - 1]
+                pendientes ^= bit
+            mascaras.append(mascara)
+        return mascaras
+
+    def _elegir(self, mascaras):
+        """(orient, inicio, total) uniforme entre los inicios de 'mascaras', o None si no hay."""
+        cantidades = [mascara.bit_count() for mascara in mascaras]
+        total = sum(cantidades)
+        if not total:
+            return None
+        r = self.rng.randrange(total)
+        orient = 0
+        while r >= cantidades[orient]:
+            r -= cantidades[orient]
+            orient += 1
+        return orient, _bit_n(mascaras[orient], r), total
+
+    def _resto(self, *excluidos):
+        """Márgenes y huellas de todos los huecos menos 'excluidos'."""
+        ocupado = huellas = 0
+        for j in range(len(self.flota)):
+            if j not in excluidos:
+                ocupado |= self.margen[j]
+                huellas |= self.huella[j]
+        return ocupado, huellas
+
+    def _mover(self, k, peso_actual, cuenta):
+        """Paso de un barco: propuesta uniforme entre sus colocaciones compatibles."""
+        ocupado, huellas = self._resto(k)
+        orient, inicio, _ = self._elegir(self._candidatos(k, ocupado, self.impactos & ~huellas))
+        actual = (k, self.orient[k], self.inicio[k])
+        if (orient, inicio) == actual[1:]:
+            if cuenta is not None:
+                cuenta[actual] = cuenta.get(actual, 0) + 1
+            return peso_actual
+        self._poner(k, orient, inicio)
+        factores = self._factores_desde(k)
+        nuevo = self._peso(k, factores)
+        aceptacion = min(1.0, nuevo / peso_actual)
+        if cuenta is not None:
+            # Ocupación ponderada por la aceptación (propuesta y estado actual)
+            propuesta = (k, orient, inicio)
+            cuenta[propuesta] = cuenta.get(propuesta, 0) + aceptacion
+            cuenta[actual] = cuenta.get(actual, 0) + 1 - aceptacion
+        if aceptacion >= 1.0 or self.rng.random() < aceptacion:
+            self.factores[k:] = factores
+            return nuevo
+        self._poner(*actual)
+        return peso_actual
+
+    def _mover_par(self, a, b, peso_actual):
+        """
+        Paso de dos barcos de distinto tamaño: 'a' a cualquier colocación compatible y
+        'b' a una que cubra los impactos que queden sin explicar. Como el conjunto de
+        'b' depende de dónde quede 'a', el cociente de MH lleva la corrección
+        |opciones de b con a nueva| / |opciones de b con a actual|.
+        """
+        ocupado, huellas = self._resto(a, b)
+        elegida_a = self._elegir(self._candidatos(a, ocupado, 0))
+        tabla_a = self.tablas[a][elegida_a[0]]
+        huella_a, margen_a = tabla_a[2][elegida_a[1]], tabla_a[3][elegida_a[1]]
+        elegida_b = self._elegir(self._candidatos(b, ocupado | margen_a, self.impactos & ~(huellas | huella_a)))
+        if elegida_b is None:
+            return peso_actual
+        opciones_antes = sum(mascara.bit_count() for mascara in self._candidatos(
+            b, ocupado | self.margen[a], self.impactos & ~(huellas | self.huella[a])))
+        anterior = (self.orient[a], self.inicio[a], self.orient[b], self.inicio[b])
+        self._poner(a, *elegida_a[:2])
+        self._poner(b, *elegida_b[:2])
+        desde = min(a, b)
+        factores = self._factores_desde(desde)
+        if self._aceptar(desde, factores, peso_actual * opciones_antes, elegida_b[2]):
+            return self._peso()
+        self._poner(a, *anterior[:2])
+        self._poner(b, *anterior[2:])
+        return peso_actual
+
+    def _intercambiar(self, a, b):
+        for lista in (self.orient, self.inicio, self.fijo, self.huella, self.margen):
+            lista[a], lista[b] = lista[b], lista[a]
+
+    def _barrer(self, cuenta=None):
+        """Un barrido: un paso por barco a flote, más pares e intercambios de orden."""
+        rng = self.rng
+        peso = self._peso()
+        a_flote = [k for k in range(len(self.flota)) if not self.fijo[k]]
+        for k in a_flote:
+            peso = self._mover(k, peso, cuenta)
+        # Sin impactos por explicar, cada barco ya se mueve libremente por su cuenta
+        if self.impactos and len(a_flote) > 1:
+            for a in a_flote:
+                b = a_flote[rng.randrange(len(a_flote))]
+                if self.flota[a] != self.flota[b]:
+                    peso = self._mover_par(a, b, peso)
+        for k in range(len(self.flota)):
+            iguales = self.iguales[k]
+            if iguales[0] != k or len(iguales) < 2:
+                continue # Un intento por grupo de barcos iguales
+            a, b = rng.sample(iguales, 2)
+            a, b = min(a, b), max(a, b)
+            self._intercambiar(a, b)
+            if self._aceptar(a, self._factores_desde(a), peso):
+                peso = self._peso()
+            else:
+                self._intercambiar(a, b)
+
+    # Reparación tras un disparo que contradice la flota actual
+    def _es_valida(self):
+        ocupado = huellas = 0
+        for k in range(len(self.flota)):
+            huella = self.huella[k]
+            if not huella or huella & ocupado:
+                return False
+            if not self.fijo[k] and (huella & self.agua or huella & self.disparadas == huella):
+                return False
+            ocupado |= self.margen[k]
+            huellas |= huella
+        return not self.impactos & ~huellas
+
+    def _reparar(self):
+        """Recoloca los barcos incompatibles (y, si no basta, todos los que siguen a flote)."""
+        for intento in range(30):
+            ocupado = huellas = 0
+            pendientes = []
+            for k in sorted(range(len(self.flota)), key=lambda k: not self.fijo[k]):
+                huella = self.huella[k]
+                conservar = self.fijo[k] or (intento < 3 and huella and not huella & (ocupado | self.agua)
+                                             and huella & self.disparadas != huella)
+                if conservar:
+                    ocupado |= self.margen[k]
+                    huellas |= huella
+                else:
+                    pendientes.append(k)
+            if self._colocar(pendientes, ocupado, huellas, [self.NODOS_REPARACION]) and self._es_valida():
+                return True
+        return False
+
+    def _colocar(self, pendientes, ocupado, huellas, nodos):
+        """Coloca 'pendientes' con retroceso: primero cubrir el impacto más bajo sin explicar."""
+        falta = self.impactos & ~huellas
+        if not pendientes:
+            return not falta
+        nodos[0] -= 1
+        if nodos[0] < 0:
+            return False
+        opciones = []
+        if falta:
+            objetivo = falta & -falta
+            tamanos = set()
+            for k in pendientes:
+                if self.flota[k] not in tamanos:
+                    tamanos.add(self.flota[k])
+                    self._opciones(k, self._candidatos(k, ocupado, objetivo), opciones)
+        else:
+            self._opciones(pendientes[0], self._candidatos(pendientes[0], ocupado, 0), opciones)
+        self.rng.shuffle(opciones)
+        for k, orient, inicio in opciones:
+            tabla = self.tablas[k][orient]
+            huella, margen = tabla[2][inicio], tabla[3][inicio]
+            if margen & ~huella & falta:
+                continue # Tocaría otro impacto sin explicar
+            self._poner(k, orient, inicio)
+            if self._colocar([j for j in pendientes if j != k], ocupado | margen, huellas | huella, nodos):
+                return True
+            if nodos[0] < 0:
+                return False
+        return False
+
+    @staticmethod
+    def _opciones(k, mascaras, opciones):
+        for orient, mascara in enumerate(mascaras):
+            while mascara:
+                bit = mascara & -mascara
+                opciones.append((k, orient, bit.bit_length() - 1))
+                mascara ^= bit
+
+    def mejor_celda(self):
+        """
+        Retorna (row, col) de la celda sin disparar más probable (entre las vecinas de los
+        impactos de barcos a flote, si los hay), o (None, None) si no hay ninguna flota
+        compatible con lo observado.
+        """
+        limite = time.perf_counter() + self.presupuesto if self.presupuesto is not None else None
+        if not self.valida:
+            if not self._es_valida() and not self._reparar():
+                return None, None
+            self.factores = self._factores_desde(0)
+            self.valida = True
+            # Mezclar sin contar: la flota viene de la jugada anterior (o de una reparación)
+            for _ in range(self.calentamiento):
+                if limite is not None and time.perf_counter() >= limite:
+                    break
+                self._barrer()
+
+        cuenta = {}
+        for i in range(self.barridos):
+            if i and limite is not None and time.perf_counter() >= limite:
+                break
+            self._barrer(cuenta)
+
+        n = self.board_size
+        ocupacion = [0.0] * (n * n)
+        for (k, orient, inicio), veces in cuenta.items():
+            huella = self.tablas[k][orient][2][inicio]
+            while huella:
+                bit = huella & -huella
+                ocupacion[bit.bit_length() - 1] += veces
+                huella ^= bit
+
+        permitidas = self.lleno & ~self.disparadas
+        if self.impactos:
+            impactos = self.impactos
+            vecinas = (((impactos << 1) & self.sin_columna_0) | ((impactos >> 1) & self.sin_columna_n)
+                       | (impactos << n) | (impactos >> n)) & permitidas
+            if vecinas:
+                permitidas = vecinas
+        mejor, mejores = 0.0, []
+        for celda, valor in enumerate(ocupacion):
+            if valor < mejor or not permitidas >> celda & 1:
+                continue
+            if valor > mejor:
+                mejor, mejores = valor, [celda]
+            else:
+                mejores.append(celda)
+        if not mejores:
+            return None, None
+        return divmod(mejores[self.rng.randrange(len(mejores))] if len(mejores) > 1 else mejores[0], n)
@@ -0,0 +1,269 @@
+# Controlador/registro.py
+"""
+Formato binario compacto para guardar partidas y leerlas en streaming.
+
+Archivo: CABECERA (b'BSGR' + versión) seguida de registros, uno por partida:
+
+    varint  longitud del cuerpo (permite saltar registros sin decodificarlos)
+    byte    modo (0 solo, 1 hv, 2 mm, 3 hvh) | TIENE_SEMILLA | TIENE_FLOTAS
+    varint  tamaño del tablero n
+    varint  semilla maestra (si TIENE_SEMILLA)
+    bytes   una máscara de bits de barcos de ceil(n*n / 8) bytes por tablero (si TIENE_FLOTAS)
+    varint  número de disparos
+    varint  por disparo: (celda << 3) | (tablero << 2) | resultado
+
+'tablero' es 0 para tablero1 (o el tablero de 'solo') y 1 para tablero2; 'resultado'
+es un código de RESULTADOS. Un disparo de un 10x10 ocupa 1 o 2 bytes.
+"""
+import io
+import os
+from Entidad.entidad import Tablero
+from Entidad.tablero_datos import BARCO
+
+CABECERA = b'BSGR\x01'
+MODOS = ('solo', 'hv', 'mm', 'hvh')
+RESULTADOS = ('miss', 'hit', 'win', 'sunk')
+TIENE_SEMILLA = 0x10
+TIENE_FLOTAS = 0x20
+
+_CODIGO_MODO = {modo: i for i, modo in enumerate(MODOS)}
+_CODIGO_RESULTADO = {resultado: i for i, resultado in enumerate(RESULTADOS)}
+# Celda -> carácter '0'/'1' para empaquetar la flota con int(..., 2) en C, y al revés
+_A_BITS = bytes(0x31 if v & BARCO else 0x30 for v in range(256))
+_DESDE_BITS = bytes(BARCO if v == 0x31 else 0 for v in range(256))
+
+
+def escribir_varint(destino, valor):
+    """Añade 'valor' (entero >= 0) a 'destino' (bytearray) en LEB128."""
+    while valor >= 0x80:
+        destino.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    destino.append(valor)
+
+
+def leer_varint(datos, pos):
+    """Lee un varint de 'datos' desde 'pos'. Retorna (valor, nueva_pos)."""
+    valor = desplazamiento = 0
+    while True:
+        byte = datos[pos]
+        pos += 1
+        valor |= (byte & 0x7F) << desplazamiento
+        if byte < 0x80:
+            return valor, pos
+        desplazamiento += 7
+
+
+def empaquetar_flota(celdas):
+    """Máscara de bits (bit i = celda i tiene barco) de un Tablero.celdas."""
+    n_bytes = (len(celdas) + 7) // 8
+    bits = bytes(celdas).translate(_A_BITS)[::-1]
+    return int(bits, 2).to_bytes(n_bytes, 'little') if bits else b''
+
+
+def desempaquetar_flota(mascara, n_celdas):
+    """Inverso de empaquetar_flota: bytearray de n_celdas con BARCO donde hay barco."""
+    bits = format(int.from_bytes(mascara, 'little'), f'0{n_celdas}b')[::-1]
+    return bytearray(bits.encode().translate(_DESDE_BITS))
+
+
+class GrabadorPartidas:
+    """
+    Graba partidas en el formato binario mientras se juegan. Se conecta a un
+    WarShipController con conectar(): cada start_* abre un registro nuevo, cada disparo
+    no repetido (de un humano o de la IA, todos pasan por process_shot_on) se añade
+    al registro, y el registro se escribe en cuanto la partida termina con 'win'.
+    """
+
+    def __init__(self, destino, guardar_flotas=True, guardar_semilla=True, cabecera=True):
+        # 'destino' es una ruta o un archivo binario ya abierto
+        if isinstance(destino, (str, os.PathLike)):
+            self.archivo = open(destino, 'wb')
+            self._archivo_propio = True
+        else:
+            self.archivo = destino
+            self._archivo_propio = False
+        if cabecera:
+            self.archivo.write(CABECERA)
+        self.guardar_flotas = guardar_flotas
+        self.guardar_semilla = guardar_semilla
+        self.partidas = 0
+        self._tableros = None
+        self._inicio = None
+        self._celdas_por_fila = 0
+        self._disparos = bytearray()
+        self._n_disparos = 0
+
+    # Conexión con el controlador
+    def conectar(self, controller):
+        controller.add_game_listener(self.iniciar_partida)
+        controller.add_shot_listener(self.registrar_disparo)
+
+    def desconectar(self, controller):
+        controller.remove_game_listener(self.iniciar_partida)
+        controller.remove_shot_listener(self.registrar_disparo)
+
+    def iniciar_partida(self, controller):
+        """Empieza el registro de la partida recién creada en 'controller'."""
+        self.terminar_partida()
+        if controller.mode == 'solo':
+            self._tableros = (controller.game_model,)
+        else:
+            self._tableros = (controller.tablero1, controller.tablero2)
+
+        n = controller.board_size
+        seed = controller.game_seed if self.guardar_semilla else None
+        if not (isinstance(seed, int) and seed >= 0):
+            seed = None # Solo se guardan semillas enteras no negativas (varint)
+        inicio = bytearray((_CODIGO_MODO[controller.mode]
+                            | (TIENE_SEMILLA if seed is not None else 0)
+                            | (TIENE_FLOTAS if self.guardar_flotas else 0),))
+        escribir_varint(inicio, n)
+        if seed is not None:
+            escribir_varint(inicio, seed)
+        if self.guardar_flotas:
+            for tablero in self._tableros:
+                inicio += empaquetar_flota(tablero.celdas)
+        self._inicio = inicio
+        self._celdas_por_fila = n
+
+    def registrar_disparo(self, tablero, row, col, result):
+        if self._inicio is None:
+            return
+        if tablero is self._tableros[0]:
+            indice = 0
+        elif len(self._tableros) > 1 and tablero is self._tableros[1]:
+            indice = 1
+        else:
+            return # Disparo sobre un tablero que no es de la partida grabada
+        celda = row * self._celdas_por_fila + col
+        escribir_varint(self._disparos, (celda << 3) | (indice << 2) | _CODIGO_RESULTADO[result])
+        self._n_disparos += 1
+        if result == 'win':
+            self.terminar_partida()
+
+    def terminar_partida(self):
+        """Escribe el registro en curso (si lo hay), aunque la partida no haya terminado."""
+        if self._inicio is None:
+            return
+        cuerpo = self._inicio
+        escribir_varint(cuerpo, self._n_disparos)
+        cuerpo += self._disparos
+        registro = bytearray()
+        escribir_varint(registro, len(cuerpo))
+        registro += cuerpo
+        self.archivo.write(registro)
+        self.partidas += 1
+        self._inicio = None
+        self._disparos = bytearray()
+        self._n_disparos = 0
+
+    def anexar(self, registros):
+        """Añade registros ya codificados (por ejemplo, de un grabador sin cabecera en otro proceso)."""
+        self.archivo.write(registros)
+
+    def cerrar(self):
+        self.terminar_partida()
+        self.archivo.flush()
+        if self._archivo_propio:
+            self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class RegistroPartida:
+    """Una partida leída del archivo; los disparos se decodifican al iterarlos."""
+    __slots__ = ('modo', 'board_size', 'semilla', 'n_tableros', 'n_disparos', '_cuerpo', '_flotas', '_disparos')
+
+    def __init__(self, cuerpo):
+        self._cuerpo = cuerpo
+        banderas = cuerpo[0]
+        self.modo = MODOS[banderas & 0x0F]
+        self.board_size, pos = leer_varint(cuerpo, 1)
+        self.semilla = None
+        if banderas & TIENE_SEMILLA:
+            self.semilla, pos = leer_varint(cuerpo, pos)
+        self.n_tableros = 1 if self.modo == 'solo' else 2
+        self._flotas = None
+        if banderas & TIENE_FLOTAS:
+            self._flotas = pos
+            pos += self.n_tableros * ((self.board_size * self.board_size + 7) // 8)
+        self.n_disparos, self._disparos = leer_varint(cuerpo, pos)
+
+    def flota(self, indice=0):
+        """Celdas (bytearray con BARCO) del tablero 'indice', o None si no se guardaron flotas."""
+        if self._flotas is None:
+            return None
+        n_celdas = self.board_size * self.board_size
+        tam = (n_celdas + 7) // 8
+        inicio = self._flotas + indice * tam
+        return desempaquetar_flota(self._cuerpo[inicio:inicio + tam], n_celdas)
+
+    def tablero(self, indice=0):
+        """Tablero sin disparos con la flota guardada (None si no se guardaron flotas)."""
+        celdas = self.flota(indice)
+        if celdas is None:
+            return None
+        return Tablero.desde_celdas(celdas, self.board_size, self.board_size)
+
+    def disparos(self):
+        """Itera (tablero, row, col, result) en el orden en que se jugaron."""
+        cuerpo, pos, n = self._cuerpo, self._disparos, self.board_size
+        for _ in range(self.n_disparos):
+            valor, pos = leer_varint(cuerpo, pos)
+            row, col = divmod(valor >> 3, n)
+            yield (valor >> 2) & 1, row, col, RESULTADOS[valor & 3]
+
+
+class LectorPartidas:
+    """
+    Lee un archivo de partidas mediante mmap: iterar no carga el archivo en memoria,
+    cada registro se copia (unos cientos de bytes) solo cuando se llega a él.
+    """
+
+    def __init__(self, ruta):
+        import mmap # Importación diferida: solo la lectura de archivos la necesita
+        self._archivo = open(ruta, 'rb')
+        tam = os.fstat(self._archivo.fileno()).st_size
+        # mmap no admite archivos vacíos
+        self._datos = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ) if tam else b''
+        if self._datos[:len(CABECERA)] != CABECERA:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es un archivo de partidas (versión {CABECERA[-1]}).")
+
+    def __iter__(self):
+        datos = self._datos
+        pos, fin = len(CABECERA), len(datos)
+        while pos < fin:
+            longitud, pos = leer_varint(datos, pos)
+            yield RegistroPartida(datos[pos:pos + longitud])
+            pos += longitud
+
+    def contar(self):
+        """Número de partidas, saltando los cuerpos sin decodificarlos."""
+        datos = self._datos
+        pos, fin, total = len(CABECERA), len(datos), 0
+        while pos < fin:
+            longitud, pos = leer_varint(datos, pos)
+            pos += longitud
+            total += 1
+        return total
+
+    def cerrar(self):
+        if not isinstance(self._datos, bytes): # b'' para archivos vacíos, si no un mmap
+            self._datos.close()
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def grabar_en_memoria():
+    """Grabador sin cabecera sobre un BytesIO (para reunir registros de otros procesos)."""
+    return GrabadorPartidas(io.BytesIO(), cabecera=False)
@@ -0,0 +1,86 @@
+# Controlador/sesiones.py
+import time
+import itertools
+import collections
+from Controlador.controlador import WarShipController
+
+
+class SessionRegistry:
+    """
+    Registro de partidas en curso (WarShipController.GameSession) de un proceso, todas
+    atendidas por un mismo controlador sin estado propio de partida:
+
+        registry = SessionRegistry(WarShipController(10), max_idle=600)
+        session = registry.create('hv')
+        registry.controller.play_human_turn(registry.get(session.session_id), 3, 4)
+
+    Las sesiones se guardan por orden de último uso (OrderedDict), así que crear, buscar
+    y quitar son O(1) y expirar las inactivas solo recorre las que expiran. Con
+    'max_idle' (segundos) create() expira de paso las sesiones inactivas; con
+    'max_sessions' descarta además las menos usadas para no pasar de ese número.
+    """
+
+    def __init__(self, controller=None, max_idle=None, max_sessions=None, reloj=time.monotonic):
+        self.controller = WarShipController() if controller is None else controller
+        self.max_idle = max_idle
+        self.max_sessions = max_sessions
+        self.reloj = reloj
+        self._sessions = collections.OrderedDict()
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self._sessions
+
+    def __iter__(self):
+        """Sesiones de la menos a la más recientemente usada."""
+        return iter(list(self._sessions.values()))
+
+    def create(self, mode, seed=None, config_A=None, config_B=None):
+        """Crea y registra una partida nueva (ver WarShipController.new_session)."""
+        return self.add(self.controller.new_session(mode, seed, config_A, config_B))
+
+    def add(self, session):
+        """Registra una sesión ya creada (por ejemplo, en otro hilo) y le asigna su id."""
+        self.expire()
+        session.session_id = next(self._ids)
+        session.last_active = self.reloj()
+        self._sessions[session.session_id] = session
+        if self.max_sessions is not None:
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id):
+        """La sesión con ese id (marcándola como usada ahora) o None si no existe o expiró."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        ahora = self.reloj()
+        if self.max_idle is not None and ahora - session.last_active > self.max_idle:
+            # Expirada aunque expire() aún no haya pasado: se quita en vez de revivirla
+            del self._sessions[session_id]
+            return None
+        session.last_active = ahora
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def remove(self, session_id):
+        """Quita la sesión y la retorna (None si no estaba)."""
+        return self._sessions.pop(session_id, None)
+
+    def expire(self, max_idle=None):
+        """Quita las sesiones sin usar desde hace más de 'max_idle' segundos (por defecto self.max_idle)."""
+        max_idle = self.max_idle if max_idle is None else max_idle
+        if max_idle is None:
+            return []
+        limite = self.reloj() - max_idle
+        expiradas = []
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_active >= limite:
+                break
+            expiradas.append(self._sessions.popitem(last=False)[1])
+        return expiradas
@@ -0,0 +1,135 @@
+# Controlador/simulacion.py
+import os
+import time
+from Controlador.controlador import WarShipController
+from Entidad.aleatorio import derivar_semilla, nueva_semilla
+from Controlador.registro import GrabadorPartidas, grabar_en_memoria
+
+
+class SimuladorMM:
+    """
+    Simulador sin interfaz gráfica para partidas Máquina vs Máquina ('mm').
+    Usa la misma lógica del controlador (start_machine_vs_machine / ai_make_move_on)
+    que la ventana, pero sin QTimer ni PySide6, y reparte las partidas entre
+    varios procesos para aprovechar todos los núcleos.
+    Cada partida usa su propia semilla derivada de la semilla maestra del lote, así
+    que el resultado no depende del número de procesos y cualquier partida se puede
+    repetir con jugar_partida(controller, SimuladorMM.semilla_partida(semilla, i))
+    (las IAs 'montecarlo' también, salvo que la configuración les ponga un 'time_budget').
+    """
+
+    def __init__(self, board_size=10, procesos=None):
+        self.board_size = board_size
+        # Por defecto se usa un proceso por núcleo disponible
+        self.procesos = procesos or os.cpu_count() or 1
+
+    @staticmethod
+    def semilla_partida(semilla, i):
+        """Semilla de la partida i de un lote ejecutado con la semilla maestra 'semilla'."""
+        return derivar_semilla(semilla, 'partida', i)
+
+    @staticmethod
+    def jugar_partida(controller: WarShipController, seed=None, config_A=None, config_B=None):
+        """
+        Juega una partida 'mm' completa con el controlador dado (y la semilla y las
+        configuraciones de IA dadas, si hay).
+        Retorna (disparos_A, disparos_B, ganador).
+        """
+        controller.start_machine_vs_machine(seed, config_A, config_B)
+        session = controller.session
+        disparos = {'A': 0, 'B': 0}
+        # Cota de seguridad: ninguna IA puede disparar más veces que celdas tiene el tablero
+        max_turnos = 2 * controller.board_size * controller.board_size
+
+        for _ in range(max_turnos):
+            # Máquina A ataca T2, Máquina B ataca T1 (igual que WarShipGame.ai_step)
+            turn = session.current_turn
+            row, col, result, message = controller.play_machine_turn(session)
+
+            if row is not None:
+                disparos[turn] += 1
+
+            if controller.is_game_finished(session):
+                break
+
+        return disparos['A'], disparos['B'], controller.get_winner(session)
+
+    @staticmethod
+    def _jugar_lote(board_size, semillas, grabar=False):
+        """
+        Juega un lote de partidas (una por semilla) en un proceso trabajador con un solo controlador.
+        Retorna (partidas, registros): 'registros' son las partidas en formato binario
+        (Controlador.registro, sin cabecera) si 'grabar', o b'' si no.
+        """
+        controller = WarShipController(board_size=board_size)
+        grabador = grabar_en_memoria() if grabar else None
+        if grabador is not None:
+            grabador.conectar(controller)
+        partidas = [SimuladorMM.jugar_partida(controller, seed) for seed in semillas]
+        if grabador is None:
+            return partidas, b''
+        grabador.terminar_partida()
+        return partidas, grabador.archivo.getvalue()
+
+    def _repartir(self, n_partidas):
+        """Divide n_partidas en lotes para que cada proceso reciba varios."""
+        n_lotes = max(1, min(n_partidas, self.procesos * 4))
+        base, resto = divmod(n_partidas, n_lotes)
+        return [base + (1 if i < resto else 0) for i in range(n_lotes)]
+
+    def ejecutar(self, n_partidas, semilla=None, registro=None):
+        """
+        Juega n_partidas completas y retorna un diccionario con:
+          - 'semilla': semilla maestra del lote (una al azar si no se indica)
+          - 'partidas': lista de (disparos_A, disparos_B, ganador) por partida
+          - 'victorias': conteo de victorias por ganador
+          - 'segundos': tiempo de reloj total
+          - 'partidas_por_segundo': rendimiento
+        Si se indica 'registro' (ruta), todas las partidas se guardan ahí, en orden,
+        en el formato binario de Controlador.registro.
+        """
+        inicio = time.perf_counter()
+        semilla = nueva_semilla() if semilla is None else semilla
+        semillas = [self.semilla_partida(semilla, i) for i in range(n_partidas)]
+
+        grabar = registro is not None
+        grabador = GrabadorPartidas(registro) if grabar else None
+        try:
+            if self.procesos <= 1:
+                partidas, registros = self._jugar_lote(self.board_size, semillas, grabar)
+                if grabar:
+                    grabador.anexar(registros)
+            else:
+                # Lotes contiguos de semillas: las partidas vuelven en el mismo orden
+                lotes, desde = [], 0
+                for n in self._repartir(n_partidas):
+                    lotes.append(semillas[desde:desde + n])
+                    desde += n
+                partidas = []
+                # Importación diferida: concurrent.futures arrastra multiprocessing y logging,
+                # que un lote de un solo proceso (o la consola) no necesita al arrancar
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=self.procesos) as pool:
+                    futuros = [pool.submit(SimuladorMM._jugar_lote, self.board_size, lote, grabar) for lote in lotes]
+                    for futuro in futuros:
+                        lote_partidas, registros = futuro.result()
+                        partidas.extend(lote_partidas)
+                        if grabar:
+                            grabador.anexar(registros)
+        finally:
+            if grabar:
+                grabador.cerrar()
+
+        segundos = time.perf_counter() - inicio
+
+        victorias = {}
+        for _, _, ganador in partidas:
+            victorias[ganador] = victorias.get(ganador, 0) + 1
+
+        return {
+            'semilla': semilla,
+            'partidas': partidas,
+            'victorias': victorias,
+            'segundos': segundos,
+            'partidas_por_segundo': len(partidas) / segundos if segundos > 0 else 0.0,
+        }
@@ -0,0 +1,224 @@
+# Controlador/torneo.py
+"""
+Torneo todos contra todos entre configuraciones de IA.
+
+Uso (desde SandBox/):
+    python -m Controlador.torneo --estrategias paridad aleatoria densidad --semilla 1
+
+Cada cruce se juega por rondas de pares de partidas sobre flotas compartidas: la
+semilla k da las mismas dos flotas a todos los cruces, y cada par la juega dos veces
+intercambiando los lados (quién empieza y qué flota defiende), así que la suerte de
+la flota y la ventaja de salida se cancelan. Un cruce se deja de jugar en cuanto el
+intervalo de confianza de su tasa de victorias excluye el 50 %. Como ese intervalo se
+mira después de cada ronda, la regla de parada usa un nivel corregido (Bonferroni sobre
+el número máximo de rondas) para no declarar diferencias que solo son ruido.
+Las partidas se juegan con SimuladorMM.jugar_partida y ninguna IA usa reloj, así que el
+torneo completo se repite igual con la misma semilla.
+"""
+import os
+import time
+import argparse
+import itertools
+import statistics
+from Controlador.controlador import WarShipController
+from Controlador.simulacion import SimuladorMM
+from Entidad.aleatorio import nueva_semilla
+from Entidad.instrumentacion import percentil
+
+# Configuraciones de AiState listas para usar por nombre
+ESTRATEGIAS_PREDEFINIDAS = {
+    'paridad': {'use_parity': True, 'hunt_strategy': 'parity'},
+    'aleatoria': {'use_parity': False, 'hunt_strategy': 'parity'},
+    'densidad': {'hunt_strategy': 'density'},
+    'montecarlo': {'hunt_strategy': 'montecarlo'},
+}
+
+
+def intervalo_wilson(exitos, n, z):
+    """Intervalo de Wilson (inferior, superior) para una proporción exitos / n."""
+    if n == 0:
+        return 0.0, 1.0
+    p = exitos / n
+    denominador = 1 + z * z / n
+    centro = (p + z * z / (2 * n)) / denominador
+    radio = z * ((p * (1 - p) / n + z * z / (4 * n * n)) ** 0.5) / denominador
+    return max(0.0, centro - radio), min(1.0, centro + radio)
+
+
+def _jugar_ronda(board_size, config_X, config_Y, semillas):
+    """
+    Juega cada semilla dos veces, con X como máquina A y luego como máquina B.
+    Retorna una lista de (gana_X, disparos_ganador) por partida.
+    """
+    controller = WarShipController(board_size=board_size)
+    resultados = []
+    for seed in semillas:
+        for x_es_A in (True, False):
+            config_A, config_B = (config_X, config_Y) if x_es_A else (config_Y, config_X)
+            disparos_A, disparos_B, ganador = SimuladorMM.jugar_partida(controller, seed, config_A, config_B)
+            if ganador is None:
+                continue # Sin ganador (cota de turnos): no cuenta
+            gana_A = ganador == "Máquina A"
+            resultados.append((gana_A == x_es_A, disparos_A if gana_A else disparos_B))
+    return resultados
+
+
+class TorneoIA:
+    """
+    Programa todos los cruces entre las estrategias dadas ({nombre: argumentos de
+    AiState}) sobre un pool de procesos, con parada temprana por cruce.
+    """
+
+    def __init__(self, estrategias, board_size=10, procesos=None, confianza=0.95,
+                 pares_por_ronda=50, min_partidas=100, max_partidas=4000):
+        if len(estrategias) < 2:
+            raise ValueError("El torneo necesita al menos dos estrategias.")
+        self.estrategias = dict(estrategias)
+        self.board_size = board_size
+        self.procesos = procesos or os.cpu_count() or 1
+        self.confianza = confianza
+        self.z = statistics.NormalDist().inv_cdf((1 + confianza) / 2)
+        self.pares_por_ronda = pares_por_ronda
+        self.min_partidas = min_partidas
+        self.max_partidas = max_partidas
+        # Nivel para la regla de parada: el error (1 - confianza) se reparte entre todas las rondas
+        rondas = max(1, -(-max_partidas // (2 * pares_por_ronda)))
+        self.z_parada = statistics.NormalDist().inv_cdf(1 - (1 - confianza) / (2 * rondas))
+
+    def _cruce_decidido(self, cruce):
+        """True si la tasa de victorias de X ya es distinta del 50 % con el nivel de parada."""
+        if cruce['partidas'] < self.min_partidas:
+            return False
+        inferior, superior = intervalo_wilson(cruce['victorias_X'], cruce['partidas'], self.z_parada)
+        return inferior > 0.5 or superior < 0.5
+
+    def ejecutar(self, semilla=None):
+        """
+        Juega el torneo y retorna un diccionario con:
+          - 'semilla', 'segundos', 'confianza'
+          - 'cruces': por par (X, Y), partidas, victorias de X, tasa, intervalo y si quedó
+            decidido (según la regla de parada)
+          - 'estrategias': por estrategia, partidas, tasa de victorias con intervalo y
+            disparos para ganar (media, p50, p90)
+        """
+        inicio = time.perf_counter()
+        semilla = nueva_semilla() if semilla is None else semilla
+        cruces = {
+            (x, y): {'X': x, 'Y': y, 'partidas': 0, 'victorias_X': 0, 'pares_jugados': 0}
+            for x, y in itertools.combinations(self.estrategias, 2)
+        }
+        disparos_para_ganar = {nombre: [] for nombre in self.estrategias}
+        partidas = {nombre: 0 for nombre in self.estrategias}
+        victorias = {nombre: 0 for nombre in self.estrategias}
+
+        # Con un solo proceso las rondas se juegan aquí mismo
+        pool = None
+        if self.procesos > 1:
+            from concurrent.futures import ProcessPoolExecutor # Importación diferida (ver SimuladorMM)
+            pool = ProcessPoolExecutor(max_workers=self.procesos)
+        try:
+            activos = list(cruces)
+            while activos:
+                # Una ronda por cruce activo; los cruces comparten las semillas (flotas) k
+                tareas = []
+                for clave in activos:
+                    cruce = cruces[clave]
+                    desde = cruce['pares_jugados']
+                    semillas = [SimuladorMM.semilla_partida(semilla, k)
+                                for k in range(desde, desde + self.pares_por_ronda)]
+                    cruce['pares_jugados'] += len(semillas)
+                    argumentos = (self.board_size, self.estrategias[clave[0]], self.estrategias[clave[1]], semillas)
+                    tareas.append((clave, pool.submit(_jugar_ronda, *argumentos) if pool else _jugar_ronda(*argumentos)))
+
+                for (x, y), tarea in tareas:
+                    cruce = cruces[(x, y)]
+                    for gana_X, disparos in (tarea.result() if pool else tarea):
+                        ganador = x if gana_X else y
+                        cruce['partidas'] += 1
+                        cruce['victorias_X'] += gana_X
+                        partidas[x] += 1
+                        partidas[y] += 1
+                        victorias[ganador] += 1
+                        disparos_para_ganar[ganador].append(disparos)
+
+                activos = [clave for clave in activos
+                           if cruces[clave]['partidas'] < self.max_partidas and not self._cruce_decidido(cruces[clave])]
+        finally:
+            if pool:
+                pool.shutdown()
+
+        resultado_cruces = []
+        for cruce in cruces.values():
+            n = cruce['partidas']
+            inferior, superior = intervalo_wilson(cruce['victorias_X'], n, self.z)
+            resultado_cruces.append({
+                'X': cruce['X'], 'Y': cruce['Y'], 'partidas': n,
+                'victorias_X': cruce['victorias_X'],
+                'tasa_X': cruce['victorias_X'] / n if n else None,
+                'intervalo_X': (inferior, superior),
+                'decidido': self._cruce_decidido(cruce),
+            })
+
+        resultado_estrategias = {}
+        for nombre in self.estrategias:
+            ordenados = sorted(disparos_para_ganar[nombre])
+            n = partidas[nombre]
+            resultado_estrategias[nombre] = {
+                'partidas': n,
+                'victorias': victorias[nombre],
+                'tasa': victorias[nombre] / n if n else None,
+                'intervalo': intervalo_wilson(victorias[nombre], n, self.z),
+                'disparos_media': statistics.fmean(ordenados) if ordenados else None,
+                'disparos_p50': percentil(ordenados, 50),
+                'disparos_p90': percentil(ordenados, 90),
+            }
+
+        return {
+            'semilla': semilla,
+            'confianza': self.confianza,
+            'segundos': time.perf_counter() - inicio,
+            'cruces': resultado_cruces,
+            'estrategias': resultado_estrategias,
+        }
+
+
+def formatear(resultado):
+    """Texto con la clasificación y los cruces de un resultado de TorneoIA.ejecutar."""
+    nivel = f"{resultado['confianza']:.0%}"
+    lineas = [f"Clasificación (IC {nivel}, semilla {resultado['semilla']}):"]
+    clasificacion = sorted(resultado['estrategias'].items(), key=lambda e: -(e[1]['tasa'] or 0))
+    for nombre, r in clasificacion:
+        inferior, superior = r['intervalo']
+        disparos = (f"disparos para ganar: media {r['disparos_media']:.1f}, p50 {r['disparos_p50']}, p90 {r['disparos_p90']}"
+                    if r['disparos_media'] is not None else "sin victorias")
+        lineas.append(f"  {nombre:<12} {r['tasa']:.1%} [{inferior:.1%}, {superior:.1%}] "
+                      f"en {r['partidas']} partidas; {disparos}")
+    lineas.append("Cruces:")
+    for c in resultado['cruces']:
+        inferior, superior = c['intervalo_X']
+        estado = "decidido" if c['decidido'] else "sin diferencia clara"
+        lineas.append(f"  {c['X']} vs {c['Y']}: {c['tasa_X']:.1%} [{inferior:.1%}, {superior:.1%}] "
+                      f"para {c['X']} en {c['partidas']} partidas ({estado})")
+    lineas.append(f"Tiempo: {resultado['segundos']:.1f} s")
+    return "\n".join(lineas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Torneo todos contra todos entre estrategias de IA.")
+    parser.add_argument('--estrategias', nargs='+', default=list(ESTRATEGIAS_PREDEFINIDAS),
+                        choices=list(ESTRATEGIAS_PREDEFINIDAS))
+    parser.add_argument('--tamano', type=int, default=10)
+    parser.add_argument('--semilla', type=int, default=None)
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--confianza', type=float, default=0.95)
+    parser.add_argument('--max-partidas', type=int, default=4000, help="Máximo de partidas por cruce.")
+    args = parser.parse_args(argv)
+
+    torneo = TorneoIA({nombre: ESTRATEGIAS_PREDEFINIDAS[nombre] for nombre in args.estrategias},
+                      board_size=args.tamano, procesos=args.procesos, confianza=args.confianza,
+                      max_partidas=args.max_partidas)
+    print(formatear(torneo.ejecutar(args.semilla)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Controlador/turbo.py
+import time
+import threading
+from Controlador.controlador import WarShipController
+
+
+class MotorTurbo:
+    """
+    Juega la partida 'mm' en curso de un controlador en un hilo aparte, tan rápido
+    como se pueda o limitado a 'jugadas_por_seg'. No conoce la interfaz: la ventana
+    consulta 'instantanea()' al ritmo de refresco de la pantalla y repinta solo el
+    último estado, de modo que las jugadas intermedias se agrupan en un único repintado.
+
+    Mientras el motor está en marcha el hilo trabajador es el único que modifica el
+    controlador; las lecturas con varias piezas de estado deben hacerse con 'lock'.
+    """
+
+    def __init__(self, controller: WarShipController, jugadas_por_seg=None):
+        self.controller = controller
+        self.jugadas_por_seg = jugadas_por_seg # None = sin límite
+        self.lock = threading.Lock()
+        self.jugadas = 0
+        self.ultima_jugada = None # (actor, row, col, result, message)
+        self.terminado = False
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def iniciar(self):
+        if self.en_marcha():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, name="MotorTurbo", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """Pide al hilo que pare y espera a que termine la jugada en curso."""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+    def en_marcha(self):
+        return self._hilo is not None and self._hilo.is_alive()
+
+    def instantanea(self):
+        """Retorna (jugadas, ultima_jugada, current_turn, terminado) de forma consistente."""
+        with self.lock:
+            return self.jugadas, self.ultima_jugada, self.controller.current_turn, self.terminado
+
+    def _bucle(self):
+        controller = self.controller
+        # Misma cota de seguridad que SimuladorMM.jugar_partida
+        max_turnos = 2 * controller.board_size * controller.board_size
+        inicio = time.perf_counter()
+        realizadas = 0
+
+        while not self._detener.is_set():
+            with self.lock:
+                if controller.is_game_finished() or self.jugadas >= max_turnos:
+                    self.terminado = True
+                    return
+                # Máquina A ataca T2, Máquina B ataca T1 (igual que WarShipGame.ai_step)
+                if controller.current_turn == 'A':
+                    actor, tablero, ai_state, next_turn = "Máquina A", controller.tablero2, controller.ai_A, 'B'
+                else:
+                    actor, tablero, ai_state, next_turn = "Máquina B", controller.tablero1, controller.ai_B, 'A'
+                row, col, result, message = controller.ai_make_move_on(tablero, ai_state)
+                self.jugadas += 1
+                self.ultima_jugada = (actor, row, col, result, message)
+                if controller.is_game_finished():
+                    self.terminado = True
+                    return
+                controller.current_turn = next_turn
+            realizadas += 1
+
+            if self.jugadas_por_seg:
+                # Limitar el ritmo sin acumular deriva: esperar hasta la hora prevista de la jugada
+                espera = inicio + realizadas / self.jugadas_por_seg - time.perf_counter()
+                if espera > 0:
+                    self._detener.wait(espera)
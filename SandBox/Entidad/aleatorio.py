@@ -0,0 +1,41 @@
+import random
+
+
+def como_rng(fuente=None):
+    """
+    Normaliza una fuente de aleatoriedad a un objeto con la API de random.Random
+    (randrange, getrandbits, random):
+      - None: el módulo global 'random' (comportamiento histórico, no reproducible por partida)
+      - int / str / bytes: un random.Random nuevo sembrado con ese valor
+      - random.Random: se usa tal cual
+      - numpy.random.Generator: un random.Random sembrado desde el generador
+    """
+    if fuente is None or isinstance(fuente, random.Random):
+        return random if fuente is None else fuente
+    if isinstance(fuente, (int, str, bytes)):
+        return random.Random(fuente)
+    if hasattr(fuente, 'bit_generator'): # numpy.random.Generator (NumPy es opcional)
+        return random.Random(int(fuente.integers(0, 2 ** 63)))
+    raise TypeError(f"Fuente de aleatoriedad no soportada: {type(fuente).__name__}")
+
+
+def derivar_semilla(semilla, *ruta):
+    """
+    Semilla hija (entero de 64 bits) de 'semilla' para el flujo identificado por 'ruta'
+    (por ejemplo: derivar_semilla(1234, 'partida', 7, 'tablero1')).
+    Depende solo de la semilla y la ruta, no del orden en que se pidan los flujos,
+    así que cada partida de un lote se puede reproducir por separado.
+    """
+    import hashlib # Importación diferida: cargar OpenSSL cuesta más que todo el resto del módulo
+    clave = ':'.join(map(str, (semilla, *ruta))).encode()
+    return int.from_bytes(hashlib.blake2b(clave, digest_size=8).digest(), 'big')
+
+
+def rng_hijo(semilla, *ruta):
+    """random.Random independiente para el flujo 'ruta' de la semilla maestra."""
+    return random.Random(derivar_semilla(semilla, *ruta))
+
+
+def nueva_semilla(rng=None):
+    """Semilla maestra de 64 bits tomada de 'rng' (por defecto, del módulo global 'random')."""
+    return como_rng(rng).getrandbits(64)
@@ -1,44 +1,217 @@
-from Entidad.tablero_datos import TableroDatos 
+import array
+from Entidad.tablero_datos import TableroDatos, BARCO, DISPARO, FLOTA_ESTANDAR
+from Entidad.aleatorio import como_rng
+
+
+class VistaCoordenadas:
+    """
+    Vista de solo lectura (perezosa) sobre las celdas del tablero que cumplen una máscara.
+    Se comporta como un conjunto de tuplas (row, col) sin guardar ninguna tupla:
+    la pertenencia se resuelve en O(1) leyendo el byte de la celda.
+    """
+    __slots__ = ('_tablero', '_mascara')
+
+    def __init__(self, tablero, mascara):
+        self._tablero = tablero
+        self._mascara = mascara
+
+    def __contains__(self, coord):
+        row, col = coord
+        t = self._tablero
+        if not (0 <= row < t.filas and 0 <= col < t.columnas):
+            return False
+        return bool(t.celdas[row * t.columnas + col] & self._mascara)
+
+    def __iter__(self):
+        t = self._tablero
+        mascara = self._mascara
+        for i, valor in enumerate(t.celdas):
+            if valor & mascara:
+                yield divmod(i, t.columnas)
+
+    def __len__(self):
+        mascara = self._mascara
+        return sum(1 for valor in self._tablero.celdas if valor & mascara)
+
+    def __eq__(self, other):
+        return set(self) == set(other)
+
+    def __repr__(self):
+        return f"{{{', '.join(map(repr, self))}}}"
+
 
 class Tablero:
     """Clase que representa el estado del tablero y los barcos."""
-    
-    def __init__(self, size=10):
+
+    def __init__(self, size=10, rng=None, flota=None, columnas=None):
         self.filas = size
-        self.columnas = size
-        
-        # Matriz para la representación visual/interna: 
-        # '.' = Agua, '*' = Barco (sin tocar)
-        self.matriz = [['.' for _ in range(self.columnas)] for _ in range(self.filas)]
-        
-        # Las coordenadas de los barcos se guardan en un conjunto para búsquedas rápidas (row, col).
-        self.ships = set()
-        
+        self.columnas = columnas or size # Tableros rectangulares: size filas x columnas
+
+        # Tamaños de los barcos a colocar (por defecto, la flota estándar)
+        self.flota = tuple(flota) if flota else FLOTA_ESTANDAR
+
+        # Generador propio del tablero: semilla (int), random.Random o numpy Generator.
+        # Con None se usa el módulo global 'random' como hasta ahora.
+        self.rng = como_rng(rng)
+
+        # Núcleo del tablero: un byte por celda con planos de bits (BARCO, DISPARO).
+        # Reemplaza a la antigua matriz de '.'/'*' y a los sets de tuplas 'ships' y 'plays',
+        # que ahora son vistas perezosas calculadas a partir de 'celdas'.
+        self.celdas = bytearray(self.filas * self.columnas)
+        self.reiniciar_barcos()
+
         self.total_parts = 0 # Se actualizará después de la colocación por TableroDatos
         self.parts_hit = 0
         self.total_tries = 100 # Número máximo de intentos
-        self.plays = set()
-        self.are_hints_shown = False 
+        self.are_hints_shown = False
+
+        # Diario de jugadas (ver aplicar_disparo); el array se crea al primer uso
+        self.diario = None
+        self.jugadas_diario = 0
 
         # Llama a la lógica de colocación de barcos de la capa de Datos
         TableroDatos.generar_barcos(self)
 
+    @classmethod
+    def desde_celdas(cls, celdas, filas, columnas, rng=None):
+        """
+        Crea un Tablero sobre celdas ya generadas (bytearray o memoryview de bytes)
+        sin volver a colocar barcos ni copiar los datos.
+        """
+        tablero = cls.__new__(cls)
+        tablero.filas = filas
+        tablero.columnas = columnas
+        tablero.rng = como_rng(rng)
+        tablero.celdas = celdas
+        tablero.total_parts = sum(1 for v in celdas if v & BARCO)
+        tablero.parts_hit = sum(1 for v in celdas if v & BARCO and v & DISPARO)
+        # Las celdas no traen ids de barco: se reconstruyen a partir de los barcos presentes
+        TableroDatos.identificar_barcos(tablero)
+        tablero.flota = tuple(sorted(tablero.tamanos_barco[1:], reverse=True))
+        tablero.total_tries = 100
+        tablero.are_hints_shown = False
+        tablero.diario = None
+        tablero.jugadas_diario = 0
+        return tablero
+
+    def reiniciar_barcos(self):
+        """Olvida la identidad de todos los barcos (las celdas no se tocan)."""
+        # Id de barco (1, 2, ...) de cada celda, 0 = agua
+        self.barco_de = array.array('H', bytes(2 * self.filas * self.columnas))
+        # Tamaño y partes sin impactar de cada barco, por id (el índice 0 no se usa)
+        self.tamanos_barco = [0]
+        self.partes_vivas = [0]
+
+    def agregar_barco(self, huella):
+        """
+        Registra un barco nuevo sobre las celdas 'huella' (slice de celdas) y retorna su id.
+        """
+        barco_id = len(self.partes_vivas)
+        celdas = range(len(self.celdas))[huella]
+        self.celdas[huella] = bytes((BARCO,)) * len(celdas)
+        for celda in celdas:
+            self.barco_de[celda] = barco_id
+        self.tamanos_barco.append(len(celdas))
+        self.partes_vivas.append(len(celdas))
+        return barco_id
+
+    def barco_hundido_en(self, row, col):
+        """Id del barco en (row, col) si ya no le quedan partes sin impactar; 0 en otro caso."""
+        barco_id = self.barco_de[row * self.columnas + col]
+        return barco_id if barco_id and self.partes_vivas[barco_id] == 0 else 0
+
+    # Vistas perezosas para la capa de presentación (compatibles con la API anterior)
+    @property
+    def matriz(self):
+        """Matriz de '.' (agua) y '*' (barco) construida a partir de 'celdas'."""
+        cols = self.columnas
+        return [['*' if v & BARCO else '.' for v in self.celdas[r * cols:(r + 1) * cols]]
+                for r in range(self.filas)]
+
+    @property
+    def ships(self):
+        """Coordenadas (row, col) de las partes de barco."""
+        return VistaCoordenadas(self, BARCO)
+
+    @property
+    def plays(self):
+        """Coordenadas (row, col) donde ya se ha disparado."""
+        return VistaCoordenadas(self, DISPARO)
+
     def is_ship_at(self, row, col):
-        """Verifica si hay un barco en la coordenada dada usando el set de coordenadas."""
-        return (row, col) in self.ships
+        """Verifica si hay un barco en la coordenada dada leyendo el plano de barcos."""
+        return bool(self.celdas[row * self.columnas + col] & BARCO)
+
+    def is_played_at(self, row, col):
+        """Verifica si ya se disparó en la coordenada dada."""
+        return bool(self.celdas[row * self.columnas + col] & DISPARO)
+
+    def register_shot(self, row, col):
+        """
+        Marca un disparo en (row, col) y retorna el estado previo de la celda:
+        None si ya se había disparado, True si había barco, False si era agua.
+        """
+        i = row * self.columnas + col
+        valor = self.celdas[i]
+        if valor & DISPARO:
+            return None
+        self.celdas[i] = valor | DISPARO
+        if valor & BARCO:
+            self.parts_hit += 1
+            self.partes_vivas[self.barco_de[i]] -= 1
+            return True
+        return False
+
+    # Diario de jugadas para IAs de búsqueda: aplicar_disparo anota cada disparo y
+    # deshacer_disparo lo revierte en O(1), sin copiar el tablero
+    def aplicar_disparo(self, row, col, descontar_intento=False):
+        """
+        register_shot que además anota el disparo en el diario para poder deshacerlo;
+        con 'descontar_intento' un agua resta un intento (como en solo/hv/hvh).
+        Mientras haya jugadas en el diario, los disparos deben pasar por aquí.
+        """
+        impacto = self.register_shot(row, col)
+        if impacto is None:
+            return None
+        descontar = descontar_intento and not impacto
+        if descontar:
+            self.total_tries -= 1
+        if self.diario is None:
+            # Cada celda se dispara como mucho una vez: el diario nunca necesita crecer
+            self.diario = array.array('i', bytes(4 * len(self.celdas)))
+        self.diario[self.jugadas_diario] = (row * self.columnas + col) << 1 | descontar
+        self.jugadas_diario += 1
+        return impacto
+
+    def deshacer_disparo(self):
+        """Revierte el último disparo de aplicar_disparo y retorna su (row, col), o None si no hay."""
+        if not self.jugadas_diario:
+            return None
+        self.jugadas_diario -= 1
+        entrada = self.diario[self.jugadas_diario]
+        i = entrada >> 1
+        valor = self.celdas[i] & ~DISPARO
+        self.celdas[i] = valor
+        if valor & BARCO:
+            self.parts_hit -= 1
+            self.partes_vivas[self.barco_de[i]] += 1
+        if entrada & 1:
+            self.total_tries += 1
+        return divmod(i, self.columnas)
+
+    def deshacer_hasta(self, jugadas):
+        """Deshace disparos hasta dejar 'jugadas' en el diario (un valor previo de jugadas_diario)."""
+        while self.jugadas_diario > jugadas:
+            self.deshacer_disparo()
 
-    def register_hit(self):
-        """Registra un impacto en una parte de barco."""
-        self.parts_hit += 1
-        
     def is_game_over(self):
         """Verifica si el juego ha terminado (todos los barcos hundidos)."""
         return self.parts_hit >= self.total_parts
-        
+
     def decrement_tries(self):
         """Decrementa el contador de intentos restantes."""
         self.total_tries -= 1
-        
+
     def has_run_out_of_tries(self):
         """Verifica si se han agotado los intentos."""
         return self.total_tries <= 0
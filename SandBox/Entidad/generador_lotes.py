@@ -0,0 +1,142 @@
+import functools
+
+try:
+    import numpy as np
+except ImportError: # NumPy es opcional: solo lo necesita la generación por lotes
+    np = None
+
+from Entidad.tablero_datos import IndiceColocaciones, FLOTA_ESTANDAR, BARCO, resolver_flota, orientaciones
+from Entidad.entidad import Tablero
+from Entidad.aleatorio import como_rng
+
+
+def _requiere_numpy():
+    if np is None:
+        raise ImportError("La generación de flotas por lotes requiere NumPy (pip install numpy).")
+
+
+@functools.lru_cache(maxsize=None)
+def _tablas_colocacion(filas, columnas, tam):
+    """
+    Tablas de todas las colocaciones de un barco de 'tam' celdas, derivadas de
+    IndiceColocaciones:
+      - huellas: (P, tam) índices de celda del barco
+      - margenes: (P, M) índices de celda de huella + margen, rellenados con la
+        celda centinela filas*columnas (fuera del tablero)
+      - verticales: (P,) True si la colocación es vertical
+    """
+    indice = IndiceColocaciones.para(filas, columnas, tam)
+    n_celdas = filas * columnas
+
+    huellas, margenes, verticales = [], [], []
+    for orient in orientaciones(tam):
+        for pid in range(indice.total[orient]):
+            huellas.append(range(n_celdas)[indice.huella(orient, pid)])
+            margenes.append([i for zona in indice.margen(orient, pid) for i in range(n_celdas)[zona]])
+            verticales.append(orient == 'V')
+
+    ancho_margen = max((len(m) for m in margenes), default=0)
+    tabla_margenes = np.full((len(margenes), ancho_margen), n_celdas, dtype=np.intp)
+    for p, margen in enumerate(margenes):
+        tabla_margenes[p, :len(margen)] = margen
+
+    tabla_huellas = np.array(huellas, dtype=np.intp).reshape(len(huellas), tam)
+    return tabla_huellas, tabla_margenes, np.array(verticales, dtype=bool)
+
+
+def _colocar_flota_en_lote(k, filas, columnas, flota, rng):
+    """
+    Intenta colocar la flota en k tableros a la vez, barco por barco.
+    Retorna (barcos, ok): barcos (k, filas*columnas) uint8 y ok (k,) bool con los
+    tableros en los que cupieron todos los barcos.
+    """
+    n_celdas = filas * columnas
+    filas_k = np.arange(k)[:, None]
+    barcos = np.zeros((k, n_celdas), dtype=np.uint8)
+    # Celdas prohibidas (barcos y márgenes) + una columna centinela para el relleno
+    prohibidas = np.zeros((k, n_celdas + 1), dtype=bool)
+    ok = np.ones(k, dtype=bool)
+
+    for tam in flota:
+        huellas, margenes, verticales = _tablas_colocacion(filas, columnas, tam)
+        if len(huellas) == 0:
+            ok[:] = False
+            break
+
+        # (k, P): la colocación es compatible si ninguna celda de su huella está prohibida
+        compatibles = ~prohibidas[:, huellas].any(axis=2)
+
+        # Igual que TableroDatos.colocar_barco: se sortea una orientación preferida por
+        # tablero y se elige uniformemente entre sus colocaciones compatibles; solo si
+        # no queda ninguna se usa la otra orientación (bono +1 a la preferida).
+        prefiere_v = rng.random(k) < 0.5
+        claves = rng.random((k, len(huellas))) + (verticales[None, :] == prefiere_v[:, None])
+        claves[~compatibles] = -1.0
+        elegidas = claves.argmax(axis=1)
+
+        ok &= compatibles[np.arange(k), elegidas]
+        barcos[filas_k, huellas[elegidas]] = BARCO
+        prohibidas[filas_k, margenes[elegidas]] = True
+
+    return barcos, ok
+
+
+def generar_flotas(k, filas=10, columnas=None, flota=FLOTA_ESTANDAR, rng=None, lote_max=4096):
+    """
+    Genera k flotas válidas (reglas de TableroDatos: sin tocarse ni en diagonal)
+    con operaciones vectorizadas de NumPy. Cada flota sigue la misma distribución que
+    TableroDatos.generar_barcos (mismo orden de barcos, orientación preferida al azar y
+    colocación uniforme entre las compatibles), aunque no las mismas flotas por semilla.
+    Retorna un arreglo (k, filas, columnas) uint8 con BARCO (1) en las celdas de barco,
+    listo para envolverse con tablero_desde_lote.
+    Los tableros que llegan a un callejón sin salida se vuelven a generar; los que
+    siguen sin flota tras varias rondas (flotas densas o tableros pequeños) se resuelven
+    con resolver_flota, como en TableroDatos.generar_barcos.
+    Lanza ValueError si la flota no cabe en el tablero.
+    """
+    _requiere_numpy()
+    columnas = columnas or filas
+    rng = np.random.default_rng(rng) # Acepta None, una semilla o un Generator ya creado
+
+    resultado = np.empty((k, filas * columnas), dtype=np.uint8)
+    pendientes = np.arange(k)
+    max_rondas = 10
+
+    for _ in range(max_rondas):
+        if len(pendientes) == 0:
+            break
+        # Procesar en bloques para acotar la memoria de las tablas (k, P, tam)
+        for inicio in range(0, len(pendientes), lote_max):
+            bloque = pendientes[inicio:inicio + lote_max]
+            barcos, ok = _colocar_flota_en_lote(len(bloque), filas, columnas, flota, rng)
+            resultado[bloque[ok]] = barcos[ok]
+            pendientes[inicio:inicio + lote_max][ok] = -1
+        pendientes = pendientes[pendientes >= 0]
+
+    # Las rondas al azar no bastaron: búsqueda exhaustiva tablero a tablero
+    if len(pendientes):
+        rng_exhaustivo = como_rng(rng)
+        n_celdas = filas * columnas
+        for fila in pendientes:
+            colocaciones = resolver_flota(filas, columnas, flota, rng_exhaustivo)
+            if colocaciones is None:
+                raise ValueError(f"La flota {tuple(flota)} no cabe en un tablero de {filas}x{columnas}.")
+            resultado[fila] = 0
+            for tam, orient, pid in colocaciones:
+                huella = IndiceColocaciones.para(filas, columnas, tam).huella(orient, pid)
+                resultado[fila, range(n_celdas)[huella]] = BARCO
+
+    return resultado.reshape(k, filas, columnas)
+
+
+def tablero_desde_lote(lote, i):
+    """
+    Envuelve lote[i] como Tablero sin copiar: Tablero.celdas es una vista (memoryview)
+    sobre la memoria del arreglo, así que los disparos quedan marcados en el lote.
+    """
+    _requiere_numpy()
+    vista = lote[i]
+    if vista.dtype != np.uint8 or not vista.flags.c_contiguous:
+        raise ValueError("El tablero debe ser un arreglo uint8 contiguo (C).")
+    filas, columnas = vista.shape
+    return Tablero.desde_celdas(memoryview(vista).cast('B'), filas, columnas)
@@ -0,0 +1,129 @@
+# Entidad/instrumentacion.py
+import sys
+import math
+import time
+
+
+def percentil(ordenadas, p):
+    """
+    Percentil p (0-100) de una lista ya ordenada por el método del rango más cercano: el
+    elemento de rango ceil(p * n / 100), contando desde 1 (None si está vacía).
+    """
+    if not ordenadas:
+        return None
+    return ordenadas[min(len(ordenadas) - 1, max(0, math.ceil(p * len(ordenadas) / 100) - 1))]
+
+
+class Distribucion:
+    """
+    Resumen acumulado de una serie de valores (latencias en segundos, longitudes de
+    cola...): cantidad, suma, máximo y un histograma logarítmico de v = int(valor * escala)
+    (exacto hasta 7, luego 4 cubetas por potencia de dos: error < 25 %), del que salen
+    p50 / p99 aproximados sin guardar las muestras.
+    """
+    __slots__ = ('escala', 'n', 'total', 'maximo', 'cubetas')
+
+    def __init__(self, escala=1):
+        self.escala = escala
+        self.n = 0
+        self.total = 0
+        self.maximo = 0
+        self.cubetas = [0] * 256
+
+    def registrar(self, valor):
+        self.n += 1
+        self.total += valor
+        if valor > self.maximo:
+            self.maximo = valor
+        v = int(valor * self.escala)
+        if v < 8:
+            self.cubetas[max(0, v)] += 1
+        else:
+            bits = v.bit_length()
+            # 8 + 4 cubetas por cada bit por encima del tercero, según los 2 bits tras el primero
+            self.cubetas[min(255, 4 * bits - 8 + ((v >> (bits - 3)) & 3))] += 1
+
+    @staticmethod
+    def _cota(i):
+        """Cota superior (en unidades de valor * escala) de los valores de la cubeta i."""
+        if i < 8:
+            return i
+        bits, sub = divmod(i - 8, 4)
+        return (5 + sub) << (bits + 1)
+
+    def percentil(self, p):
+        """Cota superior del percentil p (0-100): el final de la cubeta donde cae."""
+        if not self.n:
+            return 0
+        objetivo = self.n * p / 100
+        acumulado = 0
+        for i, cantidad in enumerate(self.cubetas):
+            acumulado += cantidad
+            if acumulado >= objetivo:
+                return min(self.maximo, self._cota(i) / self.escala)
+        return self.maximo
+
+    def resumen(self):
+        return {'n': self.n, 'media': self.total / self.n if self.n else 0, 'max': self.maximo,
+                'p50': self.percentil(50), 'p99': self.percentil(99)}
+
+
+class Instrumentacion:
+    """
+    Contadores y distribuciones (tiempos, tamaños) de una ejecución, para saber dónde se
+    va el tiempo de una partida sin conectar un perfilador. No se mide nada por sí
+    sola: la activan WarShipController.enable_instrumentation (envuelve los métodos
+    del camino crítico solo en esa instancia) y TableroDatos.instrumentacion (la
+    generación de tableros). Desactivada no queda ningún envoltorio, así que no cuesta.
+
+    instantanea() la exporta como dict; linea() como una línea de log, que con
+    'intervalo' (segundos) se escribe además sola cada tanto al registrar tiempos.
+    """
+
+    def __init__(self, intervalo=None, escribir=None, reloj=time.perf_counter):
+        self.reloj = reloj
+        self.intervalo = intervalo
+        # Destino de las líneas periódicas: función(str); por defecto stderr
+        self.escribir = escribir or (lambda linea: print(linea, file=sys.stderr))
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.contadores = {}
+        self.distribuciones = {}
+        self.inicio = self.reloj()
+        self._proximo_informe = self.inicio + self.intervalo if self.intervalo else None
+
+    def contar(self, nombre, n=1):
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + n
+
+    def registrar(self, nombre, valor, escala=1):
+        distribucion = self.distribuciones.get(nombre)
+        if distribucion is None:
+            distribucion = self.distribuciones[nombre] = Distribucion(escala)
+        distribucion.registrar(valor)
+
+    def registrar_tiempo(self, nombre, segundos):
+        """Registra una latencia (histograma con resolución de microsegundos)."""
+        self.registrar(nombre, segundos, escala=1e6)
+        if self._proximo_informe is not None and self.reloj() >= self._proximo_informe:
+            self._proximo_informe = self.reloj() + self.intervalo
+            self.escribir(self.linea())
+
+    def instantanea(self):
+        """Copia de los contadores y del resumen de cada distribución."""
+        return {
+            'segundos': self.reloj() - self.inicio,
+            'contadores': dict(self.contadores),
+            'distribuciones': {nombre: d.resumen() for nombre, d in self.distribuciones.items()},
+        }
+
+    def linea(self):
+        """La instantánea en una línea 'clave=valor' (tiempos en microsegundos)."""
+        datos = self.instantanea()
+        partes = [f"t={datos['segundos']:.1f}s"]
+        partes += [f"{nombre}={valor}" for nombre, valor in sorted(datos['contadores'].items())]
+        for nombre, r in sorted(datos['distribuciones'].items()):
+            escala = self.distribuciones[nombre].escala
+            partes.append(f"{nombre}=n:{r['n']},media:{r['media'] * escala:.1f},p50:{r['p50'] * escala:.0f},"
+                          f"p99:{r['p99'] * escala:.0f},max:{r['max'] * escala:.1f}")
+        return " ".join(partes)
@@ -0,0 +1,122 @@
+# Entidad/reserva_tableros.py
+import random
+import threading
+import collections
+from Entidad.entidad import Tablero
+from Entidad.tablero_datos import FLOTA_ESTANDAR
+from Entidad.aleatorio import rng_hijo, nueva_semilla
+
+
+def generar_partida(board_size, flota, nombres, seed):
+    """
+    Tableros de una partida: uno por nombre de flujo ('game', 'tablero1', ...), cada uno
+    generado con rng_hijo(seed, nombre), exactamente como los crea WarShipController.
+    """
+    return tuple(Tablero(board_size, rng=rng_hijo(seed, nombre), flota=flota) for nombre in nombres)
+
+
+class ReservaTableros:
+    """
+    Reserva de partidas ya generadas (semilla maestra + sus tableros) por
+    (board_size, flota, nombres de flujo), que un hilo en segundo plano mantiene llena
+    hasta 'capacidad'. Así la generación de tableros sale del camino crítico de
+    start_*: tomar() entrega una partida lista en O(1) o None si la reserva está vacía,
+    y entonces el controlador genera los tableros en el momento.
+
+    Cada partida se genera a partir de una semilla maestra propia, con los mismos flujos
+    hijos que usa el controlador, de modo que game_seed sigue reproduciendo la partida.
+    Con procesos > 0 la generación se hace en un pool de procesos (para tableros grandes,
+    sin competir por el GIL con la interfaz); con 0, en el propio hilo.
+    """
+
+    def __init__(self, capacidad=4, procesos=0):
+        self.capacidad = capacidad
+        self.procesos = procesos
+        # clave (board_size, flota, nombres) -> deque de (seed, tableros)
+        self._partidas = {}
+        self._cond = threading.Condition()
+        self._detener = False
+        self._hilo = None
+        self._ejecutor = None
+        # Generador privado de semillas: no altera el estado del módulo global 'random'
+        self._rng = random.Random()
+
+    def reservar(self, board_size, nombres, flota=FLOTA_ESTANDAR):
+        """Empieza a mantener llena la reserva de esa clave (tomar() lo hace en su primer uso)."""
+        clave = (board_size, tuple(flota), tuple(nombres))
+        with self._cond:
+            if clave not in self._partidas:
+                self._partidas[clave] = collections.deque()
+                self._cond.notify()
+        return clave
+
+    def tomar(self, board_size, nombres, flota=FLOTA_ESTANDAR):
+        """Retorna (seed, tableros) de una partida ya generada, o None si no hay ninguna lista."""
+        clave = self.reservar(board_size, nombres, flota)
+        with self._cond:
+            cola = self._partidas[clave]
+            partida = cola.popleft() if cola else None
+            self._cond.notify()
+        return partida
+
+    def disponibles(self, board_size, nombres, flota=FLOTA_ESTANDAR):
+        """Partidas listas para esa clave."""
+        with self._cond:
+            return len(self._partidas.get((board_size, tuple(flota), tuple(nombres)), ()))
+
+    def iniciar(self):
+        if self._hilo is not None and self._hilo.is_alive():
+            return self
+        self._detener = False
+        if self.procesos > 0:
+            from concurrent.futures import ProcessPoolExecutor # Importación diferida (ver SimuladorMM)
+            self._ejecutor = ProcessPoolExecutor(max_workers=self.procesos)
+        self._hilo = threading.Thread(target=self._bucle, name="ReservaTableros", daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        """Para el hilo (tras la partida que esté generando) y el pool de procesos."""
+        with self._cond:
+            self._detener = True
+            self._cond.notify()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown(cancel_futures=True)
+            self._ejecutor = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
+
+    def _siguiente_clave(self):
+        """La clave con más hueco, o None si todas están llenas (llamar con el lock tomado)."""
+        clave, hueco = None, 0
+        for candidata, cola in self._partidas.items():
+            if self.capacidad - len(cola) > hueco:
+                clave, hueco = candidata, self.capacidad - len(cola)
+        return clave
+
+    def _bucle(self):
+        while True:
+            with self._cond:
+                while not self._detener and self._siguiente_clave() is None:
+                    self._cond.wait()
+                if self._detener:
+                    return
+                clave = self._siguiente_clave()
+                seed = nueva_semilla(self._rng)
+
+            # Generar fuera del lock: tomar() nunca espera a la generación
+            board_size, flota, nombres = clave
+            if self._ejecutor is not None:
+                tableros = self._ejecutor.submit(generar_partida, board_size, flota, nombres, seed).result()
+            else:
+                tableros = generar_partida(board_size, flota, nombres, seed)
+
+            with self._cond:
+                self._partidas[clave].append((seed, tableros))
@@ -1,10 +1,257 @@
 import random
+import functools
+import collections
+
+# Planos de bits de cada celda de Tablero.celdas
+BARCO = 1    # La celda contiene una parte de barco
+DISPARO = 2  # Ya se disparó en la celda
+
+# Flota estándar: 1x4, 2x3, 3x2, 4x1 (Total 10 barcos, 20 partes)
+FLOTA_ESTANDAR = (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)
+
+
+def orientaciones(tam):
+    """Orientaciones distintas de un barco de 'tam' celdas (uno de tamaño 1 es igual en ambas)."""
+    return ('H',) if tam == 1 else ('H', 'V')
+
+
+class IndiceColocaciones:
+    """
+    Índice de todas las colocaciones legales de un barco de 'tam' celdas en un tablero
+    de filas x columnas. Cada colocación se identifica por (orient, id); su huella
+    (celdas del barco) y su margen (huella + 1 celda alrededor) se obtienen como
+    índices de celda (row * columnas + col) por aritmética, sin recorrer el tablero
+    ni guardar una máscara por colocación (así escala a tableros grandes).
+    Se obtiene con IndiceColocaciones.para(filas, columnas, tam), que lo cachea.
+    """
+
+    def __init__(self, filas, columnas, tam):
+        self.filas = filas
+        self.columnas = columnas
+        self.tam = tam
+        # Horizontal: id = r * anchos_h + c ; Vertical: id = r * columnas + c
+        self.anchos_h = max(0, columnas - tam + 1)
+        self.altos_v = max(0, filas - tam + 1)
+        self.total = {'H': filas * self.anchos_h, 'V': self.altos_v * columnas}
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def para(filas, columnas, tam):
+        """Retorna el índice cacheado para (filas, columnas, tam)."""
+        return IndiceColocaciones(filas, columnas, tam)
+
+    def origen(self, orient, pid):
+        """Retorna (r_start, c_start) de la colocación."""
+        if orient == "H":
+            return divmod(pid, self.anchos_h)
+        return divmod(pid, self.columnas)
+
+    def huella(self, orient, pid):
+        """Slice de Tablero.celdas con las celdas ocupadas por el barco."""
+        r, c = self.origen(orient, pid)
+        inicio = r * self.columnas + c
+        if orient == "H":
+            return slice(inicio, inicio + self.tam)
+        return slice(inicio, inicio + (self.tam - 1) * self.columnas + 1, self.columnas)
+
+    def margen(self, orient, pid):
+        """Slices (uno por fila) de la huella más la zona de amortiguamiento de 1 celda."""
+        r, c = self.origen(orient, pid)
+        alto, ancho = (1, self.tam) if orient == "H" else (self.tam, 1)
+        r_min, r_max = max(0, r - 1), min(self.filas, r + alto + 1)
+        c_min, c_max = max(0, c - 1), min(self.columnas, c + ancho + 1)
+        return [slice(f * self.columnas + c_min, f * self.columnas + c_max) for f in range(r_min, r_max)]
+
+    def cubren(self, orient, celda):
+        """Ids de las colocaciones (en la orientación dada) cuya huella contiene la celda."""
+        r, c = divmod(celda, self.columnas)
+        if orient == "H":
+            if self.anchos_h == 0:
+                return range(0)
+            base = r * self.anchos_h
+            return range(base + max(0, c - self.tam + 1), base + min(c, self.anchos_h - 1) + 1)
+        if self.altos_v == 0:
+            return range(0)
+        r_min, r_max = max(0, r - self.tam + 1), min(r, self.altos_v - 1)
+        return range(r_min * self.columnas + c, r_max * self.columnas + c + 1, self.columnas)
+
+    def es_compatible(self, orient, pid, prohibidas):
+        """La colocación es compatible si ninguna celda de su huella está prohibida."""
+        return not any(prohibidas[self.huella(orient, pid)])
+
+
+class _PoolColocaciones:
+    """
+    Ids de colocaciones (de un tam y orientación) aún no descartadas para el tablero
+    en construcción. Es una permutación de Fisher-Yates "virtual": solo guarda en
+    'mapa' las posiciones intercambiadas, así que crearlo cuesta O(1) aunque el
+    tablero tenga miles de colocaciones.
+    """
+    __slots__ = ('n', 'mapa')
+
+    def __init__(self, total):
+        self.n = total
+        self.mapa = {}
+
+    def elegir_compatible(self, indice, orient, prohibidas, rng=random):
+        """
+        Elige al azar (uniforme) una colocación compatible. Las incompatibles se
+        descartan para siempre, porque la flota solo añade celdas prohibidas:
+        cada colocación se examina como mucho una vez por tablero.
+        Retorna None si ya no queda ninguna.
+        """
+        mapa = self.mapa
+        while self.n > 0:
+            j = rng.randrange(self.n)
+            pid = mapa.get(j, j)
+            if indice.es_compatible(orient, pid, prohibidas):
+                return pid
+            self.n -= 1
+            mapa[j] = mapa.get(self.n, self.n)
+        return None
+
+
+class _EstadoColocacion:
+    """
+    Estado de la generación de una flota: máscara de celdas prohibidas (barcos y sus
+    márgenes) y, por cada (tam, orient), el pool de colocaciones no descartadas.
+    """
+
+    def __init__(self, filas, columnas, tamanos):
+        self.prohibidas = bytearray(filas * columnas)
+        self.indices = {tam: IndiceColocaciones.para(filas, columnas, tam) for tam in set(tamanos)}
+        self.pools = {}
+        for tam, indice in self.indices.items():
+            for orient in orientaciones(tam):
+                self.pools[(tam, orient)] = _PoolColocaciones(indice.total[orient])
+
+    def prohibir(self, zonas):
+        """Marca como prohibidas las celdas de cada slice de 'zonas'."""
+        prohibidas = self.prohibidas
+        for zona in zonas:
+            prohibidas[zona] = b'\x01' * (zona.stop - zona.start)
+
+
+def resolver_flota(filas, columnas, flota, rng=random):
+    """
+    Busca una colocación de todos los barcos de 'flota' (lista de tamaños) en un tablero
+    de filas x columnas, con la regla de margen de siempre. Retorna una lista de
+    (tam, orient, pid) (ids de IndiceColocaciones), o None si se ha demostrado que no
+    existe ninguna.
+
+    Cada barco se ve como su huella "extendida": el barco más su fila inferior y su
+    columna derecha, un rectángulo de 2 x (tam + 1) en un tablero de
+    (filas + 1) x (columnas + 1). Dos barcos no se tocan (ni en diagonal) si y solo si
+    sus huellas extendidas no se solapan, así que el problema es empaquetar esos
+    rectángulos, como máscaras de bits, dejando como mucho 'holgura' celdas sin cubrir.
+    El backtracking decide siempre la primera celda sin decidir, la más restringida:
+    solo la puede cubrir un barco cuya huella extendida empiece justo ahí (uno por
+    tamaño y orientación) o se da por desperdiciada, gastando holgura. Probar primero
+    los barcos más grandes encuentra pronto las soluciones de flotas densas, y agotar
+    la holgura poda enseguida las que no caben. Los estados (celdas decididas, barcos
+    pendientes) ya agotados se recuerdan, porque colocar los mismos barcos en otro
+    orden lleva al mismo estado. La búsqueda es iterativa, así que no depende del
+    límite de recursión en tableros grandes.
+    """
+    pendientes = collections.Counter(flota)
+    if not pendientes:
+        return []
+    if min(pendientes) < 1 or max(pendientes) > max(filas, columnas):
+        return None
+    ancho_ext = columnas + 1
+    total = (filas + 1) * ancho_ext
+    holgura = total - sum(2 * (tam + 1) * cantidad for tam, cantidad in pendientes.items())
+    if holgura < 0:
+        return None # Ni siquiera caben por área
+    lleno = (1 << total) - 1
+    indices = {tam: IndiceColocaciones.para(filas, columnas, tam) for tam in pendientes}
+    tamanos = sorted(pendientes, reverse=True)
+    por_colocar = sum(pendientes.values())
+
+    def opciones_en(x, cubiertas, holgura):
+        """Formas de decidir la celda extendida x: barcos que empiezan ahí y, si hay holgura, dejarla vacía."""
+        r, c = divmod(x, ancho_ext)
+        opciones = []
+        if r < filas and c < columnas:
+            for tam in tamanos:
+                if not pendientes[tam]:
+                    continue
+                indice = indices[tam]
+                grupo = []
+                for orient in orientaciones(tam):
+                    if orient == 'H':
+                        if c + tam > columnas:
+                            continue
+                        alto, ancho, pid = 1, tam, r * indice.anchos_h + c
+                    else:
+                        if r + tam > filas:
+                            continue
+                        alto, ancho, pid = tam, 1, r * columnas + c
+                    extendida = 0
+                    fila_ext = ((1 << (ancho + 1)) - 1) << x
+                    for f in range(alto + 1):
+                        extendida |= fila_ext << (f * ancho_ext)
+                    if not extendida & cubiertas:
+                        grupo.append((tam, orient, pid, extendida))
+                rng.shuffle(grupo)
+                opciones.extend(grupo)
+        if holgura > 0:
+            opciones.append(None)
+        return opciones
+
+    # Cada marco: [cubiertas, holgura, celda, opciones, siguiente opción, clave del estado]
+    cubiertas = 0
+    colocadas = []
+    pila = []
+    fallidos = set() # Estados sin solución
+    while True:
+        if not por_colocar:
+            return [(tam, orient, pid) for tam, orient, pid, _ in colocadas]
+        clave = (cubiertas, tuple(pendientes[tam] for tam in tamanos))
+        x = (~cubiertas & (cubiertas + 1)).bit_length() - 1 # Primera celda sin decidir
+        if cubiertas == lleno or clave in fallidos:
+            opciones = [] # Tablero decidido con barcos pendientes, o estado ya agotado
+        else:
+            opciones = opciones_en(x, cubiertas, holgura)
+        pila.append([cubiertas, holgura, x, opciones, 0, clave])
+
+        # Tomar la siguiente opción del marco más alto, retrocediendo si se agotan
+        while pila:
+            marco = pila[-1]
+            cubiertas, holgura, x, opciones, siguiente, clave = marco
+            if siguiente and opciones[siguiente - 1] is not None:
+                # Deshacer el barco de la opción anterior
+                tam = colocadas.pop()[0]
+                pendientes[tam] += 1
+                por_colocar += 1
+            if siguiente == len(opciones):
+                fallidos.add(clave)
+                pila.pop()
+                continue
+            marco[4] = siguiente + 1
+            opcion = opciones[siguiente]
+            if opcion is None:
+                cubiertas |= 1 << x
+                holgura -= 1
+            else:
+                cubiertas |= opcion[3]
+                pendientes[opcion[0]] -= 1
+                por_colocar -= 1
+                colocadas.append(opcion)
+            break
+        else:
+            return None
+
 
 class TableroDatos:
     """
     Clase de lógica estática para la gestión y colocación de barcos 
     según las reglas estándar de BattleShip.
     """
+
+    # Entidad.instrumentacion.Instrumentacion que recibe intentos, reintentos y tiempo de
+    # generar_barcos (None = sin medir; es de clase, así que cubre todo el proceso)
+    instrumentacion = None
     
     @staticmethod
     def _es_posicion_valida_con_margen(tablero, r_start, c_start, tam, orient):
@@ -15,6 +262,7 @@ class TableroDatos:
         """
         filas = tablero.filas
         columnas = tablero.columnas
+        celdas = tablero.celdas
 
         if orient == "H":
             # Verificar que el barco no se salga del tablero
@@ -31,76 +279,153 @@ class TableroDatos:
             r_min, r_max = max(0, r_start - 1), min(filas, r_start + tam + 1)
             c_min, c_max = max(0, c_start - 1), min(columnas, c_start + 2)
 
-        # Revisar si hay un barco ('*') en la zona de margen/colocación
+        # Revisar si hay un barco (bit BARCO) en la zona de margen/colocación
         for r in range(r_min, r_max):
+            base = r * columnas
             for c in range(c_min, c_max):
-                if tablero.matriz[r][c] == '*':
+                if celdas[base + c] & BARCO:
                     return False
         
         return True
     
     @staticmethod
-    def colocar_barco(tablero, tamano):
+    def colocar_barco(tablero, tamano, estado=None):
         """
-        Coloca un barco de 'tamano' en el tablero de forma aleatoria (horizontal o vertical).
+        Coloca un barco de 'tamano' en el tablero de forma aleatoria (horizontal o vertical),
+        eligiéndolo directamente entre las colocaciones aún compatibles del índice.
+        Si no se pasa 'estado', se construye a partir de los barcos ya presentes.
+        Usa el generador del tablero (tablero.rng) para que la flota sea reproducible.
         """
-        filas = tablero.filas
+        rng = getattr(tablero, 'rng', random)
+        if estado is None:
+            estado = _EstadoColocacion(tablero.filas, tablero.columnas, [tamano])
+            estado.prohibir(zona for i, v in enumerate(tablero.celdas) if v & BARCO
+                            for zona in TableroDatos._vecindad(tablero, i))
+        elif tamano not in estado.indices:
+            return False
+
+        if tamano == 1:
+            orients = ('H',)
+        else:
+            orients = ('H', 'V') if rng.getrandbits(1) else ('V', 'H')
+
+        indice = estado.indices[tamano]
+        for orient in orients:
+            pid = estado.pools[(tamano, orient)].elegir_compatible(indice, orient, estado.prohibidas, rng)
+            if pid is None:
+                continue
+            # Colocar el barco (con su id, para poder avisar cuando se hunda)
+            tablero.agregar_barco(indice.huella(orient, pid))
+            estado.prohibir(indice.margen(orient, pid))
+            return True # Colocación exitosa
+
+        return False # No queda ninguna colocación compatible en ninguna orientación
+
+    @staticmethod
+    def _vecindad(tablero, celda):
+        """Slices (uno por fila) de la celda y sus 8 vecinas dentro del tablero."""
+        r, c = divmod(celda, tablero.columnas)
+        c_min, c_max = max(0, c - 1), min(tablero.columnas, c + 2)
+        return [slice(f * tablero.columnas + c_min, f * tablero.columnas + c_max)
+                for f in range(max(0, r - 1), min(tablero.filas, r + 2))]
+
+    @staticmethod
+    def identificar_barcos(tablero):
+        """
+        Asigna ids de barco a un tablero cuyas celdas ya tienen barcos (por ejemplo,
+        creado con Tablero.desde_celdas). Como los barcos son rectos y no se tocan,
+        cada barco es la racha de celdas BARCO que sigue a la derecha o hacia abajo
+        de su primera celda.
+        """
+        tablero.reiniciar_barcos()
+        celdas = tablero.celdas
         columnas = tablero.columnas
-        orientaciones = ['H', 'V']
-        random.shuffle(orientaciones)
-        max_intentos = 100
-
-        for orient in orientaciones:
-            intentos = 0
-            while intentos < max_intentos:
-                r_start = random.randrange(filas)
-                c_start = random.randrange(columnas)
-                
-                if TableroDatos._es_posicion_valida_con_margen(tablero, r_start, c_start, tamano, orient):
-                    # Colocar el barco
-                    for i in range(tamano):
-                        if orient == "H":
-                            tablero.matriz[r_start][c_start + i] = '*'
-                            tablero.ships.add((r_start, c_start + i))
-                        else: # Vertical
-                            tablero.matriz[r_start + i][c_start] = '*'
-                            tablero.ships.add((r_start + i, c_start))
-                    return True # Colocación exitosa
-
-                intentos += 1
-        
-        return False # Falló la colocación después de intentar ambas orientaciones
+        barco_de = tablero.barco_de
+        tamanos_barco = tablero.tamanos_barco
+        partes_vivas = tablero.partes_vivas
+        n_celdas = len(celdas)
+        for inicio, valor in enumerate(celdas):
+            if not valor & BARCO or barco_de[inicio]:
+                continue
+            # Horizontal si la celda de la derecha (en la misma fila) también es barco
+            if (inicio + 1) % columnas and inicio + 1 < n_celdas and celdas[inicio + 1] & BARCO:
+                paso = 1
+            else:
+                paso = columnas
+            barco_id = len(partes_vivas)
+            tam = vivas = 0
+            celda = inicio
+            while celda < n_celdas and celdas[celda] & BARCO:
+                barco_de[celda] = barco_id
+                tam += 1
+                vivas += not celdas[celda] & DISPARO
+                celda += paso
+                if paso == 1 and celda % columnas == 0:
+                    break # Fin de la fila
+            tamanos_barco.append(tam)
+            partes_vivas.append(vivas)
 
     @staticmethod
-    def generar_barcos(tablero):
+    def generar_barcos(tablero, flota=None):
         """
-        Coloca todos los barcos en el tablero según las reglas estándar de BattleShip:
-        1 x 4, 2 x 3, 3 x 2, 4 x 1 (Total: 20 partes).
+        Coloca todos los barcos de 'flota' (por defecto tablero.flota o, si no la tiene,
+        la flota estándar 1 x 4, 2 x 3, 3 x 2, 4 x 1) en el tablero.
+        Primero se intenta al azar, tomando cada barco de las colocaciones compatibles
+        (en flotas normales sale a la primera); si varios intentos llegan a un callejón
+        sin salida (flotas densas o tableros pequeños), se recurre a resolver_flota,
+        que encuentra una colocación o demuestra que no la hay.
+        Lanza ValueError si la flota no cabe en el tablero.
         """
-        # Tamaños de los barcos a colocar: 1x4, 2x3, 3x2, 4x1 (Total 10 barcos, 20 partes)
-        barcos = [4] + [3, 3] + [2, 2, 2] + [1, 1, 1, 1]  
-        
+        barcos = tuple(flota or getattr(tablero, 'flota', None) or FLOTA_ESTANDAR)
+        instrumentacion = TableroDatos.instrumentacion
+        inicio = instrumentacion.reloj() if instrumentacion is not None else 0
+
         max_attempts = 10
         attempt = 0
-        
+
         while attempt < max_attempts:
             # Resetear el estado de los barcos antes de cada intento
-            tablero.matriz = [['.' for _ in range(tablero.columnas)] for _ in range(tablero.filas)]
-            tablero.ships = set()
+            tablero.celdas = bytearray(tablero.filas * tablero.columnas)
+            tablero.reiniciar_barcos()
+            estado = _EstadoColocacion(tablero.filas, tablero.columnas, barcos)
             all_placed = True
 
             for tamano in barcos:
-                if not TableroDatos.colocar_barco(tablero, tamano):
-                    # Falló la colocación de un barco, reiniciar el proceso completo
+                if not TableroDatos.colocar_barco(tablero, tamano, estado):
+                    # No queda hueco para este barco, reiniciar el proceso completo
                     all_placed = False
-                    break 
+                    break
 
             if all_placed:
                 # Éxito: todos los barcos colocados
-                tablero.total_parts = len(tablero.ships)
+                tablero.total_parts = sum(barcos)
+                if instrumentacion is not None:
+                    TableroDatos._medir_generacion(instrumentacion, inicio, attempt + 1, False)
                 return
-            
+
             attempt += 1
-        
-        # Si llega aquí, significa que falló después de todos los intentos
-        print("ERROR FATAL: No se pudo generar un tablero válido después de múltiples intentos.")
\ No newline at end of file
+
+        # Los intentos al azar fallaron: búsqueda exhaustiva
+        colocaciones = resolver_flota(tablero.filas, tablero.columnas, barcos, getattr(tablero, 'rng', random))
+        if colocaciones is None:
+            if instrumentacion is not None:
+                instrumentacion.contar('flotas_imposibles')
+            raise ValueError(f"La flota {barcos} no cabe en un tablero de {tablero.filas}x{tablero.columnas}.")
+        tablero.celdas = bytearray(tablero.filas * tablero.columnas)
+        tablero.reiniciar_barcos()
+        for tam, orient, pid in colocaciones:
+            indice = IndiceColocaciones.para(tablero.filas, tablero.columnas, tam)
+            tablero.agregar_barco(indice.huella(orient, pid))
+        tablero.total_parts = sum(barcos)
+        if instrumentacion is not None:
+            TableroDatos._medir_generacion(instrumentacion, inicio, max_attempts, True)
+
+    @staticmethod
+    def _medir_generacion(instrumentacion, inicio, intentos, exhaustiva):
+        """Vuelca en 'instrumentacion' lo que costó una llamada a generar_barcos."""
+        instrumentacion.registrar_tiempo('generar_barcos', instrumentacion.reloj() - inicio)
+        instrumentacion.contar('tableros_generados')
+        instrumentacion.contar('intentos_generacion', intentos)
+        instrumentacion.contar('reintentos_generacion', intentos - 1)
+        if exhaustiva:
+            instrumentacion.contar('resoluciones_exhaustivas')
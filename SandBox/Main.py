@@ -1,16 +1,35 @@
+import time
+
+# Inicio del arranque para --profile-startup: lo primero que ejecuta el programa
+_INICIO = time.perf_counter()
+
 import sys
-from Presentacion.presentacion import WarShipGame
-from PySide6.QtWidgets import QApplication
 
-if __name__ == "__main__":
+# Subcomandos que se atienden sin interfaz gráfica (ver Consola/consola.py)
+COMANDOS_CONSOLA = ('solo', 'mm', 'generar', '--profile-startup', '-h', '--help')
+
+
+def iniciar_interfaz():
+    # Importaciones diferidas: PySide6 y Presentacion solo se cargan si se abre la ventana
+    from PySide6.QtWidgets import QApplication
+    from Presentacion.presentacion import WarShipGame
+
     # 1. Crear la instancia de QApplication
     app = QApplication(sys.argv)
-    
+
     # 2. Instanciar la ventana principal (Vista)
     window = WarShipGame()
-    
+
     # 3. Mostrar la ventana al usuario
     window.show()
-    
+
     # 4. Iniciar el bucle de eventos
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in COMANDOS_CONSOLA:
+        from Consola.consola import main
+        main(sys.argv[1:], inicio=_INICIO)
+    else:
+        iniciar_interfaz()
@@ -1,19 +1,38 @@
 import sys
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
-                               QHBoxLayout, QGridLayout, QLabel, QPushButton,
-                               QSplitter, QStackedWidget, QSizePolicy)
+                               QHBoxLayout, QLabel, QPushButton,
+                               QSplitter, QStackedWidget, QSizePolicy, QScrollArea, QSlider)
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QIcon
 from Controlador.controlador import WarShipController 
+from Controlador.turbo import MotorTurbo
+from Entidad.reserva_tableros import ReservaTableros
+from Presentacion.tablero_widget import BoardWidget
 
 class WarShipGame(QMainWindow):
-    def __init__(self):
+    # Niveles del control de velocidad de la IA, en jugadas por segundo:
+    # 0 = paso a paso (botón "Siguiente Jugada"), None = turbo sin límite.
+    # Desde AI_TURBO_MIN_RATE las jugadas 'mm' se calculan en un hilo (MotorTurbo)
+    # y la ventana solo repinta el último estado al ritmo de refresco de la pantalla.
+    AI_SPEED_LEVELS = (0, 1, 2, 5, 20, 60, 250, 2000, None)
+    AI_SPEED_DEFAULT_LEVEL = 2 # 2 jugadas/s = los 500 ms de siempre
+    AI_TURBO_MIN_RATE = 250
+
+    def __init__(self, board_size=10):
         super().__init__()
         self.setWindowTitle("BattleShip")
         self.setGeometry(100, 100, 1000, 800)
 
-        # Crear instancia del controlador con tablero de 10x10
-        self.controller = WarShipController(board_size=10)
+        # Reserva de tableros pregenerados en segundo plano: empezar o reiniciar una
+        # partida no espera a la generación (en tableros grandes, en un proceso aparte)
+        self.board_pool = ReservaTableros(capacidad=2, procesos=1 if board_size >= 200 else 0).iniciar()
+        for names in (('game',), ('tablero1', 'tablero2')):
+            self.board_pool.reservar(board_size, names)
+
+        # Crear instancia del controlador (10x10 por defecto; la vista admite hasta 1000x1000)
+        self.controller = WarShipController(board_size=board_size, board_pool=self.board_pool)
+        # El controlador avisa de cada disparo para repintar solo esa celda
+        self.controller.add_shot_listener(self.on_controller_shot)
         # Configurar los estilos CSS de la interfaz
         self.setup_styles()
 
@@ -31,6 +50,10 @@ class WarShipGame(QMainWindow):
         # board_id puede ser: "game", "t1", "t2"
         # actor puede ser: "human", "machine", "A", "B"
         self.last_move = None
+
+        # Tablero (y su board_id) que muestra board_view: los disparos sobre él se repintan
+        self._visible_tablero = None
+        self._visible_board_id = None
         
         # Estado HvH(
         self.is_hvh_switching = False # Bloquea clics durante la transición de turno
@@ -39,13 +62,17 @@ class WarShipGame(QMainWindow):
         
         # AI Timer
         self.ai_timer = QTimer(self)
-        self.ai_timer_interval_ms_default = 500
-        self.ai_timer_interval_ms = self.ai_timer_interval_ms_default
-        self.ai_timer.setInterval(self.ai_timer_interval_ms)
+        self.ai_timer.setSingleShot(True) # Cada jugada programa la siguiente (schedule_ai_step)
         self.ai_timer.timeout.connect(self.ai_step)
         self.ai_running = False
         self.ai_paused = False
-        self.ai_speed_up = False
+        self.ai_speed_level = self.AI_SPEED_DEFAULT_LEVEL
+
+        # Modo turbo: el hilo de MotorTurbo juega y este timer muestrea su último estado
+        self.turbo = None
+        self.turbo_timer = QTimer(self)
+        self.turbo_timer.timeout.connect(self.turbo_sample)
+        self.turbo_last_sampled = 0
 
         # Crear las tres vistas principales del juego
         self.create_home_view() # Vista de inicio
@@ -88,20 +115,6 @@ class WarShipGame(QMainWindow):
                 margin-bottom: 20px;
                 color: #4299e1;
             }
-            .board-button {
-                background-color: #1a202c;
-                border: 1px solid #4a5568;
-                min-width: 35px;
-                max-width: 35px;
-                min-height: 35px;
-                max-height: 35px;
-                padding: 0;
-                font-size: 18px;
-                font-weight: bold;
-            }
-            .board-button:hover {
-                background-color: #2d3748;
-            }
         """)
 
     def create_home_view(self):
@@ -192,11 +205,16 @@ class WarShipGame(QMainWindow):
         self.board_panel_layout = QHBoxLayout(self.board_panel)
         self.main_layout.addWidget(self.board_panel)
 
-        # Área del tablero (opponent_board_widget y layout)
-        self.opponent_board_widget = QWidget()
-        self.opponent_board_layout = QGridLayout(self.opponent_board_widget)
-        self.opponent_board_layout.setSpacing(1)
-        self.board_panel_layout.addWidget(self.opponent_board_widget, stretch=1)
+        # Área del tablero: un único widget que pinta solo las celdas visibles,
+        # dentro de un QScrollArea para desplazarse por tableros grandes (Ctrl + rueda = zoom)
+        self.board_view = BoardWidget()
+        self.board_view.cellClicked.connect(self.on_board_cell_clicked)
+        self.board_scroll = QScrollArea()
+        self.board_scroll.setWidgetResizable(True)
+        self.board_scroll.setAlignment(Qt.AlignCenter)
+        self.board_scroll.setFrameShape(QScrollArea.NoFrame)
+        self.board_scroll.setWidget(self.board_view)
+        self.board_panel_layout.addWidget(self.board_scroll, stretch=1)
 
         self.btn_toggle_view = QPushButton("Alternar Vista (T1/T2)")
         self.btn_toggle_view.clicked.connect(self.on_toggle_view_clicked)
@@ -231,10 +249,27 @@ class WarShipGame(QMainWindow):
         self.btn_pause_resume.hide()
         controls_layout.addWidget(self.btn_pause_resume)
 
-        self.btn_speed = QPushButton("Acelerar")
-        self.btn_speed.clicked.connect(self.toggle_speed)
-        self.btn_speed.hide()
-        controls_layout.addWidget(self.btn_speed)
+        # Control de velocidad de la IA: desde paso a paso hasta turbo sin límite
+        self.speed_panel = QWidget()
+        speed_layout = QHBoxLayout(self.speed_panel)
+        speed_layout.setContentsMargins(0, 0, 0, 0)
+        self.speed_slider = QSlider(Qt.Horizontal)
+        self.speed_slider.setRange(0, len(self.AI_SPEED_LEVELS) - 1)
+        self.speed_slider.setValue(self.ai_speed_level)
+        self.speed_slider.setMinimumWidth(120)
+        self.speed_slider.valueChanged.connect(self.on_speed_changed)
+        self.speed_label = QLabel()
+        self.speed_label.setMinimumWidth(110)
+        speed_layout.addWidget(self.speed_slider)
+        speed_layout.addWidget(self.speed_label)
+        self.speed_panel.hide()
+        controls_layout.addWidget(self.speed_panel)
+        self._update_speed_label()
+
+        self.btn_step = QPushButton("Siguiente Jugada")
+        self.btn_step.clicked.connect(self.on_step_clicked)
+        self.btn_step.hide()
+        controls_layout.addWidget(self.btn_step)
         
         self.btn_end_turn = QPushButton("Finalizar Turno")
         self.btn_end_turn.clicked.connect(self.toggle_player_turn_hvh)
@@ -251,7 +286,7 @@ class WarShipGame(QMainWindow):
 
     # Métodos de Inicio de Juego
     def start_solo_game(self):
-        self.ai_timer.stop()
+        self.stop_ai_loop()
         self.mode = 'solo'
         self.controller.start_new_game()
         self.ui_states = {}
@@ -264,7 +299,8 @@ class WarShipGame(QMainWindow):
 
         # Ocultar los botones que no son necesario
         self.btn_pause_resume.hide()
-        self.btn_speed.hide()
+        self.speed_panel.hide()
+        self.btn_step.hide()
         self.btn_restart.hide()
         self.btn_toggle_view.hide()
         self.btn_toggle_ai_boards.hide()
@@ -285,16 +321,12 @@ class WarShipGame(QMainWindow):
         self.stacked_widget.setCurrentIndex(2)
 
     def start_mm_game(self):
-        self.ai_timer.stop()
+        self.stop_ai_loop()
         self.mode = 'mm'
         self.controller.start_machine_vs_machine()
         self.ui_states = {}
         self.last_move = None
         self.is_hvh_switching = False
-        self.ai_timer_interval_ms = self.ai_timer_interval_ms_default
-        self.ai_timer.setInterval(self.ai_timer_interval_ms)
-        self.btn_speed.setText("Acelerar")
-        self.ai_speed_up = False
 
         self.recreate_board_grid(self.controller.get_board_size())
         self.reset_board_buttons_ui()
@@ -307,7 +339,7 @@ class WarShipGame(QMainWindow):
 
         self.btn_pause_resume.show()
         self.btn_pause_resume.setText("Pausar IA")
-        self.btn_speed.show()
+        self.speed_panel.show()
         self.btn_restart.hide()
         self.btn_toggle_view.hide()
         self.btn_toggle_ai_boards.show()
@@ -315,11 +347,11 @@ class WarShipGame(QMainWindow):
 
         self.ai_running = True
         self.ai_paused = False
-        self.ai_timer.start(self.ai_timer_interval_ms)
+        self.schedule_ai_step()
 
     # Inicio y Logica - HvH
     def start_hvh_game(self):
-        self.ai_timer.stop()
+        self.stop_ai_loop()
         self.mode = 'hvh'
         self.current_visible_board = 2 # P1 atacará T2
         self.controller.start_hvh_game() # Asume que esto inicializa tableros y self.controller.current_turn = 'P1'
@@ -338,7 +370,8 @@ class WarShipGame(QMainWindow):
 
         # Configuración de botones:
         self.btn_pause_resume.hide()
-        self.btn_speed.hide()
+        self.speed_panel.hide()
+        self.btn_step.hide()
         self.btn_restart.hide()
         self.btn_toggle_view.hide()
         self.btn_toggle_ai_boards.hide()
@@ -361,16 +394,12 @@ class WarShipGame(QMainWindow):
     
     def start_hv_game(self):
         """Inicializa el modo Humano vs Máquina."""
-        self.ai_timer.stop()
+        self.stop_ai_loop()
         self.mode = 'hv'
         self.controller.start_human_vs_machine()
         self.ui_states = {}
         self.last_move = None
         self.is_hvh_switching = False
-        self.ai_timer_interval_ms = self.ai_timer_interval_ms_default
-        self.ai_timer.setInterval(self.ai_timer_interval_ms)
-        self.btn_speed.setText("Acelerar")
-        self.ai_speed_up = False
 
         self.recreate_board_grid(self.controller.get_board_size())
         self.reset_board_buttons_ui()
@@ -386,7 +415,7 @@ class WarShipGame(QMainWindow):
         # Configuración de botones
         # self.btn_pause_resume.show()
         # self.btn_pause_resume.setText("Pausar IA")
-        self.btn_speed.show()
+        self.speed_panel.show()
         self.btn_restart.hide()
         self.btn_toggle_view.show() # Permite ver tu tablero (T1)
         self.btn_toggle_ai_boards.hide()
@@ -453,9 +482,7 @@ class WarShipGame(QMainWindow):
         self.message_label.setText(f"Turno de **{self.controller.current_turn}**: ¡Dispara al {target_board}!")
 
     # Lógica de Clics y Turnos
-    def on_board_cell_clicked(self):
-        button = self.sender()
-        row, col = button.property("row"), button.property("col")
+    def on_board_cell_clicked(self, row, col):
 
         # Bloqueos de seguridad
         if self.mode in ('hv','mm') and self.ai_running: return
@@ -463,7 +490,7 @@ class WarShipGame(QMainWindow):
         if self.mode == 'hvh' and self.is_hvh_switching: 
             self.message_label.setText("Espera. Pulsa 'Continuar' para iniciar el turno.")
             return
-        if button.property("state") in ("hit", "miss", "win"): return
+        if self.board_view.cell_state(row, col) in ("hit", "miss", "win"): return
 
         if self.mode == 'hvh':
             
@@ -499,7 +526,7 @@ class WarShipGame(QMainWindow):
                 state_result = "miss"
             
             self.ui_states[(board_id, row, col)] = state_result
-            self._update_button_style(button, state_result)
+            self._refresh_cell(board_id, row, col)
 
             # Chequear fin de juego
             if self.controller.is_game_finished():
@@ -525,7 +552,7 @@ class WarShipGame(QMainWindow):
                 state_result = "miss"
 
             self.ui_states[(board_id, row, col)] = state_result
-            self._update_button_style(button, state_result)
+            self._refresh_cell(board_id, row, col)
             
             if self.controller.is_game_finished():
                 self.end_game_ui()
@@ -553,7 +580,7 @@ class WarShipGame(QMainWindow):
                 state_result = "miss"
 
             self.ui_states[(board_id, row, col)] = state_result
-            self._update_button_style(button, state_result)
+            self._refresh_cell(board_id, row, col)
 
             if self.controller.is_game_finished():
                 self.end_game_ui()
@@ -563,7 +590,7 @@ class WarShipGame(QMainWindow):
                 self.controller.current_turn = 'machine'
                 self.ai_running = True
                 self.ai_paused = False
-                self.ai_timer.start(self.ai_timer_interval_ms)
+                self.schedule_ai_step()
             return
 
     # AI/Helper Methods
@@ -616,40 +643,19 @@ class WarShipGame(QMainWindow):
             self.back_to_mode_selection() 
 
     def back_to_mode_selection(self):
-        self.ai_timer.stop()
+        self.stop_ai_loop()
         self.stacked_widget.setCurrentIndex(1)
         self.message_label.setText("Selecciona el modo de juego.")
         self.btn_restart.hide()
 
     def recreate_board_grid(self, size):
-        if self.opponent_board_layout is None: return
-        for i in reversed(range(self.opponent_board_layout.count())): 
-            widget = self.opponent_board_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.deleteLater()
-        
-        for r in range(size):
-            for c in range(size):
-                button = QPushButton(" ")
-                button.setObjectName("board-button")
-                button.setProperty("row", r)
-                button.setProperty("col", c)
-                button.setProperty("state", None) 
-                button.clicked.connect(self.on_board_cell_clicked)
-                button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-                self.opponent_board_layout.addWidget(button, r, c)
+        # Un solo widget pinta todo el tablero: basta con fijar el nuevo tamaño
+        self.board_view.set_board_size(size)
+        self._visible_tablero = self._visible_board_id = None
 
     def reset_board_buttons_ui(self):
-        for r in range(self.controller.get_board_size()):
-            for c in range(self.controller.get_board_size()):
-                item = self.opponent_board_layout.itemAtPosition(r, c)
-                if item and item.widget() is not None:
-                    button = item.widget()
-                    button.setText(" ")
-                    button.setProperty("state", None)
-                    button.setEnabled(True)
-                    button.setStyleSheet("")
-                    button.style().polish(button)
+        self.board_view.reset()
+        self._visible_tablero = self._visible_board_id = None
 
     def toggle_view_my_board(self):
         if self.mode != 'hv': return
@@ -680,29 +686,106 @@ class WarShipGame(QMainWindow):
 
     def pause_resume_ai(self):
         if self.ai_running and not self.ai_paused:
-            self.ai_timer.stop()
+            self.stop_ai_loop()
             self.ai_paused = True
             self.btn_pause_resume.setText("Reanudar IA")
             self.message_label.setText("Juego Pausado.")
         elif self.ai_running and self.ai_paused:
-            self.ai_timer.start(self.ai_timer_interval_ms)
             self.ai_paused = False
             self.btn_pause_resume.setText("Pausar IA")
             turn = self.controller.current_turn
             self.message_label.setText(f"Turno de Máquina {turn}.")
-
-    def toggle_speed(self):
-        if self.ai_speed_up:
-            self.ai_timer_interval_ms = self.ai_timer_interval_ms_default
-            self.btn_speed.setText("Acelerar")
-            self.ai_speed_up = False
+            self.schedule_ai_step()
+
+    # Velocidad de la IA
+    def _update_speed_label(self):
+        rate = self.AI_SPEED_LEVELS[self.ai_speed_level]
+        if rate == 0:
+            text = "Paso a paso"
+        elif rate is None:
+            text = "Turbo (sin límite)"
         else:
-            self.ai_timer_interval_ms = 50 
-            self.btn_speed.setText("Normal")
-            self.ai_speed_up = True
-        
+            text = f"{rate} jugadas/s"
+        self.speed_label.setText(text)
+
+    def _is_turbo_rate(self, rate):
+        return self.mode == 'mm' and (rate is None or rate >= self.AI_TURBO_MIN_RATE)
+
+    def on_speed_changed(self, level):
+        self.ai_speed_level = level
+        self._update_speed_label()
+        # Aplicar la nueva velocidad al ciclo en curso
+        if self.ai_running and not self.ai_paused:
+            self.stop_ai_loop()
+            self.schedule_ai_step()
+
+    def on_step_clicked(self):
         if self.ai_running and not self.ai_paused:
-            self.ai_timer.setInterval(self.ai_timer_interval_ms)
+            self.ai_step()
+
+    def schedule_ai_step(self):
+        """Programa la siguiente jugada de la IA según el nivel de velocidad elegido."""
+        rate = self.AI_SPEED_LEVELS[self.ai_speed_level]
+        if rate == 0:
+            # Paso a paso: la jugada espera al botón "Siguiente Jugada"
+            self.btn_step.show()
+            return
+        self.btn_step.hide()
+        if self._is_turbo_rate(rate):
+            self.start_turbo(rate)
+        else:
+            self.ai_timer.start(0 if rate is None else round(1000 / rate))
+
+    def stop_ai_loop(self):
+        """Detiene el timer de la IA y, si está en marcha, el motor turbo."""
+        self.ai_timer.stop()
+        self.stop_turbo()
+
+    # Modo turbo
+    def start_turbo(self, rate):
+        self.stop_turbo()
+        # Los avisos por celda llegarían desde el hilo trabajador: se sustituyen
+        # por el muestreo periódico de turbo_sample
+        self.controller.remove_shot_listener(self.on_controller_shot)
+        self.turbo = MotorTurbo(self.controller, jugadas_por_seg=rate)
+        self.turbo_last_sampled = 0
+        refresh_rate = self.screen().refreshRate() if self.screen() else 60
+        self.turbo_timer.start(max(1, round(1000 / (refresh_rate or 60))))
+        self.turbo.iniciar()
+
+    def stop_turbo(self):
+        if self.turbo is None:
+            return
+        self.turbo_timer.stop()
+        self.turbo.detener()
+        self.turbo = None
+        self.controller.add_shot_listener(self.on_controller_shot)
+        self.board_view.update()
+
+    def closeEvent(self, event):
+        # Parar los hilos de fondo (turbo y reserva de tableros) antes de cerrar
+        self.stop_turbo()
+        self.board_pool.detener()
+        super().closeEvent(event)
+
+    def turbo_sample(self):
+        """Muestra el último estado del motor turbo (una vez por refresco de pantalla)."""
+        if self.turbo is None:
+            return
+        moves, last_move, turn, finished = self.turbo.instantanea()
+        if moves != self.turbo_last_sampled:
+            self.turbo_last_sampled = moves
+            # Todas las jugadas desde el último muestreo se muestran en un solo repintado
+            self.board_view.update()
+            self.turn_label.setText(f"Turno: Máquina {turn}")
+            actor, row, col, result, message = last_move
+            if row is not None:
+                coord = f"{chr(ord('A') + row)}{col + 1}"
+                self.message_label.setText(f"Turbo: {moves} jugadas. {actor} disparó en {coord}: {message}")
+        if finished:
+            self.stop_turbo()
+            self.ai_running = False
+            self.end_game_ui()
 
     def ai_step(self):
         """
@@ -757,13 +840,7 @@ class WarShipGame(QMainWindow):
             coord = f"{chr(ord('A') + row)}{col + 1}"
             full_msg = f"Turno {current_actor}. Disparo en {coord}: {message}"
             self.message_label.setText(full_msg)
-
-            # Actualizar la interfaz
-            button = self.get_button_by_coords(board_id, row, col)
-            
-            # Solo actualiza la UI si estamos viendo el tablero atacado
-            if self.current_visible_board == board_id:
-                self._update_button_style(button, result)
+            # La celda se repinta desde on_controller_shot si el tablero atacado está a la vista
         
         # Chequear fin del juego
         if self.controller.is_game_finished():
@@ -779,6 +856,7 @@ class WarShipGame(QMainWindow):
         if self.controller.mode == 'hv':
             # HV: Cede el control al Humano. El timer permanece detenido.
             self.ai_running = False 
+            self.btn_step.hide()
             self.turn_label.setText("Turno: Humano")
             self.message_label.setText("Tu turno. ¡Dispara!")
             
@@ -788,8 +866,8 @@ class WarShipGame(QMainWindow):
             self.message_label.setText(f"Turno de {current_actor} finalizado. Máquina {next_turn} ataca...")
             
             # Iniciar el ciclo del siguiente turno de la IA
-            self.ai_timer.start(self.ai_timer_interval_ms) 
             self.ai_running = True
+            self.schedule_ai_step()
 
     def determine_winner_text(self):
         if self.mode == 'solo':
@@ -817,7 +895,7 @@ class WarShipGame(QMainWindow):
         return None
 
     def end_game_ui(self):
-        self.ai_timer.stop()
+        self.stop_ai_loop()
         self.ai_running = False
         self.ai_paused = False
         self.btn_end_turn.hide()
@@ -841,13 +919,15 @@ class WarShipGame(QMainWindow):
                 board_id = "t1" if board_num == 1 else "t2"
                 
             self.ui_states[(board_id, row, col)] = "win"
+            self._refresh_cell(board_id, row, col)
 
             self.show_board(board_num, hvh_reveal_ships=True)
 
         # Controles finales (Volver a Jugar y Cambiar Modo)
         self.btn_restart.show()
         # btn_back_to_mode (Cambiar Modo) está visible por defecto en el layout
-        self.btn_speed.hide()
+        self.speed_panel.hide()
+        self.btn_step.hide()
         # self.btn_toggle_view.hide()
         # self.btn_toggle_ai_boards.hide()
 
@@ -909,31 +989,11 @@ class WarShipGame(QMainWindow):
             should_show_ships = False
         
         
-        for row in range(self.controller.get_board_size()):
-            for col in range(self.controller.get_board_size()):
-                item = self.opponent_board_layout.itemAtPosition(row, col)
-                if not item: continue
-                button = item.widget()
-
-                key = (board_id, row, col)
-                
-                # 1. Estado persistente (hit/miss/win ya aplicado)
-                if key in self.ui_states:
-                    self._update_button_style(button, self.ui_states[key])
-                    continue
-                
-                # 2. Estado ideal (Barco golpeado o fallado) - Esto tiene prioridad
-                if (row, col) in tablero.plays:
-                    if tablero.is_ship_at(row, col):
-                        self._update_button_style(button, "hit")
-                    else:
-                        self._update_button_style(button, "miss")
-                # 3. Barcos no golpeados (Ahora usa should_show_ships)
-                elif should_show_ships and tablero.is_ship_at(row, col):
-                    self._update_button_style(button, "ship")
-                # 4. Agua(Esta base)
-                else:
-                    self._update_button_style(button, None)
+        # La vista no guarda estados: pide el de cada celda visible al pintar
+        self._visible_tablero = tablero
+        self._visible_board_id = board_id
+        self.board_view.set_cell_provider(
+            lambda row, col: self._cell_state_for(tablero, board_id, row, col, should_show_ships))
 
         # La visibilidad del botón de pistas se manejará en los métodos start_xxx_game y toggle_view_my_board.
         # Aquí aseguramos que el texto esté correcto si ya está visible:
@@ -941,54 +1001,30 @@ class WarShipGame(QMainWindow):
             self.btn_show_ships.setText("Ocultar Barcos" if tablero and tablero.are_hints_shown else "Mostrar Barcos")
 
 
-    def _update_button_style(self, button, state):
-        """
-        Aplica estilos al botón de la cuadrícula basado en su estado de juego.
-        Estados posibles: None (agua), 'ship' (barco no golpeado), 'hit', 'miss', 'win'.
-        """
-        # Asegurarse de que el botón está habilitado por defecto y el texto se borra
-        button.setEnabled(True)
-        button.setText(" ")
-        
-        # Estilos base (agua/no jugado)
-        base_style = "background-color: #1a202c; border: 1px solid #4a5568;"
-        
-        if state is None or state == 'water':
-            # Estado base (agua/no jugado)
-            button.setStyleSheet(base_style)
-            button.setProperty("state", None)
-
-        elif state == 'ship':
-            # Barco no golpeado (usado para hints o fin de juego)
-            button.setText("B")
-            button.setStyleSheet("background-color: #38a169; color: white; border: 1px solid #2d3748;")
-            button.setProperty("state", "ship")
-            # En modos de hint, el botón debe estar deshabilitado para evitar disparar donde ya se sabe que hay barco.
-            button.setEnabled(False) 
-            
-        elif state == 'hit':
-            # Impacto (Hit)
-            button.setText("O")
-            button.setStyleSheet("background-color: #e53e3e; color: white; border: 1px solid #2d3748;")
-            button.setProperty("state", "hit")
-            button.setEnabled(False)
-
-        elif state == 'miss':
-            # Fallo (Miss)
-            button.setText("X")
-            button.setStyleSheet("background-color: #a0aec0; color: #1a202c; border: 1px solid #2d3748;")
-            button.setProperty("state", "miss")
-            button.setEnabled(False)
-
-        elif state == 'win':
-            # Impacto final (Win/Hundido completo) - Color especial para destacar
-            button.setText("O")
-            button.setStyleSheet("background-color: #6F00FF; color: white; border: 2px solid #fff;")
-            button.setProperty("state", "win")
-            button.setEnabled(False)
-
-        # Aplicar el nuevo estilo al widget
-        button.style().polish(button)
+    def _cell_state_for(self, tablero, board_id, row, col, show_ships):
+        """Estado a dibujar en una celda: None (agua), 'ship', 'hit', 'miss' o 'win'."""
+        # 1. Estado persistente (hit/miss/win ya aplicado)
+        key = (board_id, row, col)
+        if key in self.ui_states:
+            return self.ui_states[key]
+        # 2. Estado ideal (Barco golpeado o fallado) - Esto tiene prioridad
+        if tablero.is_played_at(row, col):
+            return "hit" if tablero.is_ship_at(row, col) else "miss"
+        # 3. Barcos no golpeados
+        if show_ships and tablero.is_ship_at(row, col):
+            return "ship"
+        # 4. Agua(Esta base)
+        return None
+
+    def _refresh_cell(self, board_id, row, col):
+        """Repinta la celda (row, col) si el tablero 'board_id' es el que se está mostrando."""
+        if board_id == self._visible_board_id:
+            self.board_view.update_cell(row, col)
+
+    def on_controller_shot(self, tablero, row, col, result):
+        """Aviso del controlador tras un disparo: repintar la celda si ese tablero está a la vista."""
+        if tablero is self._visible_tablero:
+            self.board_view.update_cell(row, col)
 
     def _reset_ui_state(self):
         """Función auxiliar para limpiar los estados persistentes de la interfaz."""
@@ -1051,16 +1087,9 @@ class WarShipGame(QMainWindow):
         # Otros controles visuales (solo para Hv o MM)
         self.btn_end_turn.hide()
 
-    def get_button_by_coords(self, board_id, row, col):
-        """
-        Retorna el botón de la cuadrícula en las coordenadas (row, col).
-        Asume que todos los botones se encuentran en self.opponent_board_layout.
-        """
-        if self.opponent_board_layout:
-            item = self.opponent_board_layout.itemAtPosition(row, col)
-            if item:
-                return item.widget()
-        return None
+    def get_cell_state(self, row, col):
+        """Retorna el estado que muestra la celda (row, col) del tablero visible."""
+        return self.board_view.cell_state(row, col)
 
 # ----------------------------
 # Entrypoint
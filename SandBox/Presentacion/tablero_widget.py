@@ -0,0 +1,219 @@
+from PySide6.QtWidgets import QWidget, QSizePolicy, QAbstractScrollArea
+from PySide6.QtCore import Qt, Signal, QRect
+from PySide6.QtGui import QPainter, QColor, QPen, QFont
+
+
+class BoardWidget(QWidget):
+    """
+    Vista virtualizada del tablero: un solo widget que pinta en paintEvent únicamente las
+    celdas de la región visible. No guarda el estado de las celdas: lo pide a un
+    'proveedor' (row, col) -> None (agua) | 'ship' | 'hit' | 'miss' | 'win', así que un
+    tablero de 1000x1000 no crea ni recorre un objeto por celda.
+    Pensado para ir dentro de un QScrollArea: Ctrl + rueda hace zoom y la rueda desplaza.
+    Los clics se traducen a (row, col) y se emiten con cellClicked.
+    """
+
+    # (row, col) de la celda pulsada; solo se emite para celdas aún disparables (agua)
+    cellClicked = Signal(int, int)
+
+    # Estado -> (fondo, texto, color de texto, borde, grosor de borde)
+    # Mismos colores que usaban los botones del tablero
+    CELL_STYLES = {
+        None: ("#1a202c", "", "#e2e8f0", "#4a5568", 1),
+        'ship': ("#38a169", "B", "white", "#2d3748", 1),
+        'hit': ("#e53e3e", "O", "white", "#2d3748", 1),
+        'miss': ("#a0aec0", "X", "#1a202c", "#2d3748", 1),
+        'win': ("#6F00FF", "O", "white", "#fff", 2),
+    }
+    HOVER_COLOR = "#2d3748"
+    SPACING = 1
+    MIN_CELL = 4 # Tamaño mínimo de celda (px) al ajustar el tablero a la ventana
+    MAX_CELL = 80
+    ZOOM_STEP = 1.25
+    DETAIL_CELL = 10 # Por debajo de este tamaño no se dibujan bordes ni letras
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.board_size = 0
+        self.cell_provider = None
+        self.zoom_cell_size = None # None = ajustar al espacio disponible
+        self.hover_cell = None
+        self.setMouseTracking(True)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        # Colores/pinceles creados una sola vez (no se reinterpreta ninguna hoja de estilos)
+        self._styles = {state: (QColor(bg), text, QColor(fg), QPen(QColor(border), width))
+                        for state, (bg, text, fg, border, width) in self.CELL_STYLES.items()}
+        self._hover_brush = QColor(self.HOVER_COLOR)
+
+    # Modelo
+    def set_board_size(self, size):
+        """Prepara un tablero vacío de size x size (sin proveedor: todo agua)."""
+        self.board_size = size
+        self.cell_provider = None
+        self.hover_cell = None
+        self._update_geometry()
+        self.update()
+
+    def set_cell_provider(self, provider):
+        """Cambia la función que da el estado de cada celda y repinta la región visible."""
+        self.cell_provider = provider
+        self.update()
+
+    def reset(self):
+        """Muestra el tablero como agua (sin proveedor)."""
+        self.set_cell_provider(None)
+
+    def cell_state(self, row, col):
+        if self.cell_provider is None:
+            return None
+        return self.cell_provider(row, col)
+
+    def update_cell(self, row, col):
+        """Repinta solo la celda (row, col); sin coste si no está en la región visible."""
+        self.update(self.cell_rect(row, col))
+
+    # Geometría y zoom
+    def _cell_size(self):
+        if self.board_size == 0:
+            return 0
+        if self.zoom_cell_size:
+            return self.zoom_cell_size
+        return max(self.MIN_CELL, min(self.width(), self.height()) // self.board_size)
+
+    def _update_geometry(self):
+        """Tamaño mínimo del widget para que el QScrollArea pueda desplazarse si no cabe."""
+        side = (self.zoom_cell_size or self.MIN_CELL) * self.board_size
+        self.setMinimumSize(side, side)
+
+    def _origin(self):
+        """Esquina superior izquierda del tablero (centrado en el widget)."""
+        total = self._cell_size() * self.board_size
+        return max(0, (self.width() - total) // 2), max(0, (self.height() - total) // 2)
+
+    def cell_rect(self, row, col):
+        size = self._cell_size()
+        x0, y0 = self._origin()
+        return QRect(x0 + col * size, y0 + row * size, size, size)
+
+    def cell_at(self, x, y):
+        """Retorna (row, col) bajo el punto (x, y) o None si está fuera del tablero."""
+        size = self._cell_size()
+        if size == 0:
+            return None
+        x0, y0 = self._origin()
+        col, row = (x - x0) // size, (y - y0) // size
+        if 0 <= row < self.board_size and 0 <= col < self.board_size:
+            return int(row), int(col)
+        return None
+
+    def set_zoom(self, cell_size, anchor=None):
+        """
+        Fija el tamaño de celda en px (None = ajustar a la ventana). Si se da 'anchor'
+        (x, y en coordenadas del widget), la celda bajo ese punto se mantiene bajo el cursor.
+        """
+        old_size = self._cell_size()
+        old_origin = self._origin()
+        if cell_size is not None:
+            cell_size = max(self.MIN_CELL, min(self.MAX_CELL, int(cell_size)))
+        self.zoom_cell_size = cell_size
+        self._update_geometry()
+
+        area = self._scroll_area()
+        if area is not None and anchor is not None and old_size:
+            # Posición del ancla en unidades de celda antes del zoom
+            fx = (anchor[0] - old_origin[0]) / old_size
+            fy = (anchor[1] - old_origin[1]) / old_size
+            viewport_pos = self.mapTo(area.viewport(), self.rect().topLeft())
+            offset_x, offset_y = anchor[0] + viewport_pos.x(), anchor[1] + viewport_pos.y()
+            self.resize(max(self.minimumWidth(), area.viewport().width()),
+                        max(self.minimumHeight(), area.viewport().height()))
+            new_size = self._cell_size()
+            x0, y0 = self._origin()
+            area.horizontalScrollBar().setValue(int(x0 + fx * new_size - offset_x))
+            area.verticalScrollBar().setValue(int(y0 + fy * new_size - offset_y))
+        self.update()
+
+    def _scroll_area(self):
+        parent = self.parent()
+        while parent is not None and not isinstance(parent, QAbstractScrollArea):
+            parent = parent.parent()
+        return parent
+
+    # Eventos Qt
+    def paintEvent(self, event):
+        if self.board_size == 0:
+            return
+        painter = QPainter(self)
+        size = self._cell_size()
+        x0, y0 = self._origin()
+        detail = size >= self.DETAIL_CELL
+        if detail:
+            font = QFont("Arial")
+            font.setBold(True)
+            font.setPixelSize(max(6, int(size * 0.5)))
+            painter.setFont(font)
+
+        # Pintar solo las celdas dentro de la región expuesta (la parte visible del tablero)
+        area = event.rect()
+        col_min = max(0, (area.left() - x0) // size)
+        col_max = min(self.board_size - 1, (area.right() - x0) // size)
+        row_min = max(0, (area.top() - y0) // size)
+        row_max = min(self.board_size - 1, (area.bottom() - y0) // size)
+
+        provider = self.cell_provider
+        styles = self._styles
+        inset = self.SPACING if detail else 0
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                state = provider(row, col) if provider is not None else None
+                bg, text, fg, pen = styles.get(state, styles[None])
+                rect = QRect(x0 + col * size, y0 + row * size, size - inset, size - inset)
+                if state is None and self.hover_cell == (row, col):
+                    bg = self._hover_brush
+                painter.fillRect(rect, bg)
+                if detail:
+                    painter.setPen(pen)
+                    painter.drawRect(rect.adjusted(0, 0, -1, -1))
+                    if text:
+                        painter.setPen(fg)
+                        painter.drawText(rect, Qt.AlignCenter, text)
+        painter.end()
+
+    def wheelEvent(self, event):
+        if not event.modifiers() & Qt.ControlModifier:
+            event.ignore() # La rueda sin Ctrl desplaza el QScrollArea
+            return
+        factor = self.ZOOM_STEP if event.angleDelta().y() > 0 else 1 / self.ZOOM_STEP
+        anchor = (int(event.position().x()), int(event.position().y()))
+        current = self._cell_size()
+        new_size = round(current * factor)
+        if new_size == current:
+            new_size = current + (1 if factor > 1 else -1)
+        self.set_zoom(new_size, anchor)
+        event.accept()
+
+    def mouseDoubleClickEvent(self, event):
+        # Doble clic con Ctrl: volver a ajustar el tablero a la ventana
+        if event.modifiers() & Qt.ControlModifier:
+            self.set_zoom(None)
+
+    def mouseMoveEvent(self, event):
+        cell = self.cell_at(int(event.position().x()), int(event.position().y()))
+        if cell != self.hover_cell:
+            previous, self.hover_cell = self.hover_cell, cell
+            for c in (previous, cell):
+                if c is not None:
+                    self.update_cell(*c)
+
+    def leaveEvent(self, event):
+        if self.hover_cell is not None:
+            previous, self.hover_cell = self.hover_cell, None
+            self.update_cell(*previous)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return
+        cell = self.cell_at(int(event.position().x()), int(event.position().y()))
+        # Igual que los antiguos botones deshabilitados: solo las celdas de agua son clicables
+        if cell is not None and self.cell_state(*cell) is None:
+            self.cellClicked.emit(*cell)
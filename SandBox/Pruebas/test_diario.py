@@ -0,0 +1,101 @@
+# Pruebas/test_diario.py
+"""
+Diario de jugadas de la IA (AiState.start_journal / undo_to) y de Tablero
+(aplicar_disparo / deshacer_hasta): jugar disparos al azar y deshacerlos debe dejar
+tablero e IA idénticos byte a byte. Se ejecuta desde SandBox con
+    python -m unittest discover -s Pruebas
+"""
+import random
+import unittest
+from Controlador.controlador import WarShipController
+from Controlador.instantanea import escribir_ia, escribir_tablero
+
+
+def foto(tablero, ai_state):
+    """Estado completo de tablero e IA: instantánea binaria más el orden de los pools."""
+    datos = bytearray()
+    escribir_tablero(datos, tablero)
+    escribir_ia(datos, ai_state)
+    pools = [bytes(pool.positions) for pool in ai_state.ai_hunt_pools] if ai_state.ai_hunt_pools else None
+    return bytes(datos), pools
+
+
+def clasificar(tablero, row, col, impacto):
+    if impacto is None:
+        return "repeat"
+    if not impacto:
+        return "miss"
+    if tablero.is_game_over():
+        return "win"
+    return "sunk" if tablero.barco_hundido_en(row, col) else "hit"
+
+
+class PruebaDiario(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = WarShipController(10)
+        self.rng = random.Random(3)
+        self.comprobaciones = 0
+
+    def explorar(self, tablero, ai_state, profundidad):
+        """Aplica disparos en árbol hasta 'profundidad' y comprueba cada deshacer."""
+        if profundidad == 0:
+            return
+        n = ai_state.board_size
+        for _ in range(3):
+            libres = [i for i in range(n * n) if not tablero.is_played_at(*divmod(i, n))]
+            if not libres:
+                return
+            antes = foto(tablero, ai_state)
+            marca_tablero, marca_ia = tablero.jugadas_diario, ai_state.journal_mark()
+            # A veces el objetivo que elegiría la IA (cola), a veces una celda cualquiera
+            if ai_state.ai_targets and self.rng.random() < 0.5:
+                row, col = ai_state.pop_target()
+            else:
+                row, col = divmod(self.rng.choice(libres), n)
+            impacto = tablero.aplicar_disparo(row, col, descontar_intento=True)
+            self.controller.ai_record_result_for(ai_state, row, col, clasificar(tablero, row, col, impacto))
+            self.explorar(tablero, ai_state, profundidad - 1)
+            tablero.deshacer_hasta(marca_tablero)
+            ai_state.undo_to(marca_ia)
+            self.assertEqual(foto(tablero, ai_state), antes)
+            self.comprobaciones += 1
+
+    def test_deshacer_deja_el_estado_identico(self):
+        for seed in range(12):
+            session = self.controller.new_session('mm', seed=seed)
+            while session.current_turn:
+                if session.current_turn == 'A':
+                    ai_state, tablero = session.ai_A, session.tablero2
+                else:
+                    ai_state, tablero = session.ai_B, session.tablero1
+                if self.rng.random() < 0.3:
+                    ai_state.start_journal()
+                    self.explorar(tablero, ai_state, 3)
+                    ai_state.stop_journal()
+                self.controller.play_machine_turn(session)
+        self.assertGreater(self.comprobaciones, 1000)
+
+    def test_mover_al_frente_y_vaciar_se_deshacen(self):
+        ai_state = WarShipController.AiState(10)
+        for cell in (5, 17, 42, 63):
+            ai_state.push_target(*divmod(cell, 10))
+        ai_state.start_journal()
+        marca = ai_state.journal_mark()
+        ai_state.push_target_front(4, 2)
+        ai_state.push_target_front(9, 9)
+        self.assertEqual(list(ai_state.ai_targets), [(9, 9), (4, 2), (0, 5), (1, 7), (6, 3)])
+        ai_state.clear_targets()
+        self.assertEqual(len(ai_state.ai_targets), 0)
+        self.assertFalse(any(ai_state.ai_queued_map))
+        ai_state.undo_to(marca)
+        self.assertEqual(list(ai_state.ai_targets), [(0, 5), (1, 7), (4, 2), (6, 3)])
+        self.assertEqual([i for i, v in enumerate(ai_state.ai_queued_map) if v], [5, 17, 42, 63])
+
+    def test_diario_no_disponible_con_densidad(self):
+        with self.assertRaises(ValueError):
+            WarShipController.AiState(10, hunt_strategy='density').start_journal()
+
+
+if __name__ == '__main__':
+    unittest.main()
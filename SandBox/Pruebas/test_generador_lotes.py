@@ -0,0 +1,39 @@
+# Pruebas/test_generador_lotes.py
+"""Flotas por lotes (Entidad.generador_lotes) frente a TableroDatos.generar_barcos."""
+import random
+import unittest
+from Entidad.entidad import Tablero
+from Entidad.tablero_datos import FLOTA_ESTANDAR
+from Entidad.generador_lotes import np, generar_flotas, tablero_desde_lote
+
+
+@unittest.skipIf(np is None, "La generación por lotes requiere NumPy.")
+class PruebaGeneradorLotes(unittest.TestCase):
+
+    def test_misma_ocupacion_por_celda_que_tablero_datos(self):
+        # Homogeneidad por celda: z de la diferencia de proporciones entre ambos
+        # generadores, sumando z**2 sobre las 100 celdas (~ chi-cuadrado con 100 grados
+        # de libertad si las distribuciones coinciden; 160 queda por encima del
+        # percentil 99.99). Colocar la flota en otro orden ya da más de 800.
+        n = 5000
+        rng = random.Random(0)
+        ocupadas_datos = np.zeros(100)
+        for _ in range(n):
+            ocupadas_datos += np.frombuffer(bytes(Tablero(10, rng=rng).celdas), dtype=np.uint8) & 1
+        ocupadas_lote = (generar_flotas(n, 10, rng=0).reshape(n, 100) & 1).sum(axis=0)
+
+        conjunta = (ocupadas_datos + ocupadas_lote) / (2 * n)
+        z = (ocupadas_datos - ocupadas_lote) / n / np.sqrt(conjunta * (1 - conjunta) * 2 / n)
+        self.assertLess(float((z * z).sum()), 160)
+        self.assertAlmostEqual(float(ocupadas_lote.sum()) / n, 20)
+
+    def test_flotas_reproducibles_y_validas(self):
+        lote = generar_flotas(50, 8, columnas=12, rng=5)
+        self.assertTrue(np.array_equal(lote, generar_flotas(50, 8, columnas=12, rng=5)))
+        for i in range(len(lote)):
+            # Barcos que se tocaran se identificarían como uno solo más grande
+            self.assertEqual(tablero_desde_lote(lote, i).flota, FLOTA_ESTANDAR)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# Pruebas/test_instantanea.py
+"""Instantáneas de partida (Controlador.instantanea): ida y vuelta, y cabecera."""
+import unittest
+from Controlador.controlador import WarShipController
+from Controlador.instantanea import CABECERA, guardar_sesion, restaurar_sesion
+
+
+def jugar_hasta_el_final(controller, session):
+    """Jugadas (row, col, result) de la máquina hasta que la partida termina."""
+    jugadas = []
+    while session.current_turn:
+        jugadas.append(controller.play_machine_turn(session)[:3])
+    return jugadas
+
+
+class PruebaInstantanea(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = WarShipController(10)
+
+    def test_restaurar_sigue_jugando_igual(self):
+        configs = ({'hunt_strategy': 'parity'}, {'hunt_strategy': 'density'},
+                   {'hunt_strategy': 'montecarlo', 'time_budget': None})
+        for config in configs:
+            for seed in (1, 2):
+                session = self.controller.new_session('mm', seed=seed, config_A=config, config_B=config)
+                for _ in range(25):
+                    self.controller.play_machine_turn(session)
+                datos = guardar_sesion(session)
+                self.assertTrue(datos.startswith(CABECERA))
+                copia = restaurar_sesion(datos)
+                # La copia se vuelve a guardar igual, byte a byte
+                self.assertEqual(guardar_sesion(copia), datos)
+                self.assertEqual(jugar_hasta_el_final(self.controller, copia),
+                                 jugar_hasta_el_final(self.controller, session), (config, seed))
+                self.assertEqual(copia.last_hit_win[1:], session.last_hit_win[1:])
+                self.assertIs(copia.last_hit_win[0], copia.tablero1 if session.last_hit_win[0] is session.tablero1
+                              else copia.tablero2)
+
+    def test_rechaza_cabecera_o_version_desconocida(self):
+        datos = guardar_sesion(self.controller.new_session('mm', seed=3))
+        for indice in (0, len(CABECERA) - 1):
+            alterados = bytearray(datos)
+            alterados[indice] ^= 0xFF
+            with self.assertRaises(ValueError):
+                restaurar_sesion(bytes(alterados))
+        with self.assertRaises(ValueError):
+            restaurar_sesion(b'')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+# Pruebas/test_instrumentacion.py
+"""Percentil por rango más cercano (Entidad.instrumentacion.percentil)."""
+import unittest
+from Entidad.instrumentacion import percentil
+
+
+class PruebaPercentil(unittest.TestCase):
+
+    def test_cinco_valores(self):
+        datos = [1, 2, 3, 4, 5]
+        esperados = {0: 1, 10: 1, 20: 1, 21: 2, 40: 2, 50: 3, 60: 3, 75: 4, 80: 4, 90: 5, 99: 5, 100: 5}
+        for p, valor in esperados.items():
+            self.assertEqual(percentil(datos, p), valor, p)
+
+    def test_diez_valores(self):
+        datos = [10 * i for i in range(1, 11)]
+        esperados = {0: 10, 5: 10, 10: 10, 11: 20, 25: 30, 50: 50, 51: 60, 75: 80, 90: 90, 95: 100, 99: 100, 100: 100}
+        for p, valor in esperados.items():
+            self.assertEqual(percentil(datos, p), valor, p)
+
+    def test_cien_valores(self):
+        # Con 100 valores 1..100 el percentil p entero es exactamente p
+        datos = list(range(1, 101))
+        for p in range(1, 101):
+            self.assertEqual(percentil(datos, p), p)
+        self.assertEqual(percentil(datos, 0), 1)
+        self.assertEqual(percentil(datos, 99.5), 100)
+
+    def test_vacia(self):
+        self.assertIsNone(percentil([], 50))
+
+
+if __name__ == '__main__':
+    unittest.main()
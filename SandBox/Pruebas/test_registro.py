@@ -0,0 +1,60 @@
+# Pruebas/test_registro.py
+"""Archivos de partidas (Controlador.registro): grabar, leer con mmap y reproducir."""
+import os
+import tempfile
+import unittest
+from Controlador.registro import CABECERA, LectorPartidas
+from Controlador.simulacion import SimuladorMM
+
+
+def clasificar(tablero, row, col):
+    """Resultado de disparar en (row, col), como lo anota process_shot_on."""
+    impacto = tablero.register_shot(row, col)
+    if not impacto:
+        return 'miss' if impacto is not None else 'repeat'
+    if tablero.is_game_over():
+        return 'win'
+    return 'sunk' if tablero.barco_hundido_en(row, col) else 'hit'
+
+
+class PruebaRegistro(unittest.TestCase):
+
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        self.ruta = os.path.join(carpeta.name, 'partidas.bsgr')
+
+    def test_grabar_leer_y_reproducir(self):
+        simulador = SimuladorMM(board_size=10, procesos=1)
+        resultado = simulador.ejecutar(6, semilla=11, registro=self.ruta)
+        with LectorPartidas(self.ruta) as lector:
+            self.assertEqual(lector.contar(), 6)
+            registros = list(lector)
+            for i, (registro, (disparos_A, disparos_B, _)) in enumerate(zip(registros, resultado['partidas'])):
+                self.assertEqual((registro.modo, registro.board_size), ('mm', 10))
+                self.assertEqual(registro.semilla, SimuladorMM.semilla_partida(11, i))
+                self.assertEqual(registro.n_disparos, disparos_A + disparos_B)
+                # Reproducir los disparos sobre las flotas guardadas da los mismos resultados
+                tableros = (registro.tablero(0), registro.tablero(1))
+                disparos = list(registro.disparos())
+                for indice, row, col, result in disparos:
+                    self.assertEqual(clasificar(tableros[indice], row, col), result)
+                self.assertEqual(disparos[-1][3], 'win')
+
+        # La misma semilla maestra graba exactamente el mismo archivo
+        with open(self.ruta, 'rb') as archivo:
+            primero = archivo.read()
+        simulador.ejecutar(6, semilla=11, registro=self.ruta)
+        with open(self.ruta, 'rb') as archivo:
+            self.assertEqual(archivo.read(), primero)
+
+    def test_rechaza_cabecera_o_version_desconocida(self):
+        for cabecera in (b'XSGR' + CABECERA[4:], CABECERA[:4] + bytes((CABECERA[4] + 1,)), b''):
+            with open(self.ruta, 'wb') as archivo:
+                archivo.write(cabecera)
+            with self.assertRaises(ValueError):
+                LectorPartidas(self.ruta)
+
+
+if __name__ == '__main__':
+    unittest.main()
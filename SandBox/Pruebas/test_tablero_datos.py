@@ -0,0 +1,74 @@
+# Pruebas/test_tablero_datos.py
+"""Colocación de flotas: TableroDatos.generar_barcos y resolver_flota."""
+import random
+import unittest
+from Entidad.entidad import Tablero
+from Entidad.tablero_datos import FLOTA_ESTANDAR, IndiceColocaciones, resolver_flota
+
+
+def tablero_con(filas, columnas, colocaciones):
+    """Tablero de filas x columnas con exactamente los barcos (tam, orient, pid) de resolver_flota."""
+    tablero = Tablero(filas, rng=0, flota=(1,), columnas=columnas)
+    tablero.celdas = bytearray(filas * columnas)
+    tablero.reiniciar_barcos()
+    for tam, orient, pid in colocaciones:
+        tablero.agregar_barco(IndiceColocaciones.para(filas, columnas, tam).huella(orient, pid))
+    tablero.total_parts = sum(tam for tam, _, _ in colocaciones)
+    return tablero
+
+
+class PruebaColocacion(unittest.TestCase):
+
+    def assertFlotaValida(self, tablero, flota):
+        """Barcos rectos de los tamaños de 'flota' que no se tocan, ni en diagonal."""
+        filas, columnas = tablero.filas, tablero.columnas
+        celdas_de = {}
+        for celda, barco_id in enumerate(tablero.barco_de):
+            self.assertEqual(bool(barco_id), tablero.is_ship_at(*divmod(celda, columnas)))
+            if not barco_id:
+                continue
+            celdas_de.setdefault(barco_id, []).append(divmod(celda, columnas))
+            r, c = divmod(celda, columnas)
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    if 0 <= r + dr < filas and 0 <= c + dc < columnas:
+                        self.assertIn(tablero.barco_de[(r + dr) * columnas + c + dc], (0, barco_id))
+        self.assertEqual(sorted(len(celdas) for celdas in celdas_de.values()), sorted(flota))
+        for celdas in celdas_de.values():
+            filas_barco = {r for r, _ in celdas}
+            columnas_barco = {c for _, c in celdas}
+            self.assertTrue(len(filas_barco) == 1 or len(columnas_barco) == 1)
+            self.assertEqual(len(filas_barco) * len(columnas_barco), len(celdas))
+        self.assertEqual(tablero.total_parts, sum(flota))
+
+    def test_flota_estandar_en_7x7(self):
+        for seed in range(5):
+            colocaciones = resolver_flota(7, 7, FLOTA_ESTANDAR, random.Random(seed))
+            self.assertIsNotNone(colocaciones)
+            self.assertFlotaValida(tablero_con(7, 7, colocaciones), FLOTA_ESTANDAR)
+            self.assertFlotaValida(Tablero(7, rng=seed), FLOTA_ESTANDAR)
+
+    def test_flota_estandar_no_cabe_en_6x6_ni_5x5(self):
+        for size in (6, 5):
+            self.assertIsNone(resolver_flota(size, size, FLOTA_ESTANDAR, random.Random(0)))
+            with self.assertRaises(ValueError):
+                Tablero(size, rng=0)
+
+    def test_misma_semilla_misma_colocacion(self):
+        for size in (7, 10):
+            self.assertEqual(Tablero(size, rng=42).celdas, Tablero(size, rng=42).celdas)
+        self.assertEqual(resolver_flota(7, 7, FLOTA_ESTANDAR, random.Random(9)),
+                         resolver_flota(7, 7, FLOTA_ESTANDAR, random.Random(9)))
+
+    def test_tablero_rectangular(self):
+        for filas, columnas in ((5, 12), (12, 5), (6, 9)):
+            colocaciones = resolver_flota(filas, columnas, FLOTA_ESTANDAR, random.Random(1))
+            self.assertIsNotNone(colocaciones, (filas, columnas))
+            self.assertFlotaValida(tablero_con(filas, columnas, colocaciones), FLOTA_ESTANDAR)
+            self.assertFlotaValida(Tablero(filas, rng=1, columnas=columnas), FLOTA_ESTANDAR)
+        # Un barco más largo que ambos lados no cabe en ninguna orientación
+        self.assertIsNone(resolver_flota(3, 4, (5,)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+# Rendimiento/benchmark.py
+"""
+Suite de benchmarks reproducible (con semilla) de los caminos calientes del juego.
+
+Uso (desde SandBox/):
+    python -m Rendimiento.benchmark --tamanos 10 50 200 --salida benchmark.json
+
+Para cada tamaño de tablero mide:
+  - TableroDatos.generar_barcos
+  - Tablero.__init__
+  - WarShipController.process_shot_on
+  - WarShipController.ai_make_move_on (modo caza y modo objetivo, por estrategia)
+  - partidas 'mm' completas
+y guarda ops/seg, percentiles de latencia y memoria pico en un JSON.
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+from Entidad.entidad import Tablero
+from Entidad.tablero_datos import TableroDatos
+from Entidad.instrumentacion import percentil
+from Controlador.controlador import WarShipController
+from Controlador.simulacion import SimuladorMM
+
+TAMANOS_POR_DEFECTO = (10, 25, 50, 100, 200)
+# La IA Monte Carlo hace un número fijo de barridos por jugada (sin reloj, así que la
+# medida no depende del presupuesto): una partida de 25x25 tarda unos 2 s, una de 50x50
+# unos 10 s, y crece más deprisa que el número de celdas
+TAMANO_MAX_MONTECARLO = 25
+
+
+def _resumen(latencias_ns, memoria_pico=None):
+    """Resume una lista de latencias (ns) en ops/seg y percentiles (µs)."""
+    ordenadas = sorted(latencias_ns)
+    total = sum(ordenadas)
+    resumen = {
+        'n': len(ordenadas),
+        'ops_por_seg': len(ordenadas) / (total / 1e9) if total else None,
+        'media_us': total / len(ordenadas) / 1e3 if ordenadas else None,
+    }
+    for p in (50, 90, 99):
+        valor = percentil(ordenadas, p)
+        resumen[f'p{p}_us'] = valor / 1e3 if valor is not None else None
+    resumen['max_us'] = ordenadas[-1] / 1e3 if ordenadas else None
+    resumen['memoria_pico_bytes'] = memoria_pico
+    return resumen
+
+
+def _memoria_pico(funcion):
+    """Ejecuta 'funcion' una vez bajo tracemalloc y retorna la memoria pico en bytes."""
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+# Benchmarks individuales: cada uno retorna una lista de latencias en ns
+
+def bench_generar_barcos(size, repeticiones):
+    tablero = Tablero(size)
+    latencias = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter_ns()
+        TableroDatos.generar_barcos(tablero)
+        latencias.append(time.perf_counter_ns() - inicio)
+    return latencias
+
+
+def bench_tablero_init(size, repeticiones):
+    latencias = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter_ns()
+        Tablero(size)
+        latencias.append(time.perf_counter_ns() - inicio)
+    return latencias
+
+
+def bench_process_shot_on(size, repeticiones):
+    """Dispara a todas las celdas (en orden aleatorio) de 'repeticiones' tableros."""
+    controller = WarShipController(board_size=size)
+    controller.mode = 'mm' # En 'mm' los fallos no descuentan intentos
+    celdas = [(r, c) for r in range(size) for c in range(size)]
+    latencias = []
+    for _ in range(repeticiones):
+        tablero = Tablero(size)
+        random.shuffle(celdas)
+        for row, col in celdas:
+            inicio = time.perf_counter_ns()
+            controller.process_shot_on(tablero, row, col)
+            latencias.append(time.perf_counter_ns() - inicio)
+    return latencias
+
+
+def bench_ai_make_move_on(size, repeticiones, hunt_strategy):
+    """
+    Juega 'repeticiones' tableros completos con una IA y separa las latencias
+    según el modo en que estaba la IA antes de cada jugada.
+    Retorna (latencias_caza, latencias_objetivo).
+    """
+    controller = WarShipController(board_size=size)
+    controller.mode = 'mm'
+    caza, objetivo = [], []
+    for _ in range(repeticiones):
+        tablero = Tablero(size)
+        ai_state = WarShipController.AiState(size, hunt_strategy=hunt_strategy, fleet=tablero.flota,
+                                             time_budget=None)
+        while not tablero.is_game_over():
+            modo = objetivo if ai_state.ai_targets else caza
+            inicio = time.perf_counter_ns()
+            row, col, result, message = controller.ai_make_move_on(tablero, ai_state)
+            modo.append(time.perf_counter_ns() - inicio)
+            if row is None:
+                break
+    return caza, objetivo
+
+
+def bench_partida_mm(size, repeticiones):
+    controller = WarShipController(board_size=size)
+    latencias = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter_ns()
+        SimuladorMM.jugar_partida(controller)
+        latencias.append(time.perf_counter_ns() - inicio)
+    return latencias
+
+
+def _repeticiones(size, base):
+    """Menos repeticiones en tableros grandes para que la suite termine en un tiempo razonable."""
+    return max(1, base * 100 // (size * size))
+
+
+def ejecutar_suite(tamanos=TAMANOS_POR_DEFECTO, semilla=12345, base=2000, medir_memoria=True):
+    """Ejecuta todos los benchmarks y retorna un diccionario serializable a JSON."""
+    resultados = {
+        'semilla': semilla,
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'tamanos': {},
+    }
+
+    for size in tamanos:
+        por_tamano = {}
+        # Cada benchmark se siembra por separado para que sea reproducible por sí solo
+        casos = [
+            ('generar_barcos', lambda n: bench_generar_barcos(size, n), _repeticiones(size, base * 10)),
+            ('tablero_init', lambda n: bench_tablero_init(size, n), _repeticiones(size, base * 10)),
+            ('process_shot_on', lambda n: bench_process_shot_on(size, n), _repeticiones(size, base // 10)),
+            ('partida_mm', lambda n: bench_partida_mm(size, n), _repeticiones(size, base // 10)),
+        ]
+        for nombre, funcion, repeticiones in casos:
+            random.seed(semilla)
+            latencias = funcion(repeticiones)
+            memoria = None
+            if medir_memoria:
+                random.seed(semilla)
+                memoria = _memoria_pico(lambda: funcion(1))
+            por_tamano[nombre] = _resumen(latencias, memoria)
+
+        for estrategia in WarShipController.HUNT_STRATEGIES:
+            if estrategia == 'montecarlo' and size > TAMANO_MAX_MONTECARLO:
+                continue
+            repeticiones = _repeticiones(size, base // 10)
+            random.seed(semilla)
+            caza, objetivo = bench_ai_make_move_on(size, repeticiones, estrategia)
+            memoria = None
+            if medir_memoria:
+                random.seed(semilla)
+                memoria = _memoria_pico(lambda: bench_ai_make_move_on(size, 1, estrategia))
+            por_tamano[f'ai_make_move_on_caza_{estrategia}'] = _resumen(caza, memoria)
+            por_tamano[f'ai_make_move_on_objetivo_{estrategia}'] = _resumen(objetivo, memoria)
+
+        resultados['tamanos'][str(size)] = por_tamano
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de BattleShip (generación, disparos, IA y partidas).")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=list(TAMANOS_POR_DEFECTO),
+                        help="Tamaños de tablero a medir (10 a 200).")
+    parser.add_argument('--semilla', type=int, default=12345)
+    parser.add_argument('--base', type=int, default=2000,
+                        help="Repeticiones de referencia para un tablero 10x10 (se escalan con el tamaño).")
+    parser.add_argument('--sin-memoria', action='store_true', help="No medir memoria pico (más rápido).")
+    parser.add_argument('--salida', default='benchmark_resultados.json', help="Archivo JSON de salida.")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar_suite(args.tamanos, args.semilla, args.base, not args.sin_memoria)
+    with open(args.salida, 'w', encoding='utf-8') as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+    for size, casos in resultados['tamanos'].items():
+        print(f"Tablero {size}x{size}")
+        for nombre, r in casos.items():
+            if r['n']:
+                print(f"  {nombre:<36} {r['ops_por_seg']:>12.1f} ops/s  p50={r['p50_us']:.1f}µs  p99={r['p99_us']:.1f}µs")
+    print(f"Resultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
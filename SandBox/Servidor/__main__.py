@@ -0,0 +1,4 @@
+# Permite arrancar el servidor con: python -m Servidor ...
+from Servidor.servidor import main
+
+main()
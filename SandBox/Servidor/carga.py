@@ -0,0 +1,174 @@
+# Servidor/carga.py
+"""
+Generador de carga local para Servidor.servidor: juega muchas partidas a la vez
+repartidas en varias conexiones (las peticiones de una conexión se envían sin esperar
+a las anteriores y se emparejan por 'id') y mide la latencia de cada jugada.
+
+Uso (desde SandBox/):
+    python -m Servidor.carga --partidas 2000 --conexiones 50 --modo mm
+    python -m Servidor.carga --puerto 8765 --partidas 500 --modo hv   # contra un servidor ya arrancado
+
+Sin --puerto ni --unix arranca su propio servidor en 127.0.0.1 (puerto libre) dentro
+del mismo proceso, así que todo se prueba en localhost sin preparar nada.
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+import itertools
+from Servidor.servidor import ServidorJuego, SalidaAgrupada
+from Entidad.instrumentacion import percentil
+
+
+class ClienteJuego:
+    """Conexión al servidor que admite muchas peticiones en vuelo a la vez."""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._salida = SalidaAgrupada(writer)
+        self._ids = itertools.count(1)
+        self._esperando = {}
+        self._lector = asyncio.create_task(self._leer())
+
+    @classmethod
+    async def conectar(cls, host='127.0.0.1', puerto=8765, unix=None):
+        if unix:
+            reader, writer = await asyncio.open_unix_connection(unix)
+        else:
+            reader, writer = await asyncio.open_connection(host, puerto)
+        return cls(reader, writer)
+
+    async def _leer(self):
+        try:
+            while True:
+                linea = await self._reader.readline()
+                if not linea:
+                    break
+                respuesta = json.loads(linea)
+                futuro = self._esperando.pop(respuesta.get('id'), None)
+                if futuro is not None and not futuro.done():
+                    futuro.set_result(respuesta)
+        finally:
+            for futuro in self._esperando.values():
+                if not futuro.done():
+                    futuro.set_exception(ConnectionError("El servidor cerró la conexión."))
+
+    async def pedir(self, op, **datos):
+        """Envía la petición y espera su respuesta (un dict)."""
+        datos['op'] = op
+        datos['id'] = next(self._ids)
+        futuro = asyncio.get_running_loop().create_future()
+        self._esperando[datos['id']] = futuro
+        self._salida.escribir(json.dumps(datos).encode() + b'\n')
+        return await futuro
+
+    async def cerrar(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        await self._lector
+
+
+async def jugar_partida(cliente, modo, rng, latencias):
+    """
+    Juega una partida completa ('mm': solo jugadas de la máquina; 'solo' / 'hv' / 'hvh':
+    disparos humanos al azar entre las celdas sin disparar) y añade a 'latencias' los
+    segundos de cada jugada. Retorna el ganador.
+    """
+    respuesta = await cliente.pedir('nueva', modo=modo, semilla=rng.getrandbits(32))
+    if not respuesta['ok']:
+        raise RuntimeError(respuesta['error'])
+    sesion, n, turno = respuesta['sesion'], respuesta['tamano'], respuesta['turno']
+    # Celdas aún sin disparar por cada tirador humano (en 'hvh', P1 y P2 atacan tableros distintos)
+    libres = {}
+    reloj = time.perf_counter
+    while turno is not None:
+        inicio = reloj()
+        if turno in ('A', 'B', 'machine'):
+            respuesta = await cliente.pedir('maquina', sesion=sesion)
+        else:
+            celdas = libres.setdefault(turno, rng.sample(range(n * n), n * n))
+            if not celdas:
+                break
+            fila, columna = divmod(celdas.pop(), n)
+            respuesta = await cliente.pedir('disparo', sesion=sesion, fila=fila, columna=columna)
+        latencias.append(reloj() - inicio)
+        if not respuesta['ok']:
+            raise RuntimeError(respuesta['error'])
+        turno = respuesta['turno']
+    await cliente.pedir('cerrar', sesion=sesion)
+    return respuesta['ganador']
+
+
+async def generar_carga(partidas, conexiones, modo, semilla=None, host='127.0.0.1', puerto=None, unix=None,
+                        board_size=10, hilos=4):
+    """
+    Juega 'partidas' partidas a la vez repartidas en 'conexiones' conexiones y retorna
+    un resumen con partidas/seg y percentiles de latencia por jugada (µs).
+    """
+    servidor = None
+    if puerto is None and unix is None:
+        servidor = ServidorJuego(board_size, hilos=hilos)
+        host, puerto = (await servidor.iniciar(host, 0))[:2]
+    rng = random.Random(semilla)
+    clientes = [await ClienteJuego.conectar(host, puerto, unix) for _ in range(conexiones)]
+    latencias = []
+    try:
+        inicio = time.perf_counter()
+        ganadores = await asyncio.gather(*(
+            jugar_partida(clientes[i % conexiones], modo, random.Random(rng.getrandbits(64)), latencias)
+            for i in range(partidas)))
+        segundos = time.perf_counter() - inicio
+    finally:
+        for cliente in clientes:
+            await cliente.cerrar()
+        if servidor is not None:
+            await servidor.detener()
+
+    ordenadas = sorted(latencias)
+    resumen = {
+        'partidas': partidas,
+        'conexiones': conexiones,
+        'modo': modo,
+        'segundos': segundos,
+        'partidas_por_segundo': partidas / segundos if segundos > 0 else 0.0,
+        'jugadas': len(ordenadas),
+        'jugadas_por_segundo': len(ordenadas) / segundos if segundos > 0 else 0.0,
+        'victorias': {},
+    }
+    for p in (50, 99):
+        valor = percentil(ordenadas, p)
+        resumen[f'p{p}_us'] = valor * 1e6 if valor is not None else None
+    resumen['max_us'] = ordenadas[-1] * 1e6 if ordenadas else None
+    for ganador in ganadores:
+        resumen['victorias'][ganador] = resumen['victorias'].get(ganador, 0) + 1
+    return resumen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m Servidor.carga",
+                                     description="Generador de carga para el servidor de BattleShip.")
+    parser.add_argument('--partidas', type=int, default=1000, help="Partidas simultáneas a jugar.")
+    parser.add_argument('--conexiones', type=int, default=50)
+    parser.add_argument('--modo', default='mm', choices=('solo', 'hv', 'hvh', 'mm'))
+    parser.add_argument('--semilla', type=int, default=None)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=None,
+                        help="Puerto de un servidor ya arrancado (por defecto se arranca uno propio).")
+    parser.add_argument('--unix', default=None, help="Socket Unix de un servidor ya arrancado.")
+    parser.add_argument('--tamano', type=int, default=10, help="Tamaño de tablero del servidor propio.")
+    parser.add_argument('--hilos', type=int, default=4, help="Hilos de IA del servidor propio.")
+    args = parser.parse_args(argv)
+
+    r = asyncio.run(generar_carga(args.partidas, args.conexiones, args.modo, args.semilla, args.host,
+                                  args.puerto, args.unix, args.tamano, args.hilos))
+    victorias = ", ".join(f"{ganador}: {n}" for ganador, n in sorted(r['victorias'].items(), key=str))
+    print(f"{r['partidas']} partidas '{r['modo']}' en {r['conexiones']} conexiones: {r['segundos']:.2f} s "
+          f"({r['partidas_por_segundo']:.0f} partidas/s, {r['jugadas_por_segundo']:.0f} jugadas/s)")
+    print(f"Latencia por jugada: p50={r['p50_us']:.0f}µs  p99={r['p99_us']:.0f}µs  max={r['max_us']:.0f}µs")
+    print(f"Ganadores: {victorias}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+# Servidor/servidor.py
+"""
+Servidor asyncio que expone la lógica de WarShipController ('solo', 'hv', 'hvh', 'mm')
+por un socket local (TCP o Unix), con muchas partidas a la vez en un solo proceso:
+cada partida es una GameSession de un SessionRegistry compartido.
+
+Protocolo: una petición JSON por línea y una respuesta JSON por línea. Las peticiones
+de una misma conexión se atienden en paralelo; la respuesta repite el 'id' de la
+petición (si lo trae) para poder emparejarlas. Operaciones ('op'):
+  - {"op": "nueva", "modo": "hv", "semilla": 7, "config_A": {...}, "config_B": {...}}
+        -> {"ok": true, "sesion": 1, "modo": "hv", "tamano": 10, "turno": "human"}
+        config_A / config_B (máquinas de 'mm'): solo "use_parity" (bool), "hunt_strategy"
+        ('parity', 'density', 'montecarlo') y "time_budget" (tope en segundos por jugada, hasta
+        MAX_TIME_BUDGET, que es también el tope si no se indica)
+  - {"op": "disparo", "sesion": 1, "fila": 3, "columna": 4}
+        -> {"ok": true, "resultado": "hit", "mensaje": ..., "turno": ..., "ganador": ...}
+        En 'hv' la máquina responde en la misma petición: "respuesta": {fila, columna, resultado, mensaje}
+  - {"op": "maquina", "sesion": 1}   jugada de la máquina a la que le toca ('hv' / 'mm')
+        -> {"ok": true, "fila": .., "columna": .., "resultado": .., "mensaje": .., "turno": .., "ganador": ..}
+  - {"op": "estado", "sesion": 1}    turno, ganador y disparos visibles de cada tablero
+        ('.' sin disparar, 'o' agua, 'x' impacto; una cadena por fila)
+  - {"op": "cerrar", "sesion": 1}
+  - {"op": "ping"}
+Los errores se responden con {"ok": false, "error": "..."}; toda petición recibe
+respuesta, también si falla algo inesperado (que además queda en el log).
+
+Las jugadas de la IA y la creación de partidas (generar tableros) se ejecutan en un
+ThreadPoolExecutor, así que nunca bloquean el bucle de eventos; el registro solo se
+toca desde el hilo del bucle, y una sesión no admite dos peticiones a la vez. Con miles
+de partidas el coste fijo por petición manda, así que se agrupa: las tareas de IA
+pedidas en una misma vuelta del bucle van al pool como un solo trabajo, y las
+respuestas de una conexión en una misma vuelta salen en una sola escritura.
+
+Uso (desde SandBox/):
+    python -m Servidor --puerto 8765
+    python -m Servidor --unix /tmp/battleship.sock --hilos 4 --max-inactiva 600
+"""
+import json
+import asyncio
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from Controlador.controlador import WarShipController
+from Controlador.sesiones import SessionRegistry
+from Entidad.tablero_datos import BARCO, DISPARO
+
+_log = logging.getLogger(__name__)
+
+# Modos de juego que acepta la operación 'nueva'
+MODOS = ('solo', 'hv', 'hvh', 'mm')
+# Tope de tiempo por jugada de una IA 'montecarlo' (cada jugada ocupa un hilo del pool
+# durante ese tiempo); un cliente puede pedir uno menor
+MAX_TIME_BUDGET = 0.02
+
+
+class ErrorPeticion(Exception):
+    """Petición mal formada o no válida para el estado de la partida."""
+
+
+class SalidaAgrupada:
+    """
+    Escritor de líneas que junta las escritas en una misma vuelta del bucle de eventos
+    y las envía de una vez (una llamada a send en lugar de una por línea).
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self._pendientes = []
+
+    def escribir(self, linea):
+        if not self._pendientes:
+            asyncio.get_running_loop().call_soon(self._vaciar)
+        self._pendientes.append(linea)
+
+    def _vaciar(self):
+        datos, self._pendientes = b''.join(self._pendientes), []
+        if not self.writer.is_closing():
+            self.writer.write(datos)
+
+
+class ServidorJuego:
+    """
+    Servidor de partidas sobre asyncio. 'registry' (un SessionRegistry nuevo con un
+    WarShipController(board_size) si no se pasa) guarda las partidas; 'hilos' es el
+    tamaño del pool donde juega la IA; con 'max_inactiva' (segundos) se expiran las
+    partidas abandonadas.
+    """
+
+    def __init__(self, board_size=10, registry=None, hilos=4, max_inactiva=None):
+        self.registry = registry or SessionRegistry(WarShipController(board_size), max_idle=max_inactiva)
+        self.controller = self.registry.controller
+        self.hilos = hilos
+        self._ejecutor = None
+        self._servidor = None
+        self._expirador = None
+        # Sesiones con una petición en curso (solo se tocan desde el bucle)
+        self._ocupadas = set()
+        # Trabajos (futuro, funcion, args) para el pool reunidos en esta vuelta del bucle
+        self._lote = []
+        self._operaciones = {
+            'nueva': self._op_nueva,
+            'disparo': self._op_disparo,
+            'maquina': self._op_maquina,
+            'estado': self._op_estado,
+            'cerrar': self._op_cerrar,
+            'ping': self._op_ping,
+        }
+
+    async def iniciar(self, host='127.0.0.1', puerto=0, unix=None):
+        """Empieza a escuchar (en 'unix' si se indica, si no en host:puerto) y retorna la dirección."""
+        self._ejecutor = ThreadPoolExecutor(max_workers=self.hilos, thread_name_prefix="ServidorJuego")
+        if unix:
+            self._servidor = await asyncio.start_unix_server(self._atender, path=unix)
+        else:
+            self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        if self.registry.max_idle is not None:
+            self._expirador = asyncio.create_task(self._expirar_periodicamente())
+        return self._servidor.sockets[0].getsockname()
+
+    async def servir(self):
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def detener(self):
+        if self._expirador is not None:
+            self._expirador.cancel()
+            self._expirador = None
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown(wait=False, cancel_futures=True)
+            self._ejecutor = None
+
+    async def _expirar_periodicamente(self):
+        intervalo = max(1.0, self.registry.max_idle / 4)
+        while True:
+            await asyncio.sleep(intervalo)
+            self.registry.expire()
+
+    # Conexiones
+    async def _atender(self, reader, writer):
+        pendientes = set()
+        salida = SalidaAgrupada(writer)
+        try:
+            while True:
+                # Contrapresión: no leer más peticiones si el cliente no recoge las respuestas
+                await writer.drain()
+                linea = await reader.readline()
+                if not linea:
+                    break
+                tarea = asyncio.create_task(self._responder(linea, salida))
+                pendientes.add(tarea)
+                tarea.add_done_callback(pendientes.discard)
+            if pendientes:
+                await asyncio.gather(*pendientes)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _responder(self, linea, salida):
+        peticion = {}
+        try:
+            peticion = json.loads(linea)
+            if not isinstance(peticion, dict):
+                raise ErrorPeticion("La petición debe ser un objeto JSON.")
+            operacion = self._operaciones.get(peticion.get('op'))
+            if operacion is None:
+                raise ErrorPeticion(f"Operación desconocida: {peticion.get('op')!r}")
+            respuesta = await operacion(peticion)
+            respuesta['ok'] = True
+        except (ErrorPeticion, ValueError, TypeError) as error:
+            respuesta = {'ok': False, 'error': str(error)}
+        except Exception as error:
+            # Fallo interno: se registra y el cliente recibe igualmente su respuesta
+            _log.exception("Error inesperado en la petición %r", peticion.get('op'))
+            respuesta = {'ok': False, 'error': f"Error interno del servidor ({type(error).__name__})."}
+        if 'id' in peticion:
+            respuesta['id'] = peticion['id']
+        salida.escribir(json.dumps(respuesta, ensure_ascii=False).encode() + b'\n')
+
+    # Operaciones
+    def _sesion(self, peticion):
+        session = self.registry.get(peticion.get('sesion'))
+        if session is None:
+            raise ErrorPeticion(f"No existe la sesión {peticion.get('sesion')!r} (o expiró).")
+        if session.session_id in self._ocupadas:
+            raise ErrorPeticion("La sesión ya tiene una petición en curso.")
+        return session
+
+    async def _en_ejecutor(self, session, funcion, *args):
+        """Ejecuta funcion(*args) en el pool marcando la sesión como ocupada mientras tanto."""
+        self._ocupadas.add(session.session_id)
+        try:
+            return await self._en_lote(funcion, *args)
+        finally:
+            self._ocupadas.discard(session.session_id)
+
+    def _en_lote(self, funcion, *args):
+        """Futuro con el resultado de funcion(*args), ejecutada en el pool con el resto del lote."""
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        if not self._lote:
+            loop.call_soon(self._despachar_lote, loop)
+        self._lote.append((futuro, funcion, args))
+        return futuro
+
+    def _despachar_lote(self, loop):
+        lote, self._lote = self._lote, []
+        try:
+            if self._ejecutor is None:
+                raise RuntimeError("sin pool")
+            self._ejecutor.submit(_ejecutar_lote, loop, lote)
+        except RuntimeError: # Servidor deteniéndose (pool cerrado): nadie se queda esperando
+            _resolver_lote([(futuro, None, ErrorPeticion("El servidor se está deteniendo."))
+                            for futuro, _, _ in lote])
+
+    def _fin(self, session):
+        return {'turno': session.current_turn, 'ganador': self.controller.get_winner(session)}
+
+    async def _op_nueva(self, peticion):
+        modo = peticion.get('modo', 'solo')
+        if modo not in MODOS:
+            raise ErrorPeticion(f"Modo desconocido: {modo!r} (válidos: {', '.join(MODOS)})")
+        semilla = peticion.get('semilla')
+        if semilla is not None and not isinstance(semilla, int):
+            raise ErrorPeticion("'semilla' debe ser un entero.")
+        config_A = _config_ia(peticion.get('config_A'), 'config_A')
+        config_B = _config_ia(peticion.get('config_B'), 'config_B')
+        session = await self._en_lote(self.controller.new_session, modo, semilla, config_A, config_B)
+        self.registry.add(session)
+        return {'sesion': session.session_id, 'modo': modo, 'tamano': self.controller.board_size,
+                'turno': session.current_turn, 'semilla': session.game_seed}
+
+    async def _op_disparo(self, peticion):
+        session = self._sesion(peticion)
+        fila, columna = peticion.get('fila'), peticion.get('columna')
+        n = self.controller.board_size
+        if not (isinstance(fila, int) and isinstance(columna, int) and 0 <= fila < n and 0 <= columna < n):
+            raise ErrorPeticion(f"'fila' y 'columna' deben ser enteros entre 0 y {n - 1}.")
+        # El disparo humano es O(1): se procesa en el bucle
+        resultado, mensaje = self.controller.play_human_turn(session, fila, columna)
+        if resultado == 'error':
+            raise ErrorPeticion(mensaje)
+        respuesta = {'resultado': resultado, 'mensaje': mensaje}
+        if session.mode == 'hv' and session.current_turn == 'machine':
+            row, col, result, message = await self._en_ejecutor(session, self.controller.play_machine_turn, session)
+            respuesta['respuesta'] = {'fila': row, 'columna': col, 'resultado': result, 'mensaje': message}
+        respuesta.update(self._fin(session))
+        return respuesta
+
+    async def _op_maquina(self, peticion):
+        session = self._sesion(peticion)
+        row, col, result, message = await self._en_ejecutor(session, self.controller.play_machine_turn, session)
+        if row is None and result == 'error':
+            raise ErrorPeticion(message)
+        respuesta = {'fila': row, 'columna': col, 'resultado': result, 'mensaje': message}
+        respuesta.update(self._fin(session))
+        return respuesta
+
+    async def _op_estado(self, peticion):
+        session = self._sesion(peticion)
+        if session.mode == 'solo':
+            tableros = {'game': session.game_model}
+        else:
+            tableros = {'tablero1': session.tablero1, 'tablero2': session.tablero2}
+        respuesta = {'modo': session.mode, 'terminada': self.controller.is_game_finished(session),
+                     'tableros': {nombre: _disparos_visibles(tablero) for nombre, tablero in tableros.items()}}
+        respuesta.update(self._fin(session))
+        return respuesta
+
+    async def _op_cerrar(self, peticion):
+        session = self._sesion(peticion)
+        self.registry.remove(session.session_id)
+        return {'sesion': session.session_id}
+
+    async def _op_ping(self, peticion):
+        return {'sesiones': len(self.registry)}
+
+
+def _config_ia(config, nombre):
+    """Argumentos de AiState pedidos por el cliente, comprobados (ErrorPeticion si no valen)."""
+    if config is None:
+        return None
+    if not isinstance(config, dict):
+        raise ErrorPeticion(f"'{nombre}' debe ser un objeto JSON.")
+    desconocidas = set(config) - {'use_parity', 'hunt_strategy', 'time_budget'}
+    if desconocidas:
+        raise ErrorPeticion(f"'{nombre}' no admite: {', '.join(sorted(desconocidas))} "
+                            f"(válidas: use_parity, hunt_strategy, time_budget).")
+    if 'use_parity' in config and not isinstance(config['use_parity'], bool):
+        raise ErrorPeticion(f"'{nombre}.use_parity' debe ser true o false.")
+    if 'hunt_strategy' in config and config['hunt_strategy'] not in WarShipController.HUNT_STRATEGIES:
+        raise ErrorPeticion(f"'{nombre}.hunt_strategy' debe ser una de: "
+                            f"{', '.join(WarShipController.HUNT_STRATEGIES)}.")
+    if 'time_budget' in config:
+        presupuesto = config['time_budget']
+        if (isinstance(presupuesto, bool) or not isinstance(presupuesto, (int, float))
+                or not 0 <= presupuesto <= MAX_TIME_BUDGET):
+            raise ErrorPeticion(f"'{nombre}.time_budget' debe ser un número de segundos entre 0 y {MAX_TIME_BUDGET}.")
+    config = dict(config)
+    if config.get('hunt_strategy') == 'montecarlo':
+        config.setdefault('time_budget', MAX_TIME_BUDGET)
+    return config
+
+
+def _ejecutar_lote(loop, lote):
+    """En un hilo del pool: ejecuta los trabajos del lote y entrega los resultados al bucle."""
+    resultados = []
+    for futuro, funcion, args in lote:
+        try:
+            resultados.append((futuro, funcion(*args), None))
+        except Exception as error: # Se entrega al que espera el futuro
+            resultados.append((futuro, None, error))
+    loop.call_soon_threadsafe(_resolver_lote, resultados)
+
+
+def _resolver_lote(resultados):
+    for futuro, resultado, error in resultados:
+        if futuro.cancelled():
+            continue
+        if error is not None:
+            futuro.set_exception(error)
+        else:
+            futuro.set_result(resultado)
+
+
+def _disparos_visibles(tablero):
+    """Filas de texto con lo que ve el atacante: '.' sin disparar, 'o' agua, 'x' impacto."""
+    simbolos = {v: ('.' if not v & DISPARO else 'x' if v & BARCO else 'o') for v in range(4)}
+    columnas = tablero.columnas
+    return ["".join(simbolos[v] for v in tablero.celdas[r * columnas:(r + 1) * columnas])
+            for r in range(tablero.filas)]
+
+
+async def _servir(args):
+    servidor = ServidorJuego(args.tamano, hilos=args.hilos, max_inactiva=args.max_inactiva)
+    direccion = await servidor.iniciar(args.host, args.puerto, args.unix)
+    print(f"Servidor de BattleShip escuchando en {direccion} (tablero {args.tamano}x{args.tamano})", flush=True)
+    try:
+        await servidor.servir()
+    finally:
+        await servidor.detener()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m Servidor", description="Servidor de partidas de BattleShip.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help="Ruta de un socket Unix (en lugar de TCP).")
+    parser.add_argument('--tamano', type=int, default=10)
+    parser.add_argument('--hilos', type=int, default=4, help="Hilos para las jugadas de la IA.")
+    parser.add_argument('--max-inactiva', type=float, default=600,
+                        help="Segundos sin uso tras los que se descarta una partida.")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_servir(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()